@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""HTTP load generator for the REST API.
+
+Logs in a set of accounts through /api/auth/login, then runs virtual users that
+each reuse one account's jwt cookie and pick weighted scenarios (feed, likes,
+messages, notifications, resources, bookmarks) until the duration is up. Prints
+throughput and p50/p95/p99 latency per route.
+
+  pip install -r benchmarks/requirements.txt
+  python3 benchmarks/loadtest.py --users 200 --concurrency 100 --duration 60
+
+Accounts are "--email-pattern" formatted with 0..users-1, or read from
+--accounts-file (one email per line); they must already exist and share
+--password (benchmarks/seed_data.py creates them). Run against a local backend
+and database only.
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+from collections import defaultdict
+
+import aiohttp
+
+DEFAULT_WEIGHTS = {
+  "feed": 30,
+  "like": 10,
+  "read_messages": 15,
+  "send_message": 8,
+  "notifications": 15,
+  "resources": 15,
+  "bookmark": 7,
+}
+
+
+def percentile(ordered, p):
+  if not ordered:
+    return 0.0
+  return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class Stats:
+  """Latencies and outcomes per route template."""
+
+  def __init__(self):
+    self.latencies = defaultdict(list)
+    self.statuses = defaultdict(lambda: defaultdict(int))
+
+  def record(self, route, status, ms):
+    self.latencies[route].append(ms)
+    self.statuses[route][status] += 1
+
+  def report(self, duration):
+    rows = []
+    for route in sorted(self.latencies):
+      ordered = sorted(self.latencies[route])
+      statuses = self.statuses[route]
+      errors = sum(count for status, count in statuses.items() if status == "error" or int(status) >= 400)
+      rows.append({
+        "route": route,
+        "requests": len(ordered),
+        "rps": round(len(ordered) / duration, 1),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 0.50), 1),
+        "p95_ms": round(percentile(ordered, 0.95), 1),
+        "p99_ms": round(percentile(ordered, 0.99), 1),
+        "max_ms": round(ordered[-1], 1),
+        "statuses": dict(statuses),
+      })
+    return rows
+
+
+class Client:
+  """One account's API calls; every call is timed under its route template."""
+
+  def __init__(self, http, base_url, stats):
+    self.http = http
+    self.base_url = base_url
+    self.stats = stats
+    self.user_id = None
+    self.profile_data = None
+    self.headers = {}
+
+  async def call(self, method, route, path, **kwargs):
+    started = time.perf_counter()
+    try:
+      async with self.http.request(method, f"{self.base_url}{path}", headers=self.headers, **kwargs) as response:
+        body = await response.read()
+        status = response.status
+        cookies = response.cookies
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+      self.stats.record(f"{method} {route}", "error", (time.perf_counter() - started) * 1000)
+      return None, None, None
+    self.stats.record(f"{method} {route}", str(status), (time.perf_counter() - started) * 1000)
+    return status, body, cookies
+
+  async def login(self, email, password, attempts=5):
+    for attempt in range(attempts):
+      status, body, cookies = await self.call("POST", "/api/auth/login", "/api/auth/login", json={"email": email, "password": password})
+      # 503: the password hash pool is saturated, back off and retry
+      if status == 503:
+        await asyncio.sleep(0.5 * 2 ** attempt)
+        continue
+      if status is None:
+        raise RuntimeError(f"login {email}: backend unreachable")
+      if status != 200 or "jwt" not in cookies:
+        raise RuntimeError(f"login {email} failed with {status}: {body[:200]!r}")
+      self.headers = {"Cookie": f"jwt={cookies['jwt'].value}"}
+      user = json.loads(body)
+      self.user_id = user["_id"]
+      self.profile_data = user.get("profile_data") or {}
+      return
+    raise RuntimeError(f"login {email} kept failing with {status}")
+
+
+class Catalog:
+  """Ids seen in responses, so scenarios act on posts, resources and users that exist."""
+
+  def __init__(self):
+    self.post_ids = []
+    self.resource_ids = []
+    self.user_ids = []
+
+  def add_posts(self, body):
+    posts = body.get("posts", []) if isinstance(body, dict) else []
+    self.post_ids.extend(post["_id"] for post in posts if post["_id"] not in self.post_ids[-500:])
+    del self.post_ids[:-2000]
+
+  def add_resources(self, body):
+    resources = body.get("resources", []) if isinstance(body, dict) else body
+    self.resource_ids.extend(resource["_id"] for resource in resources if resource["_id"] not in self.resource_ids[-500:])
+    del self.resource_ids[:-2000]
+
+
+def parse_json(body):
+  try:
+    return json.loads(body)
+  except (TypeError, ValueError):
+    return None
+
+
+async def feed(client, catalog, rng):
+  params = {"cursor": "", "limit": "10"}
+  if rng.random() < 0.3:
+    params["category"] = rng.choice(["Job Post", "Internship Post", "Community Post"])
+  status, body, _ = await client.call("GET", "/api/posts", "/api/posts", params=params)
+  if status == 200:
+    catalog.add_posts(parse_json(body))
+
+
+async def like(client, catalog, rng):
+  if not catalog.post_ids:
+    return await feed(client, catalog, rng)
+  post_id = rng.choice(catalog.post_ids)
+  await client.call("PATCH", "/api/posts/:postId/likes", f"/api/posts/{post_id}/likes", json={"increment": rng.random() < 0.7})
+
+
+async def read_messages(client, catalog, rng):
+  peer = rng.choice(catalog.user_ids)
+  await client.call("GET", "/api/message/:id", f"/api/message/{peer}", params={"limit": "30"})
+
+
+async def send_message(client, catalog, rng):
+  peer = rng.choice(catalog.user_ids)
+  if peer == client.user_id:
+    return
+  text = "".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(8, 120)))
+  await client.call("POST", "/api/message/send/:id", f"/api/message/send/{peer}", json={"text": text})
+
+
+async def notifications(client, catalog, rng):
+  params = {"limit": "20"}
+  if rng.random() < 0.5:
+    params["unread"] = "true"
+  await client.call("GET", "/api/notifications", "/api/notifications", params=params)
+
+
+async def resources(client, catalog, rng):
+  status, body, _ = await client.call("GET", "/api/resources/all", "/api/resources/all", params={"limit": "20"})
+  if status == 200:
+    catalog.add_resources(parse_json(body))
+
+
+async def bookmark(client, catalog, rng):
+  if not catalog.resource_ids:
+    return await resources(client, catalog, rng)
+  resource_id = rng.choice(catalog.resource_ids)
+  await client.call("POST", "/api/bookmarks/:resourceId", f"/api/bookmarks/{resource_id}")
+
+
+SCENARIOS = {
+  "feed": feed,
+  "like": like,
+  "read_messages": read_messages,
+  "send_message": send_message,
+  "notifications": notifications,
+  "resources": resources,
+  "bookmark": bookmark,
+}
+
+
+def parse_mix(value):
+  weights = dict(DEFAULT_WEIGHTS)
+  for part in filter(None, value.split(",")):
+    name, _, weight = part.partition("=")
+    if name not in SCENARIOS:
+      raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (one of {', '.join(SCENARIOS)})")
+    weights[name] = float(weight)
+  return weights
+
+
+async def virtual_user(client, catalog, weights, rng, deadline, think_ms):
+  names = [name for name, weight in weights.items() if weight > 0]
+  chances = [weights[name] for name in names]
+  while time.monotonic() < deadline:
+    name = rng.choices(names, weights=chances)[0]
+    await SCENARIOS[name](client, catalog, rng)
+    if think_ms:
+      await asyncio.sleep(rng.expovariate(1 / think_ms) / 1000)
+
+
+async def main(args):
+  if args.accounts_file:
+    with open(args.accounts_file) as file:
+      emails = [line.strip() for line in file if line.strip()][: args.users]
+  else:
+    emails = [args.email_pattern.format(i) for i in range(args.users)]
+
+  login_stats = Stats()
+  stats = Stats()
+  timeout = aiohttp.ClientTimeout(total=args.timeout)
+  connector = aiohttp.TCPConnector(limit=args.connections)
+  # cookies are sent per client, never from a shared jar
+  async with aiohttp.ClientSession(timeout=timeout, connector=connector, cookie_jar=aiohttp.DummyCookieJar()) as http:
+    clients = [Client(http, args.base_url, login_stats) for _ in emails]
+    gate = asyncio.Semaphore(args.login_concurrency)
+
+    async def login(client, email):
+      async with gate:
+        await client.login(email, args.password)
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(login(client, email) for client, email in zip(clients, emails)), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, Exception)]
+    clients = [client for client, result in zip(clients, results) if not isinstance(result, Exception)]
+    login_elapsed = time.monotonic() - started
+    print(f"logged in {len(clients)}/{len(emails)} accounts in {login_elapsed:.1f}s")
+    for failure in failures[:5]:
+      print(f"  {failure}")
+    if not clients:
+      return 1
+
+    catalog = Catalog()
+    catalog.user_ids = [client.user_id for client in clients]
+    for client in clients:
+      client.stats = stats
+
+    rng = random.Random(args.seed)
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    await asyncio.gather(*(
+      virtual_user(clients[i % len(clients)], catalog, args.mix, random.Random(rng.random()), deadline, args.think_ms)
+      for i in range(args.concurrency)
+    ))
+    elapsed = time.monotonic() - started
+
+  rows = stats.report(elapsed)
+  print(f"\n{args.concurrency} virtual users, {elapsed:.1f}s, {sum(row['requests'] for row in rows)} requests")
+  # logins ran before the timed phase, so their rate is over the login phase
+  rows = login_stats.report(login_elapsed) + rows
+  print(f"{'route':<34} {'reqs':>7} {'req/s':>7} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+  for row in rows:
+    print(
+      f"{row['route']:<34} {row['requests']:>7} {row['rps']:>7} {row['errors']:>6} "
+      f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} {row['max_ms']:>8}"
+    )
+  if args.json:
+    with open(args.json, "w") as file:
+      json.dump({"duration_s": round(elapsed, 1), "concurrency": args.concurrency, "routes": rows}, file, indent=2)
+  return 0
+
+
+def parse_args():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+  parser.add_argument("--base-url", default="http://localhost:5001")
+  parser.add_argument("--users", type=int, default=100, help="accounts to log in")
+  parser.add_argument("--email-pattern", default="loaduser{}@lih.test")
+  parser.add_argument("--accounts-file")
+  parser.add_argument("--password", default="123456Q@")
+  parser.add_argument("--concurrency", type=int, default=50, help="virtual users (accounts are shared round robin)")
+  parser.add_argument("--duration", type=float, default=30, help="seconds")
+  parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's requests")
+  parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_WEIGHTS), help="scenario weights, e.g. feed=50,bookmark=0")
+  parser.add_argument("--login-concurrency", type=int, default=8, help="logins hash passwords, so they are throttled")
+  parser.add_argument("--connections", type=int, default=200)
+  parser.add_argument("--timeout", type=float, default=30)
+  parser.add_argument("--seed", type=int, default=1)
+  parser.add_argument("--json", help="also write the results to this file")
+  return parser.parse_args()
+
+
+if __name__ == "__main__":
+  raise SystemExit(asyncio.run(main(parse_args())))
@@ -0,0 +1,76 @@
+// Login throughput and latency of an unrelated endpoint while logins are running,
+// with bcryptjs on the main thread vs the worker pool in src/lib/passwordHash.js.
+//
+//   node benchmarks/passwordHash.bench.js [concurrentLogins=32] [durationMs=5000]
+import http from "http";
+import express from "express";
+import bcrypt from "bcryptjs";
+import { comparePassword, getHashPoolStats } from "../src/lib/passwordHash.js";
+
+const CONCURRENCY = Number(process.argv[2]) || 32;
+const DURATION_MS = Number(process.argv[3]) || 5000;
+const PASSWORD = "123456Q@";
+
+const percentile = (sorted, p) => sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] : 0;
+
+const startServer = (compare, hashed) => new Promise((resolve) => {
+    const app = express();
+    app.get("/login", async (req, res) => {
+        const ok = await compare(PASSWORD, hashed);
+        res.status(ok ? 200 : 400).end();
+    });
+    app.get("/ping", (req, res) => res.json({ ok: true }));
+
+    const server = http.createServer(app).listen(0, () => resolve(server));
+});
+
+const timed = async (url) => {
+    const startedAt = performance.now();
+    const response = await fetch(url);
+    await response.arrayBuffer();
+    return performance.now() - startedAt;
+};
+
+const run = async (label, compare, hashed) => {
+    const server = await startServer(compare, hashed);
+    const base = `http://127.0.0.1:${server.address().port}`;
+    const deadline = Date.now() + DURATION_MS;
+    const pings = [];
+    let logins = 0;
+
+    const loginLoop = async () => {
+        while (Date.now() < deadline) {
+            await timed(`${base}/login`);
+            logins += 1;
+        }
+    };
+    const pingLoop = async () => {
+        while (Date.now() < deadline) {
+            pings.push(await timed(`${base}/ping`));
+            await new Promise(resolve => setTimeout(resolve, 10));
+        }
+    };
+
+    await Promise.all([...Array.from({ length: CONCURRENCY }, loginLoop), pingLoop()]);
+    server.close();
+
+    pings.sort((a, b) => a - b);
+    return {
+        mode: label,
+        "logins/s": Math.round(logins / (DURATION_MS / 1000)),
+        "ping p50 ms": percentile(pings, 0.5).toFixed(1),
+        "ping p99 ms": percentile(pings, 0.99).toFixed(1),
+        "ping max ms": (pings[pings.length - 1] || 0).toFixed(1)
+    };
+};
+
+const hashed = bcrypt.hashSync(PASSWORD, 10);
+const results = [
+    await run("bcryptjs main thread", (value, hash) => bcrypt.compare(value, hash), hashed),
+    await run(getHashPoolStats().implementation, comparePassword, hashed)
+];
+
+console.log(`${CONCURRENCY} concurrent logins for ${DURATION_MS}ms`);
+console.table(results);
+console.log(getHashPoolStats());
+process.exit(0);
@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""Synthetic campus-scale dataset for benchmarks.
+
+Bulk-inserts users, courses, academic resources with ratings, posts with likes,
+message threads with their conversation summaries, and notifications straight
+into MongoDB, shaped like the models in src/models. Then it creates the models'
+indexes and rebuilds the maintained counters (users.unread_notifications,
+courses.resourceCount).
+
+The data is skewed like a real campus: departments differ in size, a few users
+post and message far more than others, a few posts collect most likes, and a few
+courses and resources collect most uploads, ratings and bookmarks.
+
+  pip install -r benchmarks/requirements.txt
+  python3 benchmarks/seed_data.py --uri mongodb://localhost:27017/lih_bench --scale 10
+
+Every account is "--email-pattern" formatted with its index and has --password,
+which is what benchmarks/loadtest.py and socketbench.py log in with. The same
+--seed and --anchor produce the same documents, ids included. Documents are
+generated and inserted in chunks by --workers processes.
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import struct
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+import bcrypt
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.collation import Collation
+
+DEPARTMENTS = ["CS", "ECO", "MGMT", "ACCF", "EE", "LAW", "MATH", "POL", "ENG", "PHY", "HIST", "ANTHSOC", "CHEMBIO", "OTHER"]
+# relative department sizes, largest first
+DEPARTMENT_WEIGHTS = [24, 16, 14, 11, 9, 5, 5, 4, 3, 3, 2, 2, 1.5, 0.5]
+CATEGORIES = ["Community Post", "Internship Post", "Job Post"]
+CATEGORY_WEIGHTS = [70, 18, 12]
+FILE_TYPES = ["pdf", "docx", "pptx", "zip"]
+FILE_TYPE_WEIGHTS = [70, 12, 15, 3]
+
+FIRST_NAMES = ["Ali", "Ayesha", "Hamza", "Fatima", "Usman", "Zainab", "Bilal", "Hira", "Omar", "Sana",
+               "Ahmed", "Maryam", "Saad", "Amna", "Faraz", "Iqra", "Hassan", "Mahnoor", "Taha", "Noor"]
+LAST_NAMES = ["Khan", "Ahmed", "Malik", "Butt", "Sheikh", "Chaudhry", "Qureshi", "Raza", "Siddiqui", "Mirza",
+              "Hussain", "Iqbal", "Javed", "Aslam", "Barki", "Shah", "Akhtar", "Riaz", "Farooq", "Nawaz"]
+WORDS = ("lecture notes midterm final quiz solution assignment project lab report slides summary guide "
+         "internship hiring society event meetup seminar workshop deadline campus library cafe sports "
+         "research opening referral alumni career fair question help anyone know where when how").split()
+ORGANIZATIONS = ["Systems Ltd", "Careem", "Unilever", "Engro", "HBL", "Netsol", "Jazz", "P&G", "Afiniti", "Arbisoft"]
+
+# first byte of every generated ObjectId after the timestamp, so collections never share ids
+ID_TAGS = {"users": 1, "courses": 2, "resources": 3, "ratings": 4, "posts": 5, "messages": 6, "conversations": 7, "notifications": 8, "likes": 9}
+
+COLLECTIONS = {
+  "users": "users",
+  "courses": "courses",
+  "resources": "academicresources",
+  "ratings": "resourceratings",
+  "posts": "posts",
+  "likes": "postlikes",
+  "messages": "messages",
+  "conversations": "conversations",
+  "notifications": "notifications",
+}
+
+READ_TTL_DAYS = int(os.environ.get("NOTIFICATION_READ_TTL_DAYS") or 30)
+DAY = 24 * 60 * 60
+
+
+def object_id(kind, index, seconds):
+  """Deterministic ObjectId: creation time, collection tag, then the document's index."""
+  return ObjectId(struct.pack(">IB", int(seconds), ID_TAGS[kind]) + index.to_bytes(7, "big"))
+
+
+def fraction(*values):
+  """Cheap deterministic hash of ints to [0, 1), for values other documents must recompute."""
+  h = 0x811C9DC5
+  for value in values:
+    h = ((h ^ (value & 0xFFFFFFFF)) * 0x01000193) & 0xFFFFFFFF
+    h = ((h ^ (value >> 32)) * 0x01000193) & 0xFFFFFFFF
+  h ^= h >> 15
+  h = (h * 0x2C1B3C6D) & 0xFFFFFFFF
+  h ^= h >> 12
+  return h / 2**32
+
+
+def zipf_cumulative(n, s):
+  return list(itertools.accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+def scatter(rank, n):
+  """Maps a popularity rank to an index, so popular documents are not all the oldest ones."""
+  step = 7919
+  while math.gcd(step, n) != 1:
+    step += 2
+  return (rank * step) % n
+
+
+def words(rng, low, high):
+  return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+class Plan:
+  """Sizes, time ranges and the per-document facts other documents refer to (user
+  departments, post departments, message threads). Built once from the seed; chunks
+  only read it, so any chunk can be generated by any worker."""
+
+  def __init__(self, args):
+    scale = args.scale
+    self.seed = args.seed
+    self.anchor = args.anchor.timestamp()
+    self.span = args.days * DAY
+    self.email_pattern = args.email_pattern
+    self.password_hash = deterministic_hash(args.password, args.seed)
+
+    self.users = int(args.users * scale)
+    self.courses = max(len(DEPARTMENTS), int(args.courses * scale ** 0.5))
+    self.resources = int(args.resources * scale)
+    self.posts = int(args.posts * scale)
+    self.threads = int(args.threads * scale)
+    self.notifications = int(args.notifications * scale)
+    self.mean_messages = args.messages_per_thread
+    self.mean_ratings = args.ratings_per_resource
+    self.mean_likes = args.likes_per_post
+    self.mean_bookmarks = args.bookmarks_per_user
+
+    rng = random.Random(f"{self.seed}:plan")
+    self.user_department = array("B", rng.choices(range(len(DEPARTMENTS)), weights=DEPARTMENT_WEIGHTS, k=self.users))
+
+    # courses: each department's codes in proportion to its size
+    self.course_codes = []
+    self.course_department = []
+    total_weight = sum(DEPARTMENT_WEIGHTS)
+    for department, weight in zip(DEPARTMENTS, DEPARTMENT_WEIGHTS):
+      for number in range(max(1, round(self.courses * weight / total_weight))):
+        self.course_codes.append(f"{department}{100 + number * 3 + rng.randint(0, 2)}")
+        self.course_department.append(department)
+    self.courses = len(self.course_codes)
+
+    # active users write most posts and messages
+    user_activity = zipf_cumulative(self.users, 1.05)
+    self.post_author = array("I", (scatter(rank, self.users) for rank in rng.choices(range(self.users), cum_weights=user_activity, k=self.posts)))
+    self.posts_by_department = [array("I") for _ in DEPARTMENTS]
+    for post, author in enumerate(self.post_author):
+      self.posts_by_department[self.user_department[author]].append(post)
+
+    # one thread per pair of users; the pair's first sender is `thread_a`
+    self.thread_a = array("I")
+    self.thread_b = array("I")
+    pairs = set()
+    while len(self.thread_a) < min(self.threads, self.users * (self.users - 1) // 2):
+      a, b = (scatter(rank, self.users) for rank in rng.choices(range(self.users), cum_weights=user_activity, k=2))
+      if a == b or (min(a, b), max(a, b)) in pairs:
+        continue
+      pairs.add((min(a, b), max(a, b)))
+      self.thread_a.append(a)
+      self.thread_b.append(b)
+    self.threads = len(self.thread_a)
+    self.thread_length = array("I", (max(1, int(rng.expovariate(1 / self.mean_messages))) for _ in range(self.threads)))
+    self.thread_offset = array("Q", itertools.accumulate(self.thread_length, initial=0))
+    self.messages = self.thread_offset[-1]
+
+  # timestamps every document can recompute for any other document
+
+  def user_time(self, user):
+    return self.anchor - 4 * 365 * DAY + (4 * 365 * DAY - self.span) * (user + fraction(1, user)) / max(1, self.users)
+
+  def post_time(self, post):
+    return self.anchor - self.span + self.span * (post + fraction(2, post)) / max(1, self.posts)
+
+  def resource_time(self, resource):
+    return self.anchor - self.span + self.span * fraction(3, resource)
+
+  def thread_start(self, thread):
+    return self.anchor - self.span + self.span * fraction(4, thread) ** 0.5
+
+  def message_time(self, thread, position):
+    gap = 60 + 6 * 3600 * fraction(5, thread)
+    # at most one gap apart and strictly increasing within a thread
+    return min(self.anchor, self.thread_start(thread) + gap * (position + 0.8 * fraction(6, thread, position)))
+
+  def message_sender(self, thread, position):
+    if position == 0 or fraction(7, thread, position) < 0.5:
+      return self.thread_a[thread]
+    return self.thread_b[thread]
+
+  def user_id(self, user):
+    return object_id("users", user, self.user_time(user))
+
+  def post_id(self, post):
+    return object_id("posts", post, self.post_time(post))
+
+  def resource_id(self, resource):
+    return object_id("resources", resource, self.resource_time(resource))
+
+  def message_id(self, thread, position):
+    return object_id("messages", self.thread_offset[thread] + position, self.message_time(thread, position))
+
+  def user_name(self, user):
+    return f"{FIRST_NAMES[user % len(FIRST_NAMES)]} {LAST_NAMES[(user // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+
+  def user_role(self, user):
+    return "alumni" if fraction(8, user) < 0.15 else "student"
+
+
+def deterministic_hash(password, seed):
+  alphabet = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+  rng = random.Random(f"{seed}:salt")
+  # the 22nd salt character only carries 2 bits, so it is one bcrypt can round-trip
+  salt = "".join(rng.choices(alphabet, k=21)) + rng.choice(".Oeu")
+  return bcrypt.hashpw(password.encode(), f"$2b$10${salt}".encode()).decode()
+
+
+def date(seconds):
+  return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+def generate_users(plan, rng, start, end):
+  resource_popularity = plan.resource_popularity
+  for user in range(start, end):
+    role = plan.user_role(user)
+    bookmarks = set()
+    if plan.resources:
+      for rank in rng.choices(range(plan.resources), cum_weights=resource_popularity, k=int(rng.expovariate(1 / plan.mean_bookmarks)) if plan.mean_bookmarks else 0):
+        bookmarks.add(scatter(rank, plan.resources))
+    profile = {
+      "name": plan.user_name(user),
+      "department": DEPARTMENTS[plan.user_department[user]],
+      "batch": str(int(datetime.fromtimestamp(plan.user_time(user), timezone.utc).year) + 4),
+      "bio": words(rng, 3, 12),
+      "interests": rng.sample(WORDS, rng.randint(0, 4)),
+      "profilePicture": {"url": "", "publicId": ""},
+      "bookmarks": [plan.resource_id(resource) for resource in sorted(bookmarks)],
+    }
+    doc = {
+      "_id": plan.user_id(user),
+      "email": plan.email_pattern.format(user),
+      "password": plan.password_hash,
+      "verified": True,
+      "role": role,
+      "unread_notifications": 0,
+      "profile_data": profile,
+      "created_at": date(plan.user_time(user)),
+      "__v": 0,
+    }
+    if role == "alumni":
+      doc["employment_status"] = "employed" if rng.random() < 0.85 else "unemployed"
+      doc["current_organization"] = rng.choice(ORGANIZATIONS)
+    yield "users", doc
+
+
+def generate_courses(plan, rng, start, end):
+  for course in range(start, end):
+    code = plan.course_codes[course]
+    yield "courses", {
+      "_id": object_id("courses", course, plan.anchor - 4 * 365 * DAY),
+      "course_code": code,
+      "course_name": f"{plan.course_department[course]} {words(rng, 1, 3).title()}",
+      "description": words(rng, 8, 20),
+      "department": plan.course_department[course],
+      "credits": rng.choice([3, 3, 3, 4, 1]),
+      "resourceCount": 0,
+      "__v": 0,
+    }
+
+
+def generate_resources(plan, rng, start, end):
+  for resource in range(start, end):
+    uploader = scatter(rng.choices(range(plan.users), cum_weights=plan.user_activity)[0], plan.users)
+    course = rng.choices(range(plan.courses), cum_weights=plan.course_popularity)[0]
+    file_type = rng.choices(FILE_TYPES, weights=FILE_TYPE_WEIGHTS)[0]
+    resource_id = plan.resource_id(resource)
+    uploaded_at = plan.resource_time(resource)
+
+    # popular resources get most ratings and downloads
+    popularity = 1 / (plan.resource_rank[resource] + 1) ** 0.6
+    raters = min(plan.users, int(rng.expovariate(1) * plan.mean_ratings * popularity * plan.resource_rank_norm))
+    total = 0
+    for rater in rng.sample(range(plan.users), raters):
+      rating = rng.choices([1, 2, 3, 4, 5], weights=[3, 5, 17, 40, 35])[0]
+      total += rating
+      rated_at = date(uploaded_at + (plan.anchor - uploaded_at) * rng.random())
+      yield "ratings", {
+        "_id": object_id("ratings", resource * plan.users + rater, rated_at.timestamp()),
+        "resourceId": resource_id,
+        "userId": plan.user_id(rater),
+        "rating": rating,
+        "createdAt": rated_at,
+        "updatedAt": rated_at,
+        "__v": 0,
+      }
+
+    topic = words(rng, 2, 5)
+    yield "resources", {
+      "_id": resource_id,
+      "uploader_id": plan.user_id(uploader),
+      "uploader_name": plan.user_name(uploader),
+      "course_code": plan.course_codes[course],
+      "topic": topic,
+      "original_filename": f"{topic.replace(' ', '_')}.{file_type}",
+      "file_url": f"https://res.cloudinary.com/lih-bench/raw/upload/resources/{resource_id}.{file_type}",
+      "file_type": file_type,
+      "file_size": int(rng.lognormvariate(13, 1.2)),
+      "downloads": int(raters * rng.uniform(2, 8) + rng.expovariate(1 / 3)),
+      "description": words(rng, 6, 25),
+      "role": plan.user_role(uploader),
+      "ratings": [],
+      "ratingSum": total,
+      "averageRating": round(total / raters, 1) if raters else 0,
+      "numberOfRatings": raters,
+      "uploaded_at": date(uploaded_at),
+      "__v": 0,
+    }
+
+
+def generate_posts(plan, rng, start, end):
+  for post in range(start, end):
+    author = plan.post_author[post]
+    # heavy-tailed likes: most posts get a handful, a few get a large share of campus
+    likes = min(plan.users, int(plan.mean_likes * 0.3 * rng.paretovariate(1.3)))
+    created_at = plan.post_time(post)
+    for user in rng.sample(range(plan.users), likes):
+      liked_at = date(created_at + (plan.anchor - created_at) * rng.random())
+      yield "likes", {
+        "_id": object_id("likes", post * plan.users + user, liked_at.timestamp()),
+        "postId": plan.post_id(post),
+        "userId": plan.user_id(user),
+        "createdAt": liked_at,
+        "__v": 0,
+      }
+
+    yield "posts", {
+      "_id": plan.post_id(post),
+      "title": words(rng, 3, 8).capitalize(),
+      "name": plan.user_name(author),
+      "email": plan.email_pattern.format(author),
+      "description": words(rng, 10, 60),
+      "department": DEPARTMENTS[plan.user_department[author]],
+      "role": plan.user_role(author),
+      "category": rng.choices(CATEGORIES, weights=CATEGORY_WEIGHTS)[0],
+      "number_of_likes": likes,
+      "created_at": date(created_at),
+      "__v": 0,
+    }
+
+
+def generate_messages(plan, rng, start, end):
+  for thread in range(start, end):
+    length = plan.thread_length[thread]
+    a, b = plan.thread_a[thread], plan.thread_b[thread]
+    ids = {a: plan.user_id(a), b: plan.user_id(b)}
+    senders = [plan.message_sender(thread, position) for position in range(length)]
+    times = [plan.message_time(thread, position) for position in range(length)]
+    offset = plan.thread_offset[thread]
+    message = None
+    for position, sender in enumerate(senders):
+      sent_at = date(times[position])
+      message = {
+        "_id": object_id("messages", offset + position, times[position]),
+        "senderID": ids[sender],
+        "receiverID": ids[b if sender == a else a],
+        "text": words(rng, 1, 25),
+        "createdAt": sent_at,
+        "updatedAt": sent_at,
+        "__v": 0,
+      }
+      if rng.random() < 0.03:
+        url = f"https://res.cloudinary.com/lih-bench/image/upload/messages/{message['_id']}.jpg"
+        message.update(image=url, imageThumbnail=url.replace("/upload/", "/upload/c_limit,w_320/"), imageStatus="ready")
+      yield "messages", message
+
+    # the receiver has not read the trailing run of messages if the thread is recent
+    last_sender = senders[-1]
+    unread = 0
+    if plan.anchor - times[-1] < 3 * DAY:
+      while unread < length and senders[length - 1 - unread] == last_sender:
+        unread += 1
+    yield "conversations", {
+      "_id": object_id("conversations", thread, plan.thread_start(thread)),
+      "pairKey": "_".join(sorted([str(ids[a]), str(ids[b])])),
+      "participants": [message["senderID"], message["receiverID"]],
+      "lastMessage": {
+        "messageId": message["_id"],
+        "senderID": message["senderID"],
+        "text": message["text"],
+        "hasImage": "image" in message,
+      },
+      "lastMessageAt": message["createdAt"],
+      "unreadCounts": {str(message["receiverID"]): unread} if unread else {},
+      "createdAt": date(times[0]),
+      "updatedAt": message["createdAt"],
+      "__v": 0,
+    }
+
+
+def generate_notifications(plan, rng, start, end):
+  ttl_cutoff = plan.anchor - (READ_TTL_DAYS - 1) * DAY
+  for notification in range(start, end):
+    if plan.threads and rng.random() < 0.35:
+      thread = rng.randrange(plan.threads)
+      position = rng.randrange(plan.thread_length[thread])
+      sender = plan.message_sender(thread, position)
+      recipient = plan.thread_b[thread] if sender == plan.thread_a[thread] else plan.thread_a[thread]
+      created = plan.message_time(thread, position)
+      kind, model, reference = "message", "Message", plan.message_id(thread, position)
+      content = f"New message from {plan.user_name(sender)}"
+    else:
+      recipient = scatter(rng.choices(range(plan.users), cum_weights=plan.user_activity)[0], plan.users)
+      department_posts = plan.posts_by_department[plan.user_department[recipient]]
+      # active users wrote many of their department's posts; nobody is notified of their own
+      for _ in range(8):
+        post = department_posts[rng.randrange(len(department_posts))] if department_posts else None
+        if post is not None and plan.post_author[post] != recipient:
+          break
+      else:
+        continue
+      sender = plan.post_author[post]
+      created = plan.post_time(post) + rng.uniform(0.5, 30)
+      kind, model, reference = "post", "Post", plan.post_id(post)
+      content = f"New post in {DEPARTMENTS[plan.user_department[sender]]}: {words(rng, 3, 6)}"
+
+    created = min(created, plan.anchor)
+    doc = {
+      "_id": object_id("notifications", notification, created),
+      "recipient": plan.user_id(recipient),
+      "sender": plan.user_id(sender),
+      "type": kind,
+      "content": content,
+      "referenceId": reference,
+      "onModel": model,
+      "isRead": False,
+      "createdAt": date(created),
+      "updatedAt": date(created),
+      "__v": 0,
+    }
+    # read notifications expire READ_TTL_DAYS after readAt, so older ones left in a
+    # real database are the unread ones
+    if created > ttl_cutoff and rng.random() < 0.7:
+      read_at = min(plan.anchor, created + rng.expovariate(1 / (6 * 3600)))
+      doc.update(isRead=True, readAt=date(read_at), updatedAt=date(read_at))
+    yield "notifications", doc
+
+
+GENERATORS = {
+  "users": (generate_users, lambda plan: plan.users),
+  "courses": (generate_courses, lambda plan: plan.courses),
+  "resources": (generate_resources, lambda plan: plan.resources),
+  "posts": (generate_posts, lambda plan: plan.posts),
+  "messages": (generate_messages, lambda plan: plan.threads),
+  "notifications": (generate_notifications, lambda plan: plan.notifications),
+}
+
+_plan = None
+_db = None
+
+
+def init_worker(plan, uri, database):
+  global _plan, _db
+  # popularity curves are rebuilt per process rather than pickled
+  plan.user_activity = zipf_cumulative(plan.users, 1.05)
+  plan.course_popularity = zipf_cumulative(plan.courses, 1.1)
+  plan.resource_popularity = [0.0]
+  if plan.resources:
+    plan.resource_popularity = zipf_cumulative(plan.resources, 0.9)
+    plan.resource_rank = array("I", bytes(4 * plan.resources))
+    for rank in range(plan.resources):
+      plan.resource_rank[scatter(rank, plan.resources)] = rank
+    plan.resource_rank_norm = plan.resources / sum(1 / (rank + 1) ** 0.6 for rank in range(plan.resources))
+  _plan = plan
+  _db = MongoClient(uri)[database] if uri else None
+
+
+def run_chunk(task):
+  """Generates one chunk and inserts it; the chunk's RNG depends only on the seed and
+  the chunk, so the output does not depend on --workers."""
+  kind, start, end, batch_size = task
+  generate, _ = GENERATORS[kind]
+  rng = random.Random(f"{_plan.seed}:{kind}:{start}")
+  batches = {}
+  counts = {}
+  for collection, doc in generate(_plan, rng, start, end):
+    batch = batches.setdefault(collection, [])
+    batch.append(doc)
+    if len(batch) >= batch_size:
+      flush(collection, batch, counts)
+  for collection, batch in batches.items():
+    flush(collection, batch, counts)
+  return counts
+
+
+def flush(collection, batch, counts):
+  if batch and _db is not None:
+    _db[COLLECTIONS[collection]].insert_many(batch, ordered=False, bypass_document_validation=True)
+  counts[collection] = counts.get(collection, 0) + len(batch)
+  batch.clear()
+
+
+def create_indexes(db):
+  """The indexes the models declare (mongoose would build them on startup)."""
+  search = Collation(locale="en", strength=2)
+  db.users.create_index("email", unique=True)
+  db.users.create_index("profile_data.department")
+  db.users.create_index("email", name="email_search", collation=search)
+  db.users.create_index("profile_data.name", name="name_search", collation=search)
+  db.courses.create_index("course_code", unique=True)
+  resources = db.academicresources
+  for keys in (
+    [("uploaded_at", DESCENDING)],
+    [("averageRating", DESCENDING)],
+    [("downloads", DESCENDING)],
+    [("course_code", ASCENDING), ("uploaded_at", DESCENDING)],
+    [("course_code", ASCENDING), ("averageRating", DESCENDING)],
+    [("course_code", ASCENDING), ("downloads", DESCENDING)],
+    [("file_type", ASCENDING), ("uploaded_at", DESCENDING)],
+    [("role", ASCENDING), ("uploaded_at", DESCENDING)],
+  ):
+    resources.create_index(keys + [("_id", DESCENDING)])
+  resources.create_index([("topic", "text"), ("description", "text")])
+  db.resourceratings.create_index([("resourceId", ASCENDING), ("userId", ASCENDING)], unique=True)
+  for keys in ([], [("department", ASCENDING)], [("category", ASCENDING)], [("department", ASCENDING), ("category", ASCENDING)]):
+    db.posts.create_index(keys + [("created_at", DESCENDING), ("_id", DESCENDING)])
+  db.postlikes.create_index([("postId", ASCENDING), ("userId", ASCENDING)], unique=True)
+  db.messages.create_index([("senderID", ASCENDING), ("receiverID", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)])
+  db.conversations.create_index("pairKey", unique=True)
+  db.conversations.create_index([("participants", ASCENDING), ("lastMessageAt", DESCENDING), ("_id", DESCENDING)])
+  db.notifications.create_index([("recipient", ASCENDING), ("referenceId", ASCENDING)])
+  db.notifications.create_index([("recipient", ASCENDING), ("isRead", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)])
+  db.notifications.create_index(
+    "readAt", expireAfterSeconds=READ_TTL_DAYS * DAY, partialFilterExpression={"isRead": True}
+  )
+
+
+def rebuild_counters(db):
+  """Counters the controllers maintain incrementally, computed once from the data."""
+  db.notifications.aggregate([
+    {"$match": {"isRead": False}},
+    {"$group": {"_id": "$recipient", "count": {"$sum": 1}}},
+    {"$merge": {"into": "users", "on": "_id", "whenMatched": [{"$set": {"unread_notifications": "$$new.count"}}], "whenNotMatched": "discard"}},
+  ])
+  db.academicresources.aggregate([
+    {"$group": {"_id": "$course_code", "count": {"$sum": 1}}},
+    {"$project": {"_id": 0, "course_code": "$_id", "resourceCount": "$count"}},
+    {"$merge": {"into": "courses", "on": "course_code", "whenMatched": [{"$set": {"resourceCount": "$$new.resourceCount"}}], "whenNotMatched": "discard"}},
+  ])
+
+
+def chunks(kind, total, chunk_size, batch_size):
+  return [(kind, start, min(total, start + chunk_size), batch_size) for start in range(0, total, chunk_size)]
+
+
+def main(args):
+  host = urlparse(args.uri).hostname
+  if host not in ("localhost", "127.0.0.1", "::1") and not args.allow_remote:
+    raise SystemExit(f"refusing to seed {host}; this is for local databases (--allow-remote to override)")
+  database = urlparse(args.uri).path.lstrip("/") or "lih_bench"
+
+  started = time.monotonic()
+  plan = Plan(args)
+  print(
+    f"plan: {plan.users} users, {plan.courses} courses, {plan.resources} resources, {plan.posts} posts, "
+    f"{plan.threads} threads ({plan.messages} messages), {plan.notifications} notifications "
+    f"({time.monotonic() - started:.1f}s)"
+  )
+
+  db = None
+  if not args.dry_run:
+    db = MongoClient(args.uri)[database]
+    existing = {name: db[name].estimated_document_count() for name in COLLECTIONS.values()}
+    if any(existing.values()):
+      if not args.drop:
+        raise SystemExit(f"{database} already has data ({existing}); pass --drop to replace it")
+      for name in COLLECTIONS.values():
+        db[name].drop()
+
+  tasks = []
+  for kind, (_, size) in GENERATORS.items():
+    tasks += chunks(kind, size(plan), args.chunk_size if kind != "messages" else max(1, args.chunk_size // plan.mean_messages), args.batch_size)
+  # biggest chunks first keeps all workers busy until the end
+  tasks.sort(key=lambda task: -(task[2] - task[1]))
+
+  totals = {}
+  context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+  with context.Pool(args.workers, init_worker, (plan, None if args.dry_run else args.uri, database)) as pool:
+    for counts in pool.imap_unordered(run_chunk, tasks):
+      for collection, count in counts.items():
+        totals[collection] = totals.get(collection, 0) + count
+  inserted = time.monotonic() - started
+  documents = sum(totals.values())
+  for collection in COLLECTIONS:
+    print(f"  {COLLECTIONS[collection]:<18} {totals.get(collection, 0):>10}")
+  print(f"{documents} documents in {inserted:.1f}s ({documents / max(inserted, 1e-9):.0f}/s)")
+
+  if db is not None:
+    phase = time.monotonic()
+    create_indexes(db)
+    rebuild_counters(db)
+    print(f"indexes and counters in {time.monotonic() - phase:.1f}s")
+  return 0
+
+
+def parse_args():
+  today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+  parser.add_argument("--uri", default="mongodb://localhost:27017/lih_bench")
+  parser.add_argument("--allow-remote", action="store_true")
+  parser.add_argument("--drop", action="store_true", help="replace the collections if they already have data")
+  parser.add_argument("--dry-run", action="store_true", help="generate everything without a database")
+  parser.add_argument("--seed", type=int, default=42)
+  parser.add_argument("--anchor", type=lambda value: datetime.fromisoformat(value).replace(tzinfo=timezone.utc),
+                      default=today, help="'now' of the dataset (ISO date, default today 00:00 UTC)")
+  parser.add_argument("--days", type=int, default=180, help="how far back posts, messages and resources go")
+  parser.add_argument("--scale", type=float, default=1, help="multiplies every count below")
+  parser.add_argument("--users", type=int, default=10000)
+  parser.add_argument("--courses", type=int, default=300)
+  parser.add_argument("--resources", type=int, default=5000)
+  parser.add_argument("--posts", type=int, default=20000)
+  parser.add_argument("--threads", type=int, default=20000, help="conversations (distinct user pairs)")
+  parser.add_argument("--notifications", type=int, default=100000)
+  parser.add_argument("--messages-per-thread", type=int, default=15)
+  parser.add_argument("--ratings-per-resource", type=float, default=4)
+  parser.add_argument("--likes-per-post", type=float, default=8)
+  parser.add_argument("--bookmarks-per-user", type=float, default=3)
+  parser.add_argument("--email-pattern", default="loaduser{}@lih.test")
+  parser.add_argument("--password", default="123456Q@")
+  parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+  parser.add_argument("--chunk-size", type=int, default=20000, help="documents per task")
+  parser.add_argument("--batch-size", type=int, default=5000, help="documents per insert_many")
+  return parser.parse_args()
+
+
+if __name__ == "__main__":
+  raise SystemExit(main(parse_args()))
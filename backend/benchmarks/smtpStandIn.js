@@ -0,0 +1,113 @@
+// Local SMTP stand-in for the email queue in src/lib/email.js.
+//
+//   node benchmarks/smtpStandIn.js [emails=50] [delayMs=200] [failureRate=0.1]
+//     starts the stand-in, queues `emails` messages through the real queue and prints
+//     queue depth and send latency until it drains.
+//   node benchmarks/smtpStandIn.js --serve [delayMs] [failureRate]
+//     only runs the stand-in; start the backend with SMTP_HOST=127.0.0.1 SMTP_PORT=2525
+//     and watch GET /api/admin/cache-stats.
+import net from "net";
+
+const args = process.argv.slice(2);
+const serveOnly = args[0] === "--serve";
+if (serveOnly) args.shift();
+
+const EMAILS = serveOnly ? 0 : Number(args.shift()) || 50;
+const DELAY_MS = Number(args.shift() ?? 200);
+const FAILURE_RATE = Number(args.shift() ?? 0.1);
+const PORT = Number(process.env.SMTP_PORT) || 2525;
+
+let received = 0;
+let rejected = 0;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+const handleConnection = (socket) => {
+    let inData = false;
+    let authStep = 0;
+    let buffer = "";
+    const reply = (line) => socket.write(`${line}\r\n`);
+
+    reply("220 smtp-stand-in ready");
+
+    const handleLine = async (line) => {
+        if (inData) {
+            if (line !== ".") return;
+            inData = false;
+            await sleep(DELAY_MS);
+            if (Math.random() < FAILURE_RATE) {
+                rejected += 1;
+                reply("451 4.3.0 simulated temporary failure");
+            } else {
+                received += 1;
+                reply("250 2.0.0 queued");
+            }
+            return;
+        }
+
+        if (authStep > 0) {
+            authStep -= 1;
+            reply(authStep > 0 ? "334 UGFzc3dvcmQ6" : "235 2.7.0 authenticated");
+            return;
+        }
+
+        const command = line.slice(0, 4).toUpperCase();
+        if (command === "EHLO") {
+            reply("250-smtp-stand-in");
+            reply("250 AUTH PLAIN LOGIN");
+        } else if (command === "AUTH") {
+            if (/^AUTH LOGIN/i.test(line)) {
+                authStep = 2;
+                reply("334 VXNlcm5hbWU6");
+            } else {
+                reply("235 2.7.0 authenticated");
+            }
+        } else if (command === "DATA") {
+            inData = true;
+            reply("354 end with <CRLF>.<CRLF>");
+        } else if (command === "QUIT") {
+            reply("221 bye");
+            socket.end();
+        } else {
+            reply("250 OK");
+        }
+    };
+
+    // lines are handled one at a time so a delayed DATA reply keeps its order
+    let chain = Promise.resolve();
+    socket.on("data", (chunk) => {
+        buffer += chunk.toString("utf8");
+        let index;
+        while ((index = buffer.indexOf("\r\n")) !== -1) {
+            const line = buffer.slice(0, index);
+            buffer = buffer.slice(index + 2);
+            chain = chain.then(() => handleLine(line));
+        }
+    });
+    socket.on("error", () => {});
+};
+
+const server = net.createServer(handleConnection);
+await new Promise(resolve => server.listen(PORT, "127.0.0.1", resolve));
+console.log(`SMTP stand-in on 127.0.0.1:${PORT} (delay ${DELAY_MS}ms, failure rate ${FAILURE_RATE})`);
+
+if (!serveOnly) {
+    process.env.SMTP_HOST = "127.0.0.1";
+    process.env.SMTP_PORT = String(PORT);
+    process.env.EMAIL_RETRY_BACKOFF_MS = process.env.EMAIL_RETRY_BACKOFF_MS || "200";
+    const { queueEmail, drainEmailQueue, getEmailStats } = await import("../src/lib/email.js");
+
+    const startedAt = Date.now();
+    for (let i = 0; i < EMAILS; i++) {
+        queueEmail({ from: "bench@example.com", to: `user${i}@example.com`, subject: "OTP", text: `code ${i}` });
+    }
+    console.log(`queued ${EMAILS} emails in ${Date.now() - startedAt}ms`);
+
+    const report = setInterval(() => console.log(getEmailStats()), 500);
+    await drainEmailQueue();
+    clearInterval(report);
+
+    console.log(`drained in ${Date.now() - startedAt}ms, stand-in accepted ${received}, rejected ${rejected}`);
+    console.log(getEmailStats());
+    process.exit(0);
+}
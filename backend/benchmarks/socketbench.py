@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Real-time delivery benchmark for socket.io messages and notifications.
+
+Connects simulated users in stages (--stages 250,500,1000), each socket with the
+same userId handshake query the frontend uses. At every stage, some users send
+direct messages through POST /api/message/send/:id and others post into the
+busiest departments through POST /api/posts/create. The benchmark times how long
+the server takes to deliver each resulting event:
+
+  newMessage                to the receiver's sockets
+  newNotification (message) to the receiver's sockets
+  newNotification (post)    to every connected user of the poster's department
+
+An event that has not arrived --grace seconds after its request counts as dropped.
+Each stage also counts the presence traffic its new connections cause: the
+getOnlineUsers snapshot each new socket gets, and the userOnline/userOffline
+deltas every connected socket receives.
+
+  pip install -r benchmarks/requirements.txt
+  python3 benchmarks/socketbench.py --users 2000 --stages 250,500,1000,2000
+
+Accounts are logged in like benchmarks/loadtest.py (--email-pattern or
+--accounts-file, shared --password); the login response gives their ids and departments.
+All timing happens in this one process, so the client's own event loop lag is
+reported next to the results. Run against a local backend and database only.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import aiohttp
+import socketio
+
+from loadtest import Client, Stats, percentile
+
+
+class BenchUser:
+  def __init__(self, client, email):
+    self.client = client
+    self.email = email
+    self.user_id = None
+    self.department = None
+    self.sio = None
+
+
+class Stage:
+  """Everything observed while the deployment had `target` connections."""
+
+  def __init__(self, target):
+    self.target = target
+    self.connect_ms = []
+    self.connect_failures = 0
+    self.snapshots = 0
+    self.snapshot_ids = 0
+    self.presence_events = 0
+    self.presence_ids = 0
+    # token -> (sent_at, receiver_id); message_id -> token once the request returns
+    self.messages = {}
+    self.message_ids = {}
+    # post_id -> (sent_at, ids of the connected users expected to receive it)
+    self.posts = {}
+    self.send_failures = 0
+    self.loop_lag_ms = []
+
+
+class Recorder:
+  """Socket events by arrival time, joined with the requests that caused them after each stage."""
+
+  def __init__(self):
+    self.stage = None
+    self.message_arrivals = {}
+    self.notification_arrivals = {}
+    self.unexpected = Counter()
+
+  def on_snapshot(self, user_ids):
+    self.stage.snapshots += 1
+    self.stage.snapshot_ids += len(user_ids)
+
+  def on_presence(self, user_ids):
+    self.stage.presence_events += 1
+    self.stage.presence_ids += len(user_ids) if isinstance(user_ids, list) else 1
+
+  def on_message(self, user, message):
+    token = (message or {}).get("text", "")
+    if token.startswith("bench:"):
+      self.message_arrivals.setdefault(token, time.perf_counter())
+    else:
+      self.unexpected["newMessage"] += 1
+
+  def on_notification(self, user, notification):
+    reference = (notification or {}).get("referenceId")
+    if reference:
+      self.notification_arrivals.setdefault((user.user_id, str(reference)), time.perf_counter())
+
+
+def latency_summary(latencies, expected):
+  ordered = sorted(latencies)
+  return {
+    "delivered": len(ordered),
+    "dropped": expected - len(ordered),
+    "p50_ms": round(percentile(ordered, 0.50), 1),
+    "p95_ms": round(percentile(ordered, 0.95), 1),
+    "p99_ms": round(percentile(ordered, 0.99), 1),
+    "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+  }
+
+
+def stage_results(stage, recorder):
+  message_ms = []
+  message_notification_ms = []
+  for token, (sent_at, receiver_id) in stage.messages.items():
+    if token in recorder.message_arrivals:
+      message_ms.append((recorder.message_arrivals[token] - sent_at) * 1000)
+  for message_id, token in stage.message_ids.items():
+    sent_at, receiver_id = stage.messages[token]
+    arrived = recorder.notification_arrivals.get((receiver_id, message_id))
+    if arrived:
+      message_notification_ms.append((arrived - sent_at) * 1000)
+
+  post_ms = []
+  post_expected = 0
+  for post_id, (sent_at, receivers) in stage.posts.items():
+    post_expected += len(receivers)
+    for receiver_id in receivers:
+      arrived = recorder.notification_arrivals.get((receiver_id, post_id))
+      if arrived:
+        post_ms.append((arrived - sent_at) * 1000)
+
+  connect = sorted(stage.connect_ms)
+  return {
+    "connections": stage.target,
+    "connect_p50_ms": round(percentile(connect, 0.50), 1),
+    "connect_p95_ms": round(percentile(connect, 0.95), 1),
+    "connect_failures": stage.connect_failures,
+    "presence": {
+      "snapshots": stage.snapshots,
+      "snapshot_ids": stage.snapshot_ids,
+      "delta_events": stage.presence_events,
+      "delta_ids": stage.presence_ids,
+    },
+    "messages": latency_summary(message_ms, len(stage.messages)),
+    "message_notifications": latency_summary(message_notification_ms, len(stage.message_ids)),
+    "post_notifications": {**latency_summary(post_ms, post_expected), "posts": len(stage.posts)},
+    "send_failures": stage.send_failures,
+    "client_loop_lag_p99_ms": round(percentile(sorted(stage.loop_lag_ms), 0.99), 1),
+  }
+
+
+async def connect(user, args, recorder, stage):
+  sio = socketio.AsyncClient(reconnection=False)
+  sio.on("getOnlineUsers", recorder.on_snapshot)
+  sio.on("userOnline", recorder.on_presence)
+  sio.on("userOffline", recorder.on_presence)
+  sio.on("newMessage", lambda message: recorder.on_message(user, message))
+  sio.on("newNotification", lambda notification: recorder.on_notification(user, notification))
+
+  query = f"userId={user.user_id}"
+  if args.presence_scope:
+    query += f"&presenceScope={args.presence_scope}"
+  started = time.perf_counter()
+  try:
+    await sio.connect(f"{args.base_url}?{query}", transports=["websocket"], wait_timeout=args.timeout)
+  except (socketio.exceptions.ConnectionError, asyncio.TimeoutError):
+    stage.connect_failures += 1
+    return
+  stage.connect_ms.append((time.perf_counter() - started) * 1000)
+  user.sio = sio
+
+
+async def send_message(sender, receiver, stage):
+  token = f"bench:{uuid.uuid4().hex}"
+  stage.messages[token] = (time.perf_counter(), receiver.user_id)
+  status, body, _ = await sender.client.call(
+    "POST", "/api/message/send/:id", f"/api/message/send/{receiver.user_id}", json={"text": token}
+  )
+  if status == 201:
+    stage.message_ids[json.loads(body)["_id"]] = token
+  else:
+    del stage.messages[token]
+    stage.send_failures += 1
+
+
+async def create_post(sender, connected, stage):
+  receivers = {
+    user.user_id for user in connected
+    if user.department == sender.department and user is not sender and user.sio
+  }
+  sent_at = time.perf_counter()
+  status, body, _ = await sender.client.call(
+    "POST", "/api/posts/create", "/api/posts/create",
+    json={"title": "socket benchmark", "description": f"bench post {uuid.uuid4().hex}", "category": "Community Post"},
+  )
+  if status == 201:
+    stage.posts[json.loads(body)["post"]["_id"]] = (sent_at, receivers)
+  else:
+    stage.send_failures += 1
+
+
+async def watch_loop_lag(stage, stop):
+  while not stop.is_set():
+    started = time.perf_counter()
+    await asyncio.sleep(0.1)
+    stage.loop_lag_ms.append(max(0.0, (time.perf_counter() - started - 0.1) * 1000))
+
+
+async def traffic(args, connected, stage, rng):
+  by_department = defaultdict(list)
+  for user in connected:
+    if user.department:
+      by_department[user.department].append(user)
+  # busy departments: a department is picked in proportion to its connected users
+  departments = list(by_department)
+  department_weights = [len(by_department[department]) for department in departments]
+
+  tasks = []
+  deadline = time.monotonic() + args.stage_duration
+  next_message = next_post = time.monotonic()
+  while time.monotonic() < deadline:
+    now = time.monotonic()
+    if args.message_rate and now >= next_message:
+      sender, receiver = rng.sample(connected, 2)
+      tasks.append(asyncio.create_task(send_message(sender, receiver, stage)))
+      next_message += 1 / args.message_rate
+    if args.post_rate and departments and now >= next_post:
+      department = rng.choices(departments, weights=department_weights)[0]
+      tasks.append(asyncio.create_task(create_post(rng.choice(by_department[department]), connected, stage)))
+      next_post += 1 / args.post_rate
+    await asyncio.sleep(0.005)
+  await asyncio.gather(*tasks)
+
+
+async def main(args):
+  if args.accounts_file:
+    with open(args.accounts_file) as file:
+      emails = [line.strip() for line in file if line.strip()][: args.users]
+  else:
+    emails = [args.email_pattern.format(i) for i in range(args.users)]
+  stages = sorted(int(value) for value in args.stages.split(","))
+
+  http_stats = Stats()
+  recorder = Recorder()
+  rng = random.Random(args.seed)
+  results = []
+  run_started = time.monotonic()
+  timeout = aiohttp.ClientTimeout(total=args.timeout)
+  async with aiohttp.ClientSession(timeout=timeout, cookie_jar=aiohttp.DummyCookieJar()) as http:
+    users = [BenchUser(Client(http, args.base_url, http_stats), email) for email in emails]
+    gate = asyncio.Semaphore(args.login_concurrency)
+
+    async def login(user):
+      async with gate:
+        await user.client.login(user.email, args.password)
+        user.user_id = user.client.user_id
+        user.department = user.client.profile_data.get("department")
+
+    started = time.monotonic()
+    outcomes = await asyncio.gather(*(login(user) for user in users), return_exceptions=True)
+    users = [user for user, outcome in zip(users, outcomes) if not isinstance(outcome, Exception)]
+    print(f"logged in {len(users)}/{len(emails)} accounts in {time.monotonic() - started:.1f}s")
+    if len(users) < 2:
+      return 1
+    rng.shuffle(users)
+
+    connected = []
+    # users already tried, connected or not; a failed handshake is not retried in later stages
+    attempted = 0
+    for target in stages:
+      stage = Stage(min(target, len(users)))
+      recorder.stage = stage
+      stop = asyncio.Event()
+      lag_watcher = asyncio.create_task(watch_loop_lag(stage, stop))
+
+      gate = asyncio.Semaphore(args.connect_concurrency)
+
+      async def connect_one(user):
+        async with gate:
+          await connect(user, args, recorder, stage)
+
+      joining = users[attempted:stage.target]
+      attempted = max(attempted, stage.target)
+      await asyncio.gather(*(connect_one(user) for user in joining))
+      connected.extend(user for user in joining if user.sio)
+      # let coalesced presence deltas flush before traffic starts
+      await asyncio.sleep(args.settle)
+
+      if len(connected) >= 2:
+        await traffic(args, connected, stage, rng)
+      await asyncio.sleep(args.grace)
+      stop.set()
+      await lag_watcher
+
+      result = stage_results(stage, recorder)
+      results.append(result)
+      print_stage(result)
+
+    await asyncio.gather(*(user.sio.disconnect() for user in connected))
+
+  if recorder.unexpected:
+    print(f"events without a benchmark token: {dict(recorder.unexpected)}")
+  if args.json:
+    with open(args.json, "w") as file:
+      json.dump({"stages": results, "http": http_stats.report(time.monotonic() - run_started)}, file, indent=2)
+  return 0
+
+
+def print_stage(result):
+  presence = result["presence"]
+  print(
+    f"\n{result['connections']} connections: connect p50 {result['connect_p50_ms']} ms, "
+    f"p95 {result['connect_p95_ms']} ms, {result['connect_failures']} failed; "
+    f"client loop lag p99 {result['client_loop_lag_p99_ms']} ms"
+  )
+  print(
+    f"  presence: {presence['snapshots']} snapshots ({presence['snapshot_ids']} ids), "
+    f"{presence['delta_events']} delta events ({presence['delta_ids']} ids)"
+  )
+  for name in ("messages", "message_notifications", "post_notifications"):
+    row = result[name]
+    print(
+      f"  {name:<22} delivered {row['delivered']:>6} dropped {row['dropped']:>5} "
+      f"p50 {row['p50_ms']:>7} p95 {row['p95_ms']:>7} p99 {row['p99_ms']:>7} max {row['max_ms']:>7}"
+    )
+  if result["send_failures"]:
+    print(f"  {result['send_failures']} requests failed")
+
+
+def parse_args():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+  parser.add_argument("--base-url", default="http://localhost:5001")
+  parser.add_argument("--users", type=int, default=1000)
+  parser.add_argument("--email-pattern", default="loaduser{}@lih.test")
+  parser.add_argument("--accounts-file")
+  parser.add_argument("--password", default="123456Q@")
+  parser.add_argument("--stages", default="100,250,500,1000", help="connection counts to measure at")
+  parser.add_argument("--stage-duration", type=float, default=10, help="seconds of traffic per stage")
+  parser.add_argument("--message-rate", type=float, default=20, help="direct messages per second")
+  parser.add_argument("--post-rate", type=float, default=1, help="department posts per second")
+  parser.add_argument("--presence-scope", choices=["conversations", "none"], help="handshake presenceScope")
+  parser.add_argument("--settle", type=float, default=2, help="seconds between connecting and traffic")
+  parser.add_argument("--grace", type=float, default=5, help="seconds an event may take before it counts as dropped")
+  parser.add_argument("--login-concurrency", type=int, default=8)
+  parser.add_argument("--connect-concurrency", type=int, default=50)
+  parser.add_argument("--timeout", type=float, default=30)
+  parser.add_argument("--seed", type=int, default=1)
+  parser.add_argument("--json", help="also write the results to this file")
+  return parser.parse_args()
+
+
+if __name__ == "__main__":
+  raise SystemExit(asyncio.run(main(parse_args())))
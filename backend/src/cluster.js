@@ -0,0 +1,17 @@
+import cluster from "cluster";
+import os from "os";
+import dotenv from "dotenv";
+import { startPrimary } from "./lib/cluster.js";
+
+dotenv.config();
+
+// Cluster entry point: the primary only balances connections and relays
+// socket.io / presence traffic, each worker runs the full app from index.js.
+if (cluster.isPrimary) {
+    startPrimary({
+        port: process.env.PORT,
+        workers: Number(process.env.CLUSTER_WORKERS) || os.availableParallelism()
+    });
+} else {
+    await import("./index.js");
+}
@@ -1,31 +1,24 @@
+import mongoose from "mongoose";
 import AcademicResource from "../models/academicResource.model.js";
-import cloudinary from "../lib/cloudinary.js"; 
-import streamifier from 'streamifier'; 
+import ResourceRating from "../models/resourceRating.model.js";
+import Course from "../models/course.model.js";
+import { invalidateCourseCatalog } from "./courses.controllers.js";
+import { parseLimit, decodeCursor, applyCursor, buildPage } from "../lib/pagination.js";
+import { CounterBuffer } from "../lib/counterBuffer.js";
+import { LRUCache } from "../lib/cache.js";
+import { invalidateResponseCache } from "../lib/responseCache.js";
 import path from 'path'; 
+import { getStorageAdapter } from "../lib/storage/index.js";
 
 
-const uploadToCloudinary = (buffer, originalFilename) => { 
-    return new Promise((resolve, reject) => {
-        const uploadStream = cloudinary.uploader.upload_stream(
-            {
-                resource_type: "auto", 
-                public_id: path.parse(originalFilename).name,
-                use_filename: true,
-                unique_filename: false 
-            },
-            (error, result) => {
-                if (error) {
-                    reject(error);
-                } else {
-                    resolve(result);
-                }
-            }
-        );
-        streamifier.createReadStream(buffer).pipe(uploadStream);
-    });
+const removeStoredFile = async (file) => {
+    try {
+        await getStorageAdapter().remove(file.storageId, { resourceType: file.resourceType });
+    } catch (error) {
+        console.error("Remove Stored File Error:", error.message);
+    }
 };
 
-
 export const uploadResource = async (req, res) => {
     const {
         course_code,
@@ -40,18 +33,13 @@ export const uploadResource = async (req, res) => {
     }
 
     if (!course_code || !topic || !description) {
+        await removeStoredFile(req.file);
         return res.status(400).json({ message: "Course code, topic, and description are required." });
     }
 
     try {
-  
-        const cloudinaryResult = await uploadToCloudinary(req.file.buffer, req.file.originalname);
-
-        if (!cloudinaryResult || !cloudinaryResult.secure_url) {
-            throw new Error("Cloudinary upload failed");
-        }
-
-        const fileExtension = path.extname(req.file.originalname).slice(1) || cloudinaryResult.format;
+        // multer has already streamed the file to storage; req.file holds the adapter result
+        const fileExtension = path.extname(req.file.originalname).slice(1) || req.file.format;
 
         const newResource = new AcademicResource({
             uploader_id,
@@ -59,23 +47,72 @@ export const uploadResource = async (req, res) => {
             course_code,
             topic,
             original_filename: req.file.originalname,
-            file_url: cloudinaryResult.secure_url, 
+            file_url: req.file.url, 
             file_type: fileExtension, 
-            file_size: cloudinaryResult.bytes,
+            file_size: req.file.size,
             role: req.user.role, 
             description,
             downloads: 0 
         });
 
         await newResource.save();
+        await Course.updateOne({ course_code }, { $inc: { resourceCount: 1 } });
+        invalidateCourseCatalog();
+        invalidateResponseCache("resources");
         res.status(201).json({ message: "Resource uploaded", resource: newResource });
     } catch (error) {
         console.error("Upload Error:", error.message);
-        if (error.message.includes("Cloudinary")) {
-             res.status(500).json({ message: "File upload to storage failed." });
-        } else {
-             res.status(500).json({ message: "Internal Server Error" });
+        await removeStoredFile(req.file);
+        res.status(500).json({ message: "Internal Server Error" });
+    }
+};
+
+const RESOURCE_LIST_PROJECTION = { ratings: 0, ratingSum: 0 };
+
+// sortable fields and how their cursor values are decoded
+const RESOURCE_SORTS = {
+    uploaded_at: "date",
+    averageRating: "number",
+    downloads: "number",
+};
+
+const buildResourceFilter = ({ course_code, file_type, role, q }) => {
+    const filter = {};
+    if (course_code) filter.course_code = course_code;
+    if (file_type) filter.file_type = file_type;
+    if (role) filter.role = role;
+    if (q && q.trim()) filter.$text = { $search: q.trim() };
+    return filter;
+};
+
+export const findResourcesPage = async (filter, { sort = "uploaded_at", cursor, limit }) => {
+    const sortField = RESOURCE_SORTS[sort] ? sort : "uploaded_at";
+    const decodedCursor = decodeCursor(cursor, RESOURCE_SORTS[sortField]);
+    if (cursor && !decodedCursor) {
+        return null;
+    }
+
+    const limitNum = parseLimit(limit, 20, 100);
+    const resources = await AcademicResource.find(applyCursor(filter, sortField, decodedCursor))
+        .sort({ [sortField]: -1, _id: -1 })
+        .limit(limitNum + 1)
+        .select(RESOURCE_LIST_PROJECTION)
+        .lean();
+
+    const { items, hasMore, nextCursor } = buildPage(resources, limitNum, sortField);
+    return { resources: items, nextCursor, hasMore };
+};
+
+export const searchResources = async (req, res) => {
+    try {
+        const page = await findResourcesPage(buildResourceFilter(req.query), req.query);
+        if (!page) {
+            return res.status(400).json({ message: "Invalid cursor" });
         }
+        res.status(200).json(page);
+    } catch (error) {
+        console.error("Search Resources Error:", error.message);
+        res.status(500).json({ message: "Internal Server Error" });
     }
 };
 
@@ -83,8 +120,19 @@ export const getResourcesByCourse = async (req, res) => {
     const { course_code } = req.params;
 
     try {
+        // paginated when the client opts in with cursor/limit, full list otherwise
+        if (req.query.cursor !== undefined || req.query.limit !== undefined) {
+            const page = await findResourcesPage(buildResourceFilter({ ...req.query, course_code }), req.query);
+            if (!page) {
+                return res.status(400).json({ message: "Invalid cursor" });
+            }
+            return res.status(200).json(page);
+        }
+
         const resources = await AcademicResource.find({ course_code })
-            .populate("uploader_id", "email role");
+            .sort({ uploaded_at: -1, _id: -1 })
+            .select(RESOURCE_LIST_PROJECTION)
+            .lean();
         res.status(200).json(resources);
     } catch (error) {
         console.error("Fetch Error:", error.message);
@@ -92,30 +140,74 @@ export const getResourcesByCourse = async (req, res) => {
     }
 };
 
+// returns the user's previous rating, or null for a first rating
+const recordRating = async (resourceId, userId, rating) => {
+    try {
+        return await ResourceRating.findOneAndUpdate(
+            { resourceId, userId },
+            { $set: { rating } },
+            { upsert: true, new: false }
+        ).lean();
+    } catch (error) {
+        // two first-time ratings from the same user raced on the unique index; the retry updates
+        if (error.code !== 11000) throw error;
+        return ResourceRating.findOneAndUpdate({ resourceId, userId }, { $set: { rating } }, { new: false }).lean();
+    }
+};
+
 export const addOrUpdateRating = async (req, res) => {
     const { resourceId } = req.params;
-    const { rating } = req.body;
+    const rating = Number(req.body.rating);
     const userId = req.user._id; 
 
     if (!rating || rating < 1 || rating > 5) {
         return res.status(400).json({ message: "Invalid rating value. Must be between 1 and 5." });
     }
 
+    if (!mongoose.Types.ObjectId.isValid(resourceId)) {
+        return res.status(400).json({ message: "Invalid resource ID format." });
+    }
+
     try {
-        const resource = await AcademicResource.findById(resourceId);
-        if (!resource) {
+        const existing = await AcademicResource.findById(resourceId).select("ratings").lean();
+        if (!existing) {
             return res.status(404).json({ message: "Resource not found." });
         }
-
-        const existingRatingIndex = resource.ratings.findIndex(r => r.userId.equals(userId));
-
-        if (existingRatingIndex > -1) {
-            resource.ratings[existingRatingIndex].rating = rating;
-        } else {
-            resource.ratings.push({ userId, rating });
+        // not migrated yet (npm run migrate): its old ratings must count towards the totals
+        if (existing.ratings?.length) {
+            await ResourceRating.importEmbedded(existing);
         }
 
-        await resource.save();
+        const previous = await recordRating(resourceId, userId, rating);
+        const sumDelta = previous ? rating - previous.rating : rating;
+        const countDelta = previous ? 0 : 1;
+
+        // each rating applies only its own delta in one atomic write, so concurrent ratings
+        // compose instead of overwriting each other
+        const resource = await AcademicResource.findOneAndUpdate(
+            { _id: resourceId },
+            [
+                {
+                    $set: {
+                        ratingSum: { $add: [{ $ifNull: ["$ratingSum", 0] }, sumDelta] },
+                        numberOfRatings: { $add: [{ $ifNull: ["$numberOfRatings", 0] }, countDelta] },
+                    }
+                },
+                {
+                    $set: {
+                        averageRating: {
+                            $cond: [
+                                { $gt: ["$numberOfRatings", 0] },
+                                { $round: [{ $divide: ["$ratingSum", "$numberOfRatings"] }, 1] },
+                                0
+                            ]
+                        }
+                    }
+                }
+            ],
+            { new: true, projection: { averageRating: 1, numberOfRatings: 1 } }
+        ).lean();
+        invalidateResponseCache("resources");
 
         res.status(200).json({ 
             message: "Rating submitted successfully.", 
@@ -130,23 +222,47 @@ export const addOrUpdateRating = async (req, res) => {
 };
 
 
+// last persisted download count per resource, so clicks can be answered without a read
+const downloadBaseCache = new LRUCache({ max: 10000, ttl: 5 * 60 * 1000 });
+
+const downloadCounter = new CounterBuffer(AcademicResource, "downloads", {
+    flushInterval: 5000,
+    maxKeys: 500,
+    onFlush: (flushed) => {
+        flushed.forEach((count, id) => {
+            const base = downloadBaseCache.get(id);
+            if (base !== undefined) {
+                downloadBaseCache.set(id, base + count);
+            }
+        });
+    }
+}).start();
+
+export const flushDownloadCounts = () => downloadCounter.drain();
+
 export const incrementDownloadCount = async (req, res) => {
     const { resourceId } = req.params;
 
-    try {
-        const resource = await AcademicResource.findByIdAndUpdate(
-            resourceId,
-            { $inc: { downloads: 1 } }, 
-            { new: true } 
-        );
+    if (!mongoose.Types.ObjectId.isValid(resourceId)) {
+        return res.status(400).json({ message: "Invalid resource ID format." });
+    }
 
-        if (!resource) {
-            return res.status(404).json({ message: "Resource not found." });
+    try {
+        let base = downloadBaseCache.get(resourceId);
+        if (base === undefined) {
+            const resource = await AcademicResource.findById(resourceId).select("downloads").lean();
+            if (!resource) {
+                return res.status(404).json({ message: "Resource not found." });
+            }
+            base = resource.downloads || 0;
+            downloadBaseCache.set(resourceId, base);
         }
 
+        downloadCounter.increment(resourceId);
+
         res.status(200).json({ 
             message: "Download count updated.", 
-            downloads: resource.downloads 
+            downloads: base + downloadCounter.pendingFor(resourceId)
         });
 
     } catch (error) {
@@ -158,8 +274,18 @@ export const incrementDownloadCount = async (req, res) => {
 
 export const getAllResources = async (req, res) => {
     try {
+        if (req.query.cursor !== undefined || req.query.limit !== undefined) {
+            const page = await findResourcesPage(buildResourceFilter(req.query), req.query);
+            if (!page) {
+                return res.status(400).json({ message: "Invalid cursor" });
+            }
+            return res.status(200).json(page);
+        }
+
         const resources = await AcademicResource.find({})
-            .populate("uploader_id", "email role");
+            .sort({ uploaded_at: -1, _id: -1 })
+            .select(RESOURCE_LIST_PROJECTION)
+            .lean();
         res.status(200).json(resources);
     } catch (error) {
         console.error("Fetch Error:", error.message);
@@ -1,6 +1,14 @@
 import User from '../models/user.models.js';
 import Post from '../models/post.model.js';
+import PostLike from '../models/postLike.model.js';
 import AcademicResource from '../models/academicResource.model.js';
+import Course from '../models/course.model.js';
+import ResourceRating from '../models/resourceRating.model.js';
+import { invalidatePostCounts, invalidateFeedCache } from './posts.controllers.js';
+import { invalidateCourseCatalog } from './courses.controllers.js';
+import { invalidateCachedUser, getUserCacheStats } from '../lib/userCache.js';
+import { getEmailStats } from '../lib/email.js';
+import { invalidateResponseCache, getResponseCacheStats } from '../lib/responseCache.js';
 
 export const getAllUsers = async (req, res) => {
   try {
@@ -26,6 +34,7 @@ export const deleteUser = async (req, res) => {
     }
 
     await User.findByIdAndDelete(userId);
+    invalidateCachedUser(userId);
     return res.status(200).json({ message: 'User deleted successfully' });
   } catch (error) {
     console.error('Error deleting user:', error);
@@ -47,6 +56,9 @@ export const deletePost = async (req, res) => {
     }
 
     await Post.findByIdAndDelete(postId);
+    await PostLike.deleteMany({ postId });
+    invalidatePostCounts();
+    invalidateFeedCache();
     return res.status(200).json({ message: 'Post deleted successfully' });
   } catch (error) {
     console.error('Error deleting post:', error);
@@ -69,9 +81,22 @@ export const deleteResource = async (req, res) => {
     }
 
     await AcademicResource.findByIdAndDelete(resourceId);
+    await ResourceRating.deleteMany({ resourceId });
+    await Course.updateOne({ course_code: resource.course_code }, { $inc: { resourceCount: -1 } });
+    invalidateCourseCatalog();
+    invalidateResponseCache('resources');
     return res.status(200).json({ message: 'Resource deleted successfully' });
   } catch (error) {
     console.error('Error deleting resource:', error);
     return res.status(500).json({ error: 'Failed to delete resource' });
   }
-};
\ No newline at end of file
+};
+
+export const getCacheStats = async (req, res) => {
+  try {
+    return res.status(200).json({ userCache: getUserCacheStats(), responseCache: getResponseCacheStats(), email: getEmailStats() });
+  } catch (error) {
+    console.error('Error fetching cache stats:', error);
+    return res.status(500).json({ error: 'Failed to fetch cache stats' });
+  }
+};
@@ -2,8 +2,9 @@ import cloudinary from "../lib/cloudinary.js";
 import { generateToken } from "../lib/utils.js";
 import User from "../models/user.models.js"
 import { sendOTPVerificationEmail } from "../lib/sendOTPVerification.js";
-import  bcrypt from "bcryptjs"
+import { hashPassword, comparePassword, isHashPoolFull, sendHashPoolBusy } from "../lib/passwordHash.js";
 import UserOTPVerification from "../models/userOTPVerification.models.js"; 
+import { invalidateCachedUser } from "../lib/userCache.js";
 
 export const signup = async (req, res) => {
     const { role, email, password, profile_data } = req.body;
@@ -42,8 +43,7 @@ export const signup = async (req, res) => {
             return res.status(400).json({ message: "Email already exists" });
         }
 
-        const salt = await bcrypt.genSalt(10);
-        const hashedPassword = await bcrypt.hash(password, salt);
+        const hashedPassword = await hashPassword(password, 10);
 
         const pendingUser = {
             role,
@@ -60,6 +60,9 @@ export const signup = async (req, res) => {
         return;
 
     } catch (error) {
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res);
+        }
         console.error("Error in signup Controller:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
     }
@@ -83,7 +86,7 @@ export const verifySignupOTP = async (req, res) => {
             return res.status(400).json({ message: "OTP has expired. Please signup again." });
         }
         
-        const isMatch = await bcrypt.compare(otp, otpRecord.otp);
+        const isMatch = await comparePassword(otp, otpRecord.otp);
         if (!isMatch) {
             return res.status(400).json({ message: "Incorrect OTP. Please try again." });
         }
@@ -113,6 +116,9 @@ export const verifySignupOTP = async (req, res) => {
         });
         
     } catch (error) {
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res);
+        }
         console.error("Error in verifySignupOTP controller:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
     }
@@ -149,7 +155,7 @@ export const login = async (req, res) => {
         
         
         
-        const isPasswordCorrect = await bcrypt.compare(password, user.password)
+        const isPasswordCorrect = await comparePassword(password, user.password)
         if(!isPasswordCorrect){
             return res.status(400).json({message: "Invalid Password"})
         }
@@ -164,6 +170,9 @@ export const login = async (req, res) => {
         })
 
     }catch(error){
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res);
+        }
         res.status(500).json({ message: "Internal Server Error" });
     }
 };
@@ -231,6 +240,7 @@ export const updateProfile = async (req, res) => {
         }
 
         const updatedUser = await User.findByIdAndUpdate(userId, updated_user_info, { new: true });
+        invalidateCachedUser(userId);
 
         res.status(200).json(updatedUser);
 
@@ -259,7 +269,7 @@ export const updatePassword = async (req, res) => {
             return res.status(404).json({ message: "User not found" });
         }
 
-        const isMatch = await bcrypt.compare(oldPassword, user.password);
+        const isMatch = await comparePassword(oldPassword, user.password);
         if (!isMatch) {
             return res.status(400).json({ message: "Old password is incorrect" });
         }
@@ -275,14 +285,17 @@ export const updatePassword = async (req, res) => {
             });
         }
 
-        const salt = await bcrypt.genSalt(10);
-        const hashedNewPassword = await bcrypt.hash(newPassword, salt);
+        const hashedNewPassword = await hashPassword(newPassword, 10);
         user.password = hashedNewPassword;
         await user.save();
+        invalidateCachedUser(userId);
 
         res.status(200).json({ message: "Password updated successfully" });
         
     } catch (error) {
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res);
+        }
         res.status(500).json({ message: "Internal Server Error" });
     }
 
@@ -351,13 +364,14 @@ export const completeUserVerification = async (req, res) => {
             return res.status(400).json({ message: "OTP has expired. Please request a new verification code." });
         }
         
-        const isMatch = await bcrypt.compare(otp, otpRecord.otp);
+        const isMatch = await comparePassword(otp, otpRecord.otp);
         if (!isMatch) {
             return res.status(400).json({ message: "Incorrect OTP. Please try again." });
         }
 
         user.verified = true;
         await user.save();
+        invalidateCachedUser(user._id);
         
         await UserOTPVerification.deleteMany({ email });
         
@@ -373,6 +387,9 @@ export const completeUserVerification = async (req, res) => {
         });
         
     } catch (error) {
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res);
+        }
         console.error("Error in completeUserVerification controller:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
     }
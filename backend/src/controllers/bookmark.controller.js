@@ -1,6 +1,8 @@
 import User from "../models/user.models.js";
 import AcademicResource from "../models/academicResource.model.js";
 import mongoose from "mongoose";
+import { invalidateCachedUser } from "../lib/userCache.js";
+import { findResourcesPage } from "./academicResource.controller.js";
 
 
 export const toggleBookmark = async (req, res) => {
@@ -14,52 +16,43 @@ export const toggleBookmark = async (req, res) => {
 
         const resourceObjectId = new mongoose.Types.ObjectId(resourceId);
 
-        const resourceExists = await AcademicResource.findById(resourceObjectId);
+        const resourceExists = await AcademicResource.exists({ _id: resourceObjectId });
         if (!resourceExists) {
             return res.status(404).json({ message: "Resource not found" });
         }
 
-        const user = await User.findById(userId);
-        if (!user) {
-            return res.status(404).json({ message: "User not found" });
-        }
-
-        if (!user.profile_data) {
-            user.profile_data = {};
-        }
-
-        if (!user.profile_data.bookmarks) {
-            user.profile_data.bookmarks = [];
-        }
-
-        const bookmarkExists = user.profile_data.bookmarks.some(
-            bookmark => bookmark.toString() === resourceId
+        // add-or-remove decided inside the update, so double clicks can't race each other
+        const bookmarks = { $ifNull: ["$profile_data.bookmarks", []] };
+        const updatedUser = await User.findOneAndUpdate(
+            { _id: userId },
+            [{
+                $set: {
+                    "profile_data.bookmarks": {
+                        $cond: [
+                            { $in: [resourceObjectId, bookmarks] },
+                            { $filter: { input: bookmarks, cond: { $ne: ["$$this", resourceObjectId] } } },
+                            { $concatArrays: [bookmarks, [resourceObjectId]] }
+                        ]
+                    }
+                }
+            }],
+            {
+                new: true,
+                lean: true,
+                projection: { _id: 0, isBookmarked: { $in: [resourceObjectId, "$profile_data.bookmarks"] } }
+            }
         );
 
-        let isBookmarked = false;
-
-        if (bookmarkExists) {
-
-            await User.updateOne(
-                { _id: userId },
-                { $pull: { "profile_data.bookmarks": resourceObjectId } }
-            );
-            isBookmarked = false;
-        } else {
-
-            await User.updateOne(
-                { _id: userId },
-                { $push: { "profile_data.bookmarks": resourceObjectId } }
-            );
-            isBookmarked = true;
+        if (!updatedUser) {
+            return res.status(404).json({ message: "User not found" });
         }
 
-        const updatedUser = await User.findById(userId);
-        
+        invalidateCachedUser(userId);
+
+        const isBookmarked = updatedUser.isBookmarked;
         return res.status(200).json({
             message: isBookmarked ? "Resource bookmarked successfully" : "Bookmark removed successfully",
-            isBookmarked,
-            bookmarks: updatedUser.profile_data.bookmarks || []
+            isBookmarked
         });
     } catch (error) {
         console.error("Bookmark Error:", error.message);
@@ -67,27 +60,44 @@ export const toggleBookmark = async (req, res) => {
     }
 };
 
+const getBookmarkIds = async (userId) => {
+    const user = await User.findById(userId).select("profile_data.bookmarks").lean();
+    return user ? user.profile_data?.bookmarks || [] : null;
+};
+
+export const getBookmarkedResourceIds = async (req, res) => {
+    try {
+        const bookmarkIds = await getBookmarkIds(req.user._id);
+        if (!bookmarkIds) {
+            return res.status(404).json({ message: "User not found" });
+        }
+
+        return res.status(200).json(bookmarkIds);
+    } catch (error) {
+        console.error("Get Bookmark Ids Error:", error.message);
+        return res.status(500).json({ message: "Internal Server Error" });
+    }
+};
 
 export const getBookmarkedResources = async (req, res) => {
     try {
-        const userId = req.user._id;
-
-        const user = await User.findById(userId);
-        if (!user) {
+        const bookmarkIds = await getBookmarkIds(req.user._id);
+        if (!bookmarkIds) {
             return res.status(404).json({ message: "User not found" });
         }
 
-        if (!user.profile_data || !user.profile_data.bookmarks || user.profile_data.bookmarks.length === 0) {
-            return res.status(200).json([]);
+        if (bookmarkIds.length === 0) {
+            return res.status(200).json({ resources: [], nextCursor: null, hasMore: false });
         }
 
-        const bookmarkedResources = await AcademicResource.find({
-            _id: { $in: user.profile_data.bookmarks }
-        }).populate("uploader_id", "email role");
+        const page = await findResourcesPage({ _id: { $in: bookmarkIds } }, req.query);
+        if (!page) {
+            return res.status(400).json({ message: "Invalid cursor" });
+        }
 
-        return res.status(200).json(bookmarkedResources);
+        return res.status(200).json(page);
     } catch (error) {
         console.error("Get Bookmarks Error:", error.message);
         return res.status(500).json({ message: "Internal Server Error" });
     }
-};
\ No newline at end of file
+};
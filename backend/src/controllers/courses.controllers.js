@@ -1,29 +1,15 @@
 import Course from "../models/course.model.js";
+import { invalidateResponseCache } from "../lib/responseCache.js";
 
+export const invalidateCourseCatalog = () => {
+    invalidateResponseCache("courses");
+};
+
+// served through cacheResponse("courses") in courses.routes.js
 export const getAllCourses = async (req, res) => {
     try {
-        const coursesWithResourceCount = await Course.aggregate([
-            {
-                $lookup: {
-                    from: "academicresources", 
-                    localField: "course_code", 
-                    foreignField: "course_code", 
-                    as: "resources"
-                }
-            },
-            {
-                $addFields: {
-                    resourceCount: { $size: "$resources" } 
-                }
-            },
-            {
-                $project: {
-                    resources: 0 
-                }
-            }
-        ]);
-
-        res.status(200).json(coursesWithResourceCount);
+        const courses = await Course.find({}).lean();
+        res.status(200).json(courses);
     } catch (error) {
         console.error("Fetch Courses Error:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
@@ -49,6 +35,7 @@ export const createCourse = async (req, res) => {
         });
 
         await newCourse.save();
+        invalidateCourseCatalog();
         res.status(201).json({ course: newCourse });
     }
     catch (error) {
@@ -1,14 +1,93 @@
-import User from "../models/user.models.js";
+import mongoose from "mongoose";
+import User, { SEARCH_COLLATION } from "../models/user.models.js";
 import Message from "../models/message.models.js";
-import cloudinary from "../lib/cloudinary.js"; 
-import { getReceiverSocketId, io } from "../lib/socket.js";
+import Conversation from "../models/conversation.model.js";
+import fs from "fs";
+import { Readable } from "stream";
+import { emitToUser } from "../lib/socket.js";
+import { getStorageAdapter } from "../lib/storage/index.js";
+import { JobQueue } from "../lib/jobQueue.js";
 import { createMessageNotification } from "./notification.controllers.js";
+import { parseLimit, decodeCursor, applyCursor, buildPage } from "../lib/pagination.js";
+
+const SIDEBAR_USER_FIELDS = "email profile_data.name profile_data.profilePicture.url";
+
+const toSidebarUser = (user) => ({
+    _id: user._id,
+    email: user.email,
+    name: user.profile_data?.name || user.email,
+    avatar: user.profile_data?.profilePicture?.url || undefined,
+});
+
+const prefixRange = (prefix) => ({ $gte: prefix, $lt: `${prefix}\uffff` });
+
+const getRecentPartners = async (myId, limit) => {
+    const conversations = await Conversation.find({ participants: myId })
+        .sort({ lastMessageAt: -1, _id: -1 })
+        .limit(limit)
+        .select("participants lastMessageAt")
+        .lean();
+
+    return conversations.map(conversation => ({
+        partnerId: conversation.participants.find(id => !id.equals(myId)),
+        lastMessageAt: conversation.lastMessageAt,
+    })).filter(entry => entry.partnerId);
+};
 
 export const getUsersForSidebar = async (req, res) => {
     try {
         const loggedInUserId = req.user._id;
-        const filteredUsers = await User.find({ _id: { $ne: loggedInUserId } }).select("-password");
-        res.status(200).json(filteredUsers);        
+        const { search = "", cursor, limit } = req.query;
+        const limitNum = parseLimit(limit, 20, 50);
+        const term = search.trim();
+
+        const query = { _id: { $ne: loggedInUserId } };
+        if (term) {
+            // range scans on the collated indexes give case-insensitive prefix matching
+            query.$or = [
+                { email: prefixRange(term) },
+                { "profile_data.name": prefixRange(term) },
+            ];
+        }
+        if (cursor) {
+            query.email = { ...(query.email || {}), $gt: cursor };
+        }
+
+        const directory = await User.find(query)
+            .collation(SEARCH_COLLATION)
+            .sort({ email: 1 })
+            .limit(limitNum + 1)
+            .select(SIDEBAR_USER_FIELDS)
+            .lean();
+
+        const hasMore = directory.length > limitNum;
+        let users = (hasMore ? directory.slice(0, limitNum) : directory).map(toSidebarUser);
+        const nextCursor = hasMore ? users[users.length - 1].email : null;
+
+        if (!cursor) {
+            const recent = await getRecentPartners(loggedInUserId, limitNum);
+            const recentRank = new Map(recent.map((entry, index) => [entry.partnerId.toString(), index]));
+
+            if (!term) {
+                // first page of the unfiltered list leads with recent conversations
+                const listed = new Set(users.map(user => user._id.toString()));
+                const missingIds = recent
+                    .map(entry => entry.partnerId)
+                    .filter(id => !listed.has(id.toString()));
+
+                if (missingIds.length > 0) {
+                    const partners = await User.find({ _id: { $in: missingIds } })
+                        .select(SIDEBAR_USER_FIELDS)
+                        .lean();
+                    users = users.concat(partners.map(toSidebarUser));
+                }
+            }
+
+            const rankOf = (user) => recentRank.get(user._id.toString()) ?? recent.length;
+            users.sort((a, b) => rankOf(a) - rankOf(b));
+        }
+
+        res.status(200).json({ users, nextCursor, hasMore });
     } catch (error) {
         console.error("Error in getUsersForSidebar:", error.message)
         res.status(500).json({ error: "Internal Server Error" });
@@ -18,50 +97,231 @@ export const getUsersForSidebar = async (req, res) => {
 export const getMessages = async (req, res) => {
     try {
         const { id:userToChatId } = req.params;
+        const { before, limit } = req.query;
         const myId = req.user._id; 
-        const messages = await Message.find({ 
+
+        if (!mongoose.Types.ObjectId.isValid(userToChatId)) {
+            return res.status(400).json({ error: "Invalid user ID format" });
+        }
+
+        const beforeCursor = decodeCursor(before);
+        if (before && !beforeCursor) {
+            return res.status(400).json({ error: "Invalid cursor" });
+        }
+
+        const limitNum = parseLimit(limit, 50, 100);
+        const chatId = new mongoose.Types.ObjectId(userToChatId);
+
+        const query = applyCursor({ 
             $or: [ 
-                { senderID: myId, receiverID: userToChatId }, 
-                { senderID: userToChatId, receiverID: myId } 
+                { senderID: myId, receiverID: chatId }, 
+                { senderID: chatId, receiverID: myId } 
             ]
+        }, "createdAt", beforeCursor);
+
+        const newestFirst = await Message.find(query)
+            .sort({ createdAt: -1, _id: -1 })
+            .limit(limitNum + 1)
+            .lean();
+
+        const { items, hasMore, nextCursor } = buildPage(newestFirst, limitNum, "createdAt");
+
+        if (!before) {
+            await Conversation.updateOne(
+                { pairKey: Conversation.pairKeyFor(myId, chatId) },
+                { $set: { [`unreadCounts.${myId}`]: 0 } }
+            );
+        }
+
+        res.status(200).json({
+            messages: items.reverse(),
+            nextCursor,
+            hasMore,
         });
-        res.status(200).json(messages);
     } catch (error) {
         console.error("Error in getMessages:", error.message);
         res.status(500).json({ error: "Internal Server Error" });
     }
 };
 
+export const getConversations = async (req, res) => {
+    try {
+        const { cursor, limit } = req.query;
+        const myId = req.user._id;
+
+        const decodedCursor = decodeCursor(cursor);
+        if (cursor && !decodedCursor) {
+            return res.status(400).json({ error: "Invalid cursor" });
+        }
+
+        const limitNum = parseLimit(limit, 20, 50);
+
+        const conversations = await Conversation.find(
+            applyCursor({ participants: myId }, "lastMessageAt", decodedCursor)
+        )
+            .sort({ lastMessageAt: -1, _id: -1 })
+            .limit(limitNum + 1)
+            .populate("participants", "email profile_data.name profile_data.profilePicture.url")
+            .lean();
+
+        const { items, hasMore, nextCursor } = buildPage(conversations, limitNum, "lastMessageAt");
+
+        const summaries = items.map(conversation => {
+            const partner = conversation.participants.find(
+                participant => participant && !participant._id.equals(myId)
+            );
+
+            return {
+                _id: conversation._id,
+                partner: partner ? {
+                    _id: partner._id,
+                    email: partner.email,
+                    name: partner.profile_data?.name || partner.email,
+                    avatar: partner.profile_data?.profilePicture?.url || undefined,
+                } : null,
+                lastMessage: conversation.lastMessage,
+                lastMessageAt: conversation.lastMessageAt,
+                unread: conversation.unreadCounts?.[myId.toString()] || 0,
+            };
+        });
+
+        res.status(200).json({ conversations: summaries, nextCursor, hasMore });
+    } catch (error) {
+        console.error("Error in getConversations:", error.message);
+        res.status(500).json({ error: "Internal Server Error" });
+    }
+};
+
+const updateConversationSummary = (message) => {
+    const receiverKey = message.receiverID.toString();
+
+    return Conversation.updateOne(
+        { pairKey: Conversation.pairKeyFor(message.senderID, message.receiverID) },
+        {
+            $set: {
+                participants: [message.senderID, message.receiverID],
+                lastMessage: {
+                    messageId: message._id,
+                    senderID: message.senderID,
+                    text: message.text,
+                    hasImage: Boolean(message.image || message.imageStatus),
+                },
+                lastMessageAt: message.createdAt,
+            },
+            $inc: { [`unreadCounts.${receiverKey}`]: 1 },
+        },
+        { upsert: true }
+    );
+};
+
+const imageQueue = new JobQueue("message-images", { concurrency: 2, retries: 2 });
+
+const DATA_URI_PATTERN = /^data:(image\/[\w.+-]+);base64,(.+)$/;
+
+const removeSpooledImage = async (source) => {
+    if (source.path) {
+        await fs.promises.rm(source.path, { force: true });
+    }
+};
+
+const emitMessageUpdate = (message) => {
+    emitToUser(message.senderID.toString(), "messageUpdated", message);
+    emitToUser(message.receiverID.toString(), "messageUpdated", message);
+};
+
+const processMessageImage = async (messageId, source) => {
+    const storage = getStorageAdapter();
+    const stream = source.path ? fs.createReadStream(source.path) : Readable.from(source.buffer);
+
+    const result = await storage.upload(stream, {
+        filename: source.filename,
+        mimetype: source.mimetype,
+        folder: "chat-images",
+        uniqueName: true
+    });
+
+    const message = await Message.findByIdAndUpdate(
+        messageId,
+        {
+            image: result.url,
+            imageThumbnail: storage.thumbnailUrl ? storage.thumbnailUrl(result.id) : result.url,
+            imageStatus: "ready"
+        },
+        { new: true }
+    ).lean();
+
+    await removeSpooledImage(source);
+    if (message) {
+        emitMessageUpdate(message);
+    }
+};
+
+const failMessageImage = async (messageId, source) => {
+    await removeSpooledImage(source);
+    const message = await Message.findByIdAndUpdate(messageId, { imageStatus: "failed" }, { new: true }).lean();
+    if (message) {
+        emitMessageUpdate(message);
+    }
+};
+
+// Accepts a multipart file (spooled by the route) or, for older clients, a base64 data URI.
+const getImageSource = (req) => {
+    if (req.file) {
+        return { path: req.file.path, filename: req.file.originalname, mimetype: req.file.mimetype };
+    }
+
+    const match = typeof req.body.image === "string" && req.body.image.match(DATA_URI_PATTERN);
+    if (match) {
+        return { buffer: Buffer.from(match[2], "base64"), filename: "image", mimetype: match[1] };
+    }
+    return null;
+};
+
 export const sendMessage = async (req, res) => {
+    let savedMessageId = null;
     try {
-        const { text, image } = req.body;
+        const { text } = req.body;
         const {id: receiverId} = req.params; 
         const senderId = req.user._id;
-        let imageUrl;
-        if (image) {
-            const uploadResponse = await cloudinary.uploader.upload(image);
-            imageUrl = uploadResponse.secure_url;
+        const imageSource = getImageSource(req);
+
+        if (!text && !imageSource) {
+            return res.status(400).json({ error: "Message text or image is required" });
         }
+
         const newMessage = new Message({ 
             senderID: senderId, 
             receiverID: receiverId, 
             text, 
-            image: imageUrl 
+            imageStatus: imageSource ? "pending" : undefined
         });
         await newMessage.save();
+        savedMessageId = newMessage._id;
+        await updateConversationSummary(newMessage);
         
-        const sender = await User.findById(senderId);
-        const senderName = sender?.profile_data?.name || sender.email;
+        const senderName = req.user.profile_data?.name || req.user.email;
         
         await createMessageNotification(newMessage, senderName);
         
-        const receiverSocketId = getReceiverSocketId(receiverId);
-        if (receiverSocketId) {
-            io.to(receiverSocketId).emit("newMessage", newMessage);
-        }
+        emitToUser(receiverId, "newMessage", newMessage);
         res.status(201).json(newMessage); 
+
+        // queued only once both sides have the message, so its messageUpdated has a target
+        if (imageSource) {
+            imageQueue.add(() => processMessageImage(newMessage._id, imageSource), {
+                onFailure: () => failMessageImage(newMessage._id, imageSource)
+            });
+        }
     } catch (error) {
         console.error("Error in sendMessage:", error.message);
+        const imageSource = getImageSource(req);
+        if (savedMessageId && imageSource) {
+            // the image job was never queued; don't leave the message pending forever
+            await failMessageImage(savedMessageId, imageSource)
+                .catch(failError => console.error("Error failing message image:", failError.message));
+        } else if (req.file) {
+            await removeSpooledImage(req.file);
+        }
         res.status(500).json({ error: "Internal Server Error" });
     }
-};
\ No newline at end of file
+};
@@ -1,24 +1,42 @@
+import mongoose from "mongoose";
 import Notification from "../models/notification.model.js";
 import User from "../models/user.models.js";
-import { getReceiverSocketId, io } from "../lib/socket.js";
+import { emitToUser, emitToDepartment } from "../lib/socket.js";
+import { JobQueue } from "../lib/jobQueue.js";
+import { parseLimit, decodeCursor, applyCursor, buildPage } from "../lib/pagination.js";
+
+const NOTIFICATION_SENDER_FIELDS = 'email profile_data.name profile_data.department';
 
 export const getNotifications = async (req, res) => {
     try {
         const userId = req.user._id;
-        
-        const notifications = await Notification.find({ recipient: userId })
-            .sort({ createdAt: -1 })
-            .populate('sender', 'email profile_data.name profile_data.department')
-            .lean();
-        
-        const unreadCount = await Notification.countDocuments({ 
-            recipient: userId,
-            isRead: false 
-        });
+        const limit = parseLimit(req.query.limit, 20, 50);
+        const cursor = decodeCursor(req.query.cursor);
+
+        if (req.query.cursor && !cursor) {
+            return res.status(400).json({ message: "Invalid cursor" });
+        }
+
+        const filter = { recipient: userId };
+        if (req.query.unread === 'true') {
+            filter.isRead = false;
+        }
+
+        const [docs, unreadCount] = await Promise.all([
+            Notification.find(applyCursor(filter, 'createdAt', cursor))
+                .sort({ createdAt: -1, _id: -1 })
+                .limit(limit + 1)
+                .populate('sender', NOTIFICATION_SENDER_FIELDS)
+                .lean(),
+            getUnreadCount(userId)
+        ]);
+        const { items, hasMore, nextCursor } = buildPage(docs, limit, 'createdAt');
         
         res.status(200).json({ 
-            notifications, 
-            unreadCount
+            notifications: items, 
+            unreadCount,
+            nextCursor,
+            hasMore
         });
     } catch (error) {
         console.error("Get Notifications Error:", error.message);
@@ -26,12 +44,44 @@ export const getNotifications = async (req, res) => {
     }
 };
 
+const getUnreadCount = async (userId) => {
+    const user = await User.findById(userId).select('unread_notifications').lean();
+    return Math.max(0, user?.unread_notifications || 0);
+};
+
+const adjustUnreadCount = (userIds, delta) => {
+    if (delta === 0) return Promise.resolve();
+    const filter = Array.isArray(userIds) ? { _id: { $in: userIds } } : { _id: userIds };
+    // pipeline update so a stale counter never goes below zero
+    return User.updateMany(filter, [
+        { $set: { unread_notifications: { $max: [0, { $add: [{ $ifNull: ['$unread_notifications', 0] }, delta] }] } } }
+    ]);
+};
+
+export const getUnreadNotificationCount = async (req, res) => {
+    try {
+        res.status(200).json({ unreadCount: await getUnreadCount(req.user._id) });
+    } catch (error) {
+        console.error("Get Unread Notification Count Error:", error.message);
+        res.status(500).json({ message: "Internal Server Error" });
+    }
+};
+
 export const markNotificationAsRead = async (req, res) => {
     try {
         const { notificationId } = req.params;
         const userId = req.user._id;
         
-        const notification = await Notification.findById(notificationId);
+        if (!mongoose.Types.ObjectId.isValid(notificationId)) {
+            return res.status(400).json({ message: "Invalid notification ID format" });
+        }
+
+        const notification = await Notification.findOne({
+            $or: [
+                { _id: notificationId },
+                { recipient: userId, type: 'post', referenceId: notificationId }
+            ]
+        }).lean();
         
         if (!notification) {
             return res.status(404).json({ message: "Notification not found" });
@@ -41,15 +91,19 @@ export const markNotificationAsRead = async (req, res) => {
             return res.status(403).json({ message: "Not authorized to access this notification" });
         }
         
-        notification.isRead = true;
-        await notification.save();
-        
-        const socketId = getReceiverSocketId(userId.toString());
-        if (socketId) {
-            io.to(socketId).emit('notificationReadUpdate', notificationId);
+        // only the request that actually flips isRead decrements the counter
+        const updated = await Notification.findOneAndUpdate(
+            { _id: notification._id, isRead: false },
+            { $set: { isRead: true, readAt: new Date() } },
+            { new: true, lean: true }
+        );
+        if (updated) {
+            await adjustUnreadCount(userId, -1);
         }
         
-        res.status(200).json({ message: "Notification marked as read", notification });
+        emitToUser(userId.toString(), 'notificationReadUpdate', notificationId);
+        
+        res.status(200).json({ message: "Notification marked as read", notification: updated || { ...notification, isRead: true } });
     } catch (error) {
         console.error("Mark Notification As Read Error:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
@@ -60,15 +114,13 @@ export const markAllNotificationsAsRead = async (req, res) => {
     try {
         const userId = req.user._id;
         
-        await Notification.updateMany(
+        const result = await Notification.updateMany(
             { recipient: userId, isRead: false },
-            { isRead: true }
+            { $set: { isRead: true, readAt: new Date() } }
         );
+        await adjustUnreadCount(userId, -result.modifiedCount);
         
-        const socketId = getReceiverSocketId(userId.toString());
-        if (socketId) {
-            io.to(socketId).emit('allNotificationsReadUpdate');
-        }
+        emitToUser(userId.toString(), 'allNotificationsReadUpdate');
         
         res.status(200).json({ message: "All notifications marked as read" });
     } catch (error) {
@@ -77,40 +129,81 @@ export const markAllNotificationsAsRead = async (req, res) => {
     }
 };
 
-export const createPostNotification = async (post, senderId) => {
+const FANOUT_BATCH_SIZE = 1000;
+
+const notificationQueue = new JobQueue("notification-fanout", { concurrency: 2 });
+
+const insertPostNotifications = async (batch) => {
+    let inserted = batch;
     try {
-        const department = post.department;
-        
-        const usersToNotify = await User.find({
-            'profile_data.department': department,
-            _id: { $ne: senderId }
-        });
-        
-        const notificationPromises = usersToNotify.map(user => {
-            const newNotification = new Notification({
-                recipient: user._id,
-                sender: senderId,
-                type: 'post',
-                content: `New post in ${department}: ${post.title}`,
-                referenceId: post._id,
-                onModel: 'Post'
-            });
-            
-            const socketId = getReceiverSocketId(user._id.toString());
-            if (socketId) {
-                io.to(socketId).emit('newNotification', {
-                    ...newNotification.toObject(),
-                    sender: { _id: senderId }
-                });
-            }
-            
-            return newNotification.save();
-        });
-        
-        await Promise.all(notificationPromises);
+        await Notification.insertMany(batch, { ordered: false, lean: true });
     } catch (error) {
-        console.error("Create Post Notification Error:", error);
+        if (!error.writeErrors) throw error;
+        // unordered inserts keep going past failures; only what was inserted counts
+        inserted = error.insertedDocs || [];
+        console.error(`Post notification fan-out: ${batch.length - inserted.length} inserts failed:`, error.message);
     }
+    if (inserted.length === 0) return;
+    await User.updateMany(
+        { _id: { $in: inserted.map(notification => notification.recipient) } },
+        { $inc: { unread_notifications: 1 } }
+    );
+};
+
+const fanOutPostNotification = async (post, senderId) => {
+    const department = post.department;
+    const content = `New post in ${department}: ${post.title}`;
+    const createdAt = new Date();
+
+    const recipients = User.find({
+        'profile_data.department': department,
+        _id: { $ne: senderId }
+    })
+        .select('_id')
+        .lean()
+        .cursor({ batchSize: FANOUT_BATCH_SIZE });
+
+    let batch = [];
+    for await (const user of recipients) {
+        batch.push({
+            recipient: user._id,
+            sender: senderId,
+            type: 'post',
+            content,
+            referenceId: post._id,
+            onModel: 'Post',
+            // lean inserts skip schema defaults and timestamps, so set them here
+            isRead: false,
+            createdAt,
+            updatedAt: createdAt
+        });
+
+        if (batch.length >= FANOUT_BATCH_SIZE) {
+            await insertPostNotifications(batch);
+            batch = [];
+        }
+    }
+
+    if (batch.length > 0) {
+        await insertPostNotifications(batch);
+    }
+
+    // One emit to the department room instead of one per recipient. The post id stands in
+    // for the per-recipient notification id; markNotificationAsRead resolves either.
+    emitToDepartment(department, 'newNotification', {
+        _id: post._id,
+        sender: { _id: senderId },
+        type: 'post',
+        content,
+        referenceId: post._id,
+        onModel: 'Post',
+        isRead: false,
+        createdAt
+    }, senderId.toString());
+};
+
+export const createPostNotification = (post, senderId) => {
+    notificationQueue.add(() => fanOutPostNotification(post, senderId));
 };
 
 export const createMessageNotification = async (message, senderName) => {
@@ -125,14 +218,12 @@ export const createMessageNotification = async (message, senderName) => {
         });
         
         await newNotification.save();
+        await User.updateOne({ _id: message.receiverID }, { $inc: { unread_notifications: 1 } });
         
-        const socketId = getReceiverSocketId(message.receiverID.toString());
-        if (socketId) {
-            io.to(socketId).emit('newNotification', {
-                ...newNotification.toObject(),
-                sender: { _id: message.senderID }
-            });
-        }
+        emitToUser(message.receiverID.toString(), 'newNotification', {
+            ...newNotification.toObject(),
+            sender: { _id: message.senderID }
+        });
         
         return newNotification;
     } catch (error) {
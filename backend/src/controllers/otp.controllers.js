@@ -1,7 +1,8 @@
-import bcrypt from "bcryptjs";
+import { hashPassword, comparePassword, isHashPoolFull, sendHashPoolBusy } from "../lib/passwordHash.js";
 import User from "../models/user.models.js";
 import UserOTPVerification from "../models/userOTPVerification.models.js";
-import transporter from "../lib/email.js";
+import { queueEmail } from "../lib/email.js";
+import { invalidateCachedUser } from "../lib/userCache.js";
 
 export const sendPasswordResetOTP = async (req, res) => {
   try {
@@ -16,7 +17,7 @@ export const sendPasswordResetOTP = async (req, res) => {
     }
     const otp = `${Math.floor(1000 + Math.random() * 9000)}`;
     
-    const hashedOtp = await bcrypt.hash(otp, 10);
+    const hashedOtp = await hashPassword(otp, 10);
 
     await UserOTPVerification.deleteMany({ email });
     
@@ -29,27 +30,28 @@ export const sendPasswordResetOTP = async (req, res) => {
 
     await newOTP.save();
 
-    try {
-      await transporter.sendMail({
-        from: process.env.AUTH_EMAIL,
-        to: email,
-        subject: "Reset your password",
-        html: `<p>Enter <b>${otp}</b> to reset your password. It expires in <b>1 hour</b>.</p>`,
-      });
-      
-      res.json({ 
-        status: "PENDING", 
-        message: "OTP sent to email", 
-        data: { userId: user._id, email } 
-      });
-      
-    } catch (emailError) {
-      console.error("Error sending email:", emailError);
-      await UserOTPVerification.deleteOne({ _id: newOTP._id });
-      throw new Error(`Failed to send email: ${emailError.message}`);
-    }
+    queueEmail({
+      from: process.env.AUTH_EMAIL,
+      to: email,
+      subject: "Reset your password",
+      html: `<p>Enter <b>${otp}</b> to reset your password. It expires in <b>1 hour</b>.</p>`,
+    }, {
+      onFailure: async (emailError) => {
+        console.error("Error sending email:", emailError);
+        await UserOTPVerification.deleteOne({ _id: newOTP._id });
+      }
+    });
+
+    res.json({ 
+      status: "PENDING", 
+      message: "OTP sent to email", 
+      data: { userId: user._id, email } 
+    });
     
   } catch (error) {
+    if (isHashPoolFull(error)) {
+      return sendHashPoolBusy(res, { status: "FAILED", message: "Server busy, please try again" });
+    }
     console.error("Password reset OTP error:", error);
     res.status(500).json({ status: "FAILED", message: error.message });
   }
@@ -74,12 +76,12 @@ export const verifyPasswordResetOTP = async (req, res) => {
       return res.status(400).json({ message: "OTP has expired. Please request a new one." });
     }
 
-    const isMatch = await bcrypt.compare(otp, otpRecord.otp);
+    const isMatch = await comparePassword(otp, otpRecord.otp);
     if (!isMatch) {
       return res.status(400).json({ message: "Incorrect OTP. Please try again." });
     }
 
-    const hashedPassword = await bcrypt.hash(newPassword, 10);
+    const hashedPassword = await hashPassword(newPassword, 10);
     const updatedUser = await User.findOneAndUpdate(
       { email }, 
       { password: hashedPassword },
@@ -89,11 +91,15 @@ export const verifyPasswordResetOTP = async (req, res) => {
     if (!updatedUser) {
       return res.status(404).json({ message: "User not found" });
     }
+    invalidateCachedUser(updatedUser._id);
     
     await UserOTPVerification.deleteMany({ email });
 
     res.json({ message: "Password has been reset successfully" });
   } catch (err) {
+    if (isHashPoolFull(err)) {
+      return sendHashPoolBusy(res);
+    }
     console.error("Password reset verification error:", err);
     res.status(500).json({ message: err.message });
   }
@@ -1,10 +1,89 @@
+import mongoose from "mongoose";
 import Post from "../models/post.model.js";
+import PostLike from "../models/postLike.model.js";
 import User from "../models/user.models.js";
 import { createPostNotification } from "./notification.controllers.js";
+import { LRUCache } from "../lib/cache.js";
+import { clusterInvalidation } from "../lib/invalidation.js";
+import { parseLimit, decodeCursor, applyCursor, buildPage } from "../lib/pagination.js";
+
+const postCountCache = new LRUCache({ max: 200, ttl: 30 * 1000 });
+
+const countPosts = async (query) => {
+    const key = JSON.stringify(query);
+    const cached = postCountCache.get(key);
+    if (cached !== undefined) {
+        return cached;
+    }
+
+    const total = await Post.countDocuments(query);
+    postCountCache.set(key, total);
+    return total;
+};
+
+export const invalidatePostCounts = clusterInvalidation("post-counts", () => {
+    postCountCache.clear();
+});
+
+const findFeedPosts = (query, { skip = 0, limit }) => {
+    const pipeline = [
+        { $match: query },
+        { $sort: { created_at: -1, _id: -1 } },
+    ];
+
+    if (skip) {
+        pipeline.push({ $skip: skip });
+    }
+
+    // legacy embedded likes arrays stay on the server until npm run migrate moves them
+    pipeline.push({ $limit: limit }, { $project: { likes: 0 } });
+
+    return Post.aggregate(pipeline);
+};
+
+// Feed pages are shared by every user; like state is per user and is merged in afterwards,
+// so a like never has to evict anyone's cached feed. number_of_likes may lag by the TTL.
+const feedCache = new LRUCache({ max: 500, ttl: 15 * 1000 });
+let feedVersion = 0;
+
+const findCachedFeedPosts = async (query, options) => {
+    const version = feedVersion;
+    const key = JSON.stringify([version, query, options]);
+    const cached = feedCache.get(key);
+    if (cached !== undefined) {
+        return cached;
+    }
+
+    const posts = await findFeedPosts(query, options);
+    // a post created or deleted while this page was loading must not be cached over
+    if (version === feedVersion) {
+        feedCache.set(key, posts);
+    }
+    return posts;
+};
+
+export const invalidateFeedCache = clusterInvalidation("feed", () => {
+    feedVersion += 1;
+    feedCache.clear();
+});
+
+// one lookup on PostLike's unique (postId, userId) index for the whole page
+const withLikeState = async (posts, userId) => {
+    if (!userId) {
+        return posts.map(post => ({ ...post, isLikedByCurrentUser: null }));
+    }
+
+    const liked = await PostLike.find({ postId: { $in: posts.map(post => post._id) }, userId })
+        .select("postId -_id")
+        .lean();
+    const likedIds = new Set(liked.map(like => like.postId.toString()));
+
+    return posts.map(post => ({ ...post, isLikedByCurrentUser: likedIds.has(post._id.toString()) }));
+};
 
 export const getAllPosts = async (req, res) => {
     try {
-        const { department, category, page = 1, limit = 10 } = req.query;
+        const { department, category, page = 1, limit = 10, cursor, includeTotal } = req.query;
         const userId = req.user?._id;
 
 
@@ -17,28 +96,49 @@ export const getAllPosts = async (req, res) => {
             query.category = category;
         }
 
-        const pageNum = parseInt(page, 10);
-        const limitNum = parseInt(limit, 10);
-        const skip = (pageNum - 1) * limitNum;
+        const limitNum = parseLimit(limit, 10, 50);
+
+        // cursor mode: keyset pagination on (created_at, _id), constant cost at any depth
+        if (cursor !== undefined) {
+            const decodedCursor = decodeCursor(cursor);
+            if (cursor && !decodedCursor) {
+                return res.status(400).json({ message: "Invalid cursor" });
+            }
 
-        const posts = await Post.find(query)
-            .sort({ created_at: -1 }) 
-            .skip(skip)
-            .limit(limitNum)
-            .lean(); 
+            const posts = await findCachedFeedPosts(applyCursor(query, "created_at", decodedCursor), {
+                limit: limitNum + 1,
+            });
 
-        const postsWithLikeStatus = posts.map(post => ({
-            ...post,
-            isLikedByCurrentUser: userId ? post.likes.some(likeId => likeId.equals(userId)) : null,
+            const { items, hasMore, nextCursor } = buildPage(posts, limitNum, "created_at");
 
-        }));
+            const response = {
+                posts: await withLikeState(items, userId),
+                nextCursor,
+                hasMore,
+            };
 
-        const totalPosts = await Post.countDocuments(query);
+            if (includeTotal === "true") {
+                response.totalPosts = await countPosts(query);
+            }
+
+            return res.status(200).json(response);
+        }
+
+        const pageNum = Math.max(parseInt(page, 10) || 1, 1);
+        const skip = (pageNum - 1) * limitNum;
+
+        const posts = await findCachedFeedPosts(query, { skip, limit: limitNum + 1 });
+
+        const { items, hasMore, nextCursor } = buildPage(posts, limitNum, "created_at");
+
+        const totalPosts = await countPosts(query);
 
         res.status(200).json({
-            posts: postsWithLikeStatus,
+            posts: await withLikeState(items, userId),
             totalPages: Math.ceil(totalPosts / limitNum),
             currentPage: pageNum,
+            nextCursor,
+            hasMore,
         });
     } catch (error) {
         console.error("Fetch Posts Error:", error.message);
@@ -78,8 +178,10 @@ export const createPost = async (req, res) => {
         });
 
         await newPost.save();
+        invalidatePostCounts();
+        invalidateFeedCache();
         
-        await createPostNotification(newPost, creator_id);
+        createPostNotification(newPost, creator_id);
         
         res.status(201).json({ post: newPost });
     }
@@ -94,27 +196,49 @@ export const updatePostLikes = async (req, res) => {
     const { increment } = req.body;
     const userId = req.user._id; 
 
+    if (!mongoose.Types.ObjectId.isValid(postId)) {
+        return res.status(400).json({ message: "Invalid post ID format" });
+    }
+
     try {
-        const post = await Post.findById(postId);
-        if (!post) {
-            return res.status(404).json({ message: "Post not found" });
+        // The unique (postId, userId) index decides whether the like state actually
+        // changed; only then is number_of_likes moved, so repeated clicks are no-ops.
+        let changed;
+        if (increment) {
+            try {
+                await PostLike.create({ postId, userId });
+                changed = true;
+            } catch (error) {
+                if (error.code !== 11000) throw error;
+                changed = false;
+            }
+        } else {
+            const { deletedCount } = await PostLike.deleteOne({ postId, userId });
+            changed = deletedCount > 0;
         }
 
-        const userIndex = post.likes.indexOf(userId);
+        const post = changed
+            ? await Post.findOneAndUpdate(
+                { _id: postId },
+                { $inc: { number_of_likes: increment ? 1 : -1 } },
+                { new: true, projection: { number_of_likes: 1 } }
+            ).lean()
+            : await Post.findById(postId).select("number_of_likes").lean();
 
-        if (increment && userIndex === -1) {
-            post.likes.push(userId);
-            post.number_of_likes += 1;
-        } else if (!increment && userIndex !== -1) {
-            post.likes.splice(userIndex, 1);
-            post.number_of_likes -= 1;
-        } else {
-            return res.status(200).json({ post });
+        if (!post) {
+            if (changed && increment) {
+                await PostLike.deleteOne({ postId, userId });
+            }
+            return res.status(404).json({ message: "Post not found" });
         }
 
-        await post.save();
-
-        res.status(200).json({ post });
+        res.status(200).json({
+            post: {
+                _id: post._id,
+                number_of_likes: post.number_of_likes,
+                isLikedByCurrentUser: Boolean(increment),
+            },
+        });
     } catch (error) {
         console.error("Update Post Likes Error:", error.message);
         res.status(500).json({ message: "Internal Server Error" });
@@ -1,5 +1,7 @@
 import User from "../models/user.models.js";
 import cloudinary from "../lib/cloudinary.js";
+import { invalidateCachedUser } from "../lib/userCache.js";
+import { invalidateResponseCache } from "../lib/responseCache.js";
 
 export const uploadProfilePicture = async (req, res) => {
     try {
@@ -37,6 +39,8 @@ export const uploadProfilePicture = async (req, res) => {
         };
 
         await user.save();
+        invalidateCachedUser(user._id);
+        invalidateResponseCache("profile-pictures");
 
         return res.status(200).json({
             message: "Profile picture updated successfully",
@@ -69,6 +73,8 @@ export const removeProfilePicture = async (req, res) => {
         }
 
         await user.save();
+        invalidateCachedUser(user._id);
+        invalidateResponseCache("profile-pictures");
 
         return res.status(200).json({
             message: "Profile picture removed successfully"
@@ -83,7 +89,7 @@ export const getProfilePicture = async (req, res) => {
     try {
         const { userId } = req.params;
 
-        const user = await User.findById(userId);
+        const user = await User.findById(userId).select("profile_data.profilePicture").lean();
         if (!user) {
             return res.status(404).json({ message: "User not found" });
         }
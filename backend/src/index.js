@@ -1,6 +1,7 @@
-import dotenv from "dotenv";
-dotenv.config();
+// first import, so .env is loaded before any module reads process.env at import time
+import "dotenv/config";
 
+import { metricsMiddleware, metricsHandler } from "./lib/metrics.js";
 import express from "express";
 import authRoutes from "./routes/auth.routes.js";
 import messageRoutes from "./routes/message.routes.js";
@@ -19,8 +20,11 @@ import profileRoutes from "./routes/profile.routes.js";
 import { configureCloudinary } from "./lib/cloudinary.js";
 import otpRoutes from "./routes/otp.routes.js";
 import resetPasswordRoutes from "./routes/resetPassword.routes.js";
-
-dotenv.config();
+import { flushDownloadCounts } from "./controllers/academicResource.controller.js";
+import { installShutdownHandlers, registerShutdownHook } from "./lib/shutdown.js";
+import { getStorageAdapter } from "./lib/storage/index.js";
+import { drainEmailQueue } from "./lib/email.js";
+import { compressJson } from "./lib/responseCache.js";
 
 configureCloudinary();
 
@@ -32,10 +36,20 @@ app.use(cors({
     allowedHeaders: ["Content-Type", "Authorization"]
   }));
 
+app.use(metricsMiddleware);
+app.get("/metrics", metricsHandler);
+
+app.use(compressJson);
+
 app.use(express.json({ limit: '1mb' }));
 app.use(express.urlencoded({ extended: true, limit: '1mb' }));
 app.use(cookieParser());
 
+const storageAdapter = getStorageAdapter();
+if (storageAdapter.directory) {
+    app.use(storageAdapter.publicPath, express.static(storageAdapter.directory));
+}
+
 app.use("/api/auth", authRoutes);
 app.use("/api/message", messageRoutes);
 
@@ -50,7 +64,11 @@ app.use("/api/profile", profileRoutes);
 app.use("/api/otp", otpRoutes);
 app.use("/api/auth/reset", resetPasswordRoutes);
 
+registerShutdownHook("download counts", flushDownloadCounts);
+registerShutdownHook("email queue", drainEmailQueue);
+installShutdownHandlers(server);
+
 server.listen(PORT, ()=>{
     console.log("server is running on port: "+ PORT);
-    connectDB()
+    connectDB();
 });
\ No newline at end of file
@@ -0,0 +1,69 @@
+export class LRUCache {
+    constructor({ max = 1000, ttl = 0 } = {}) {
+        this.max = max;
+        this.ttl = ttl;
+        this.entries = new Map();
+        this.hits = 0;
+        this.misses = 0;
+    }
+
+    get(key) {
+        const entry = this.entries.get(key);
+        if (!entry) {
+            this.misses += 1;
+            return undefined;
+        }
+
+        if (entry.expiresAt && entry.expiresAt <= Date.now()) {
+            this.entries.delete(key);
+            this.misses += 1;
+            return undefined;
+        }
+
+        this.hits += 1;
+
+        // re-insert so the Map's insertion order doubles as recency order
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    set(key, value, ttl = this.ttl) {
+        if (this.entries.has(key)) {
+            this.entries.delete(key);
+        }
+
+        this.entries.set(key, {
+            value,
+            expiresAt: ttl ? Date.now() + ttl : 0,
+        });
+
+        while (this.entries.size > this.max) {
+            const oldestKey = this.entries.keys().next().value;
+            this.entries.delete(oldestKey);
+        }
+    }
+
+    delete(key) {
+        return this.entries.delete(key);
+    }
+
+    clear() {
+        this.entries.clear();
+    }
+
+    stats() {
+        const lookups = this.hits + this.misses;
+        return {
+            size: this.entries.size,
+            max: this.max,
+            hits: this.hits,
+            misses: this.misses,
+            hitRate: lookups ? this.hits / lookups : 0,
+        };
+    }
+
+    get size() {
+        return this.entries.size;
+    }
+}
@@ -0,0 +1,60 @@
+import cluster from "cluster";
+import { ADAPTER_CHANNEL, relayAdapterMessage } from "./ipcAdapter.js";
+import { PRESENCE_CHANNEL, PresenceRegistry } from "./presence.js";
+import { INVALIDATION_CHANNEL } from "./invalidation.js";
+
+// Workers listen on the port themselves and the primary hands out connections round
+// robin, so every core serves traffic even when it all comes from one address (a NAT, a
+// proxy, a local benchmark). That rules out sticky sessions, so in cluster mode socket.io
+// only accepts the websocket transport (see lib/socket.js): a websocket is a single
+// connection and never needs its requests routed to the same worker.
+cluster.schedulingPolicy = cluster.SCHED_RR;
+
+export const startPrimary = ({ port, workers: workerCount }) => {
+    // "advanced" serialization keeps Buffers intact in relayed socket.io packets
+    cluster.setupPrimary({ serialization: "advanced" });
+
+    const workers = new Array(workerCount);
+    const presence = new PresenceRegistry(message => {
+        workers.forEach(worker => worker?.isConnected() && worker.send(message));
+    });
+    let shuttingDown = false;
+
+    const fork = (index) => {
+        const worker = cluster.fork({ CLUSTER_WORKER_INDEX: String(index) });
+        workers[index] = worker;
+
+        worker.on("message", (message) => {
+            if (message?.channel === ADAPTER_CHANNEL || message?.channel === INVALIDATION_CHANNEL) {
+                relayAdapterMessage(workers, worker, message);
+            } else if (message?.channel === PRESENCE_CHANNEL) {
+                presence.handle(worker, message);
+            }
+        });
+
+        worker.on("exit", (code, signal) => {
+            presence.removeWorker(worker.id);
+            if (shuttingDown) return;
+            console.error(`Worker ${worker.process.pid} exited (${signal || code}), restarting`);
+            fork(index);
+        });
+    };
+
+    for (let i = 0; i < workerCount; i++) {
+        fork(i);
+    }
+
+    console.log(`cluster primary started on port: ${port} (${workerCount} workers)`);
+
+    const shutdown = () => {
+        if (shuttingDown) return;
+        shuttingDown = true;
+        workers.forEach(worker => worker?.process.kill("SIGTERM"));
+        cluster.on("exit", () => {
+            if (Object.keys(cluster.workers).length === 0) process.exit(0);
+        });
+    };
+
+    process.on("SIGINT", shutdown);
+    process.on("SIGTERM", shutdown);
+};
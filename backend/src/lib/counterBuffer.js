@@ -0,0 +1,85 @@
+// Coalesces $inc updates per document id and writes them as one unordered bulkWrite,
+// either on a timer or once maxKeys distinct ids are pending.
+export class CounterBuffer {
+    constructor(model, field, { flushInterval = 5000, maxKeys = 500, onFlush } = {}) {
+        this.model = model;
+        this.field = field;
+        this.flushInterval = flushInterval;
+        this.maxKeys = maxKeys;
+        this.onFlush = onFlush;
+        this.pending = new Map();
+        this.flushing = null;
+        this.timer = null;
+    }
+
+    start() {
+        if (!this.timer) {
+            this.timer = setInterval(() => this.flush(), this.flushInterval);
+            this.timer.unref();
+        }
+        return this;
+    }
+
+    stop() {
+        clearInterval(this.timer);
+        this.timer = null;
+    }
+
+    increment(id, by = 1) {
+        const key = id.toString();
+        this.pending.set(key, (this.pending.get(key) || 0) + by);
+
+        if (this.pending.size >= this.maxKeys) {
+            this.flush();
+        }
+    }
+
+    pendingFor(id) {
+        return this.pending.get(id.toString()) || 0;
+    }
+
+    // flushes until nothing is pending, including increments that arrived mid-flush
+    async drain() {
+        while (this.flushing || this.pending.size > 0) {
+            await this.flush();
+        }
+    }
+
+    async flush() {
+        if (this.flushing) {
+            return this.flushing;
+        }
+        if (this.pending.size === 0) {
+            return new Map();
+        }
+
+        const batch = this.pending;
+        this.pending = new Map();
+
+        this.flushing = (async () => {
+            try {
+                await this.model.bulkWrite(
+                    [...batch].map(([id, count]) => ({
+                        updateOne: {
+                            filter: { _id: id },
+                            update: { $inc: { [this.field]: count } }
+                        }
+                    })),
+                    { ordered: false }
+                );
+                if (this.onFlush) {
+                    this.onFlush(batch);
+                }
+                return batch;
+            } catch (error) {
+                console.error(`${this.model.modelName}.${this.field} flush failed, requeueing:`, error.message);
+                batch.forEach((count, id) => this.increment(id, count));
+                return new Map();
+            } finally {
+                this.flushing = null;
+            }
+        })();
+
+        return this.flushing;
+    }
+}
@@ -1,16 +1,24 @@
 import nodemailer from "nodemailer";
 import dotenv from "dotenv";
+import { JobQueue } from "./jobQueue.js";
 
 dotenv.config();
 
+const MAX_CONNECTIONS = Number(process.env.SMTP_MAX_CONNECTIONS) || 3;
+
+// Pooled transport: connections are kept open and reused instead of a new SMTP
+// handshake per message. SMTP_HOST/SMTP_PORT point it at a local stand-in in tests.
 const transporter = nodemailer.createTransport({
-  host: 'smtp.gmail.com',
-  port: 587,
-  secure: false,
-  auth: {
+  pool: true,
+  maxConnections: MAX_CONNECTIONS,
+  maxMessages: 100,
+  host: process.env.SMTP_HOST || 'smtp.gmail.com',
+  port: Number(process.env.SMTP_PORT) || 587,
+  secure: process.env.SMTP_SECURE === 'true',
+  auth: process.env.AUTH_EMAIL ? {
     user: process.env.AUTH_EMAIL,
     pass: process.env.AUTH_PASS,
-  },
+  } : undefined,
   tls: {
     rejectUnauthorized: false
   }
@@ -24,4 +32,47 @@ transporter.verify((error, success) => {
   }
 });
 
+const emailQueue = new JobQueue("email", {
+  concurrency: MAX_CONNECTIONS,
+  retries: Number(process.env.EMAIL_RETRIES ?? 4),
+  backoff: Number(process.env.EMAIL_RETRY_BACKOFF_MS) || 2000
+});
+
+const LATENCY_SAMPLES = 200;
+const sendLatencies = [];
+let sent = 0;
+
+const sendWithTiming = async (mailOptions) => {
+  const startedAt = process.hrtime.bigint();
+  await transporter.sendMail(mailOptions);
+  sendLatencies.push(Number(process.hrtime.bigint() - startedAt) / 1e6);
+  if (sendLatencies.length > LATENCY_SAMPLES) {
+    sendLatencies.shift();
+  }
+  sent += 1;
+};
+
+// Fire-and-forget: requests return once the mail is queued. onFailure runs after
+// the last retry has failed.
+export const queueEmail = (mailOptions, { onFailure } = {}) => {
+  emailQueue.add(() => sendWithTiming(mailOptions), {
+    onFailure: onFailure || ((error) => console.error(`Giving up on email to ${mailOptions.to}:`, error.message))
+  });
+};
+
+export const drainEmailQueue = () => emailQueue.drain();
+
+export const getEmailStats = () => {
+  const sorted = [...sendLatencies].sort((a, b) => a - b);
+  const at = (p) => sorted.length ? Math.round(sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))]) : 0;
+
+  return {
+    ...emailQueue.stats(),
+    sent,
+    avgSendMs: sorted.length ? Math.round(sorted.reduce((sum, ms) => sum + ms, 0) / sorted.length) : 0,
+    p50SendMs: at(0.5),
+    p95SendMs: at(0.95)
+  };
+};
+
 export default transporter;
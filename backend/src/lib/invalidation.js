@@ -0,0 +1,26 @@
+import cluster from "cluster";
+
+export const INVALIDATION_CHANNEL = "invalidation";
+
+const handlers = new Map();
+
+// Wraps a process-local cache invalidation so it runs in every process: here, and in a
+// cluster worker also on all the other workers, relayed by the primary (see lib/cluster.js).
+// Arguments cross IPC, so they must be plain values (ids as strings).
+export const clusterInvalidation = (name, invalidate) => {
+    handlers.set(name, invalidate);
+
+    return (...args) => {
+        invalidate(...args);
+        if (cluster.isWorker && process.connected) {
+            process.send({ channel: INVALIDATION_CHANNEL, name, args });
+        }
+    };
+};
+
+if (cluster.isWorker) {
+    process.on("message", (message) => {
+        if (message?.channel !== INVALIDATION_CHANNEL) return;
+        handlers.get(message.name)?.(...message.args);
+    });
+}
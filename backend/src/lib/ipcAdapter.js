@@ -0,0 +1,56 @@
+import { ClusterAdapterWithHeartbeat } from "socket.io-adapter";
+
+export const ADAPTER_CHANNEL = "socket.io-adapter";
+
+// socket.io adapter for node:cluster workers. Every broadcast is sent to the
+// primary over IPC, which relays it to the other workers (see lib/cluster.js).
+class IPCAdapter extends ClusterAdapterWithHeartbeat {
+    constructor(nsp, opts) {
+        super(nsp, opts);
+        this.onIpcMessage = this.onIpcMessage.bind(this);
+        process.on("message", this.onIpcMessage);
+    }
+
+    onIpcMessage(message) {
+        if (message?.channel !== ADAPTER_CHANNEL || message.nsp !== this.nsp.name) return;
+
+        if (message.kind === "message") {
+            this.onMessage(message.payload);
+        } else if (message.kind === "response" && message.requesterUid === this.uid) {
+            this.onResponse(message.payload);
+        }
+    }
+
+    doPublish(message) {
+        process.send({ channel: ADAPTER_CHANNEL, kind: "message", nsp: this.nsp.name, payload: message });
+        return Promise.resolve("");
+    }
+
+    doPublishResponse(requesterUid, response) {
+        process.send({ channel: ADAPTER_CHANNEL, kind: "response", nsp: this.nsp.name, requesterUid, payload: response });
+        return Promise.resolve();
+    }
+
+    close() {
+        super.close();
+        process.off("message", this.onIpcMessage);
+    }
+}
+
+export const createIPCAdapter = (opts = {}) => {
+    if (!process.send) {
+        throw new Error("The IPC adapter can only be used inside a cluster worker");
+    }
+    return function (nsp) {
+        return new IPCAdapter(nsp, opts);
+    };
+};
+
+// primary side: forward adapter traffic from one worker to all the others
+export const relayAdapterMessage = (workers, sender, message) => {
+    for (const worker of workers) {
+        if (worker !== sender && worker.isConnected()) {
+            worker.send(message);
+        }
+    }
+};
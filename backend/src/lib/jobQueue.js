@@ -0,0 +1,85 @@
+// Minimal in-process job queue: bounded concurrency, retries with exponential backoff.
+export class JobQueue {
+    constructor(name, { concurrency = 1, retries = 0, backoff = 1000 } = {}) {
+        this.name = name;
+        this.concurrency = concurrency;
+        this.retries = retries;
+        this.backoff = backoff;
+        this.pending = [];
+        this.active = 0;
+        this.delayed = 0;
+        this.completed = 0;
+        this.failed = 0;
+        this.idleResolvers = [];
+    }
+
+    add(task, { retries = this.retries, onFailure } = {}) {
+        this.pending.push({ task, attempt: 0, retries, onFailure });
+        this.next();
+    }
+
+    next() {
+        while (this.active < this.concurrency && this.pending.length > 0) {
+            this.run(this.pending.shift());
+        }
+
+        if (this.isIdle()) {
+            this.idleResolvers.splice(0).forEach(resolve => resolve());
+        }
+    }
+
+    async run(job) {
+        this.active += 1;
+        try {
+            await job.task();
+            this.completed += 1;
+        } catch (error) {
+            if (job.attempt < job.retries) {
+                job.attempt += 1;
+                const delay = this.backoff * 2 ** (job.attempt - 1);
+                console.error(`${this.name} job failed (attempt ${job.attempt}), retrying in ${delay}ms:`, error.message);
+                this.delayed += 1;
+                setTimeout(() => {
+                    this.delayed -= 1;
+                    this.pending.push(job);
+                    this.next();
+                }, delay);
+            } else {
+                this.failed += 1;
+                console.error(`${this.name} job failed:`, error);
+                if (job.onFailure) {
+                    try {
+                        await job.onFailure(error);
+                    } catch (hookError) {
+                        console.error(`${this.name} failure handler failed:`, hookError);
+                    }
+                }
+            }
+        } finally {
+            this.active -= 1;
+            this.next();
+        }
+    }
+
+    isIdle() {
+        return this.active === 0 && this.delayed === 0 && this.pending.length === 0;
+    }
+
+    drain() {
+        if (this.isIdle()) {
+            return Promise.resolve();
+        }
+        return new Promise(resolve => this.idleResolvers.push(resolve));
+    }
+
+    stats() {
+        return {
+            name: this.name,
+            pending: this.pending.length,
+            active: this.active,
+            delayed: this.delayed,
+            completed: this.completed,
+            failed: this.failed,
+        };
+    }
+}
@@ -0,0 +1,298 @@
+import { monitorEventLoopDelay } from "perf_hooks";
+import mongoose from "mongoose";
+
+// Small Prometheus registry (text exposition format 0.0.4): counters, gauges and
+// histograms keyed by label set. Collectors run at scrape time for values that are
+// cheaper to read than to track.
+const DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const metrics = new Map();
+const collectors = [];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, "\\\\").replace(/\n/g, "\\n").replace(/"/g, '\\"');
+
+const formatLabels = (labels) => {
+    const entries = Object.entries(labels);
+    if (entries.length === 0) return "";
+    return `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(",")}}`;
+};
+
+const labelKey = (labels) => JSON.stringify(Object.entries(labels).sort(([a], [b]) => (a < b ? -1 : 1)));
+
+class Metric {
+    constructor(type, name, help) {
+        this.type = type;
+        this.name = name;
+        this.help = help;
+        this.series = new Map();
+    }
+
+    entry(labels, create) {
+        const key = labelKey(labels);
+        let entry = this.series.get(key);
+        if (!entry) {
+            entry = { labels, ...create() };
+            this.series.set(key, entry);
+        }
+        return entry;
+    }
+
+    header() {
+        return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    }
+}
+
+class Counter extends Metric {
+    constructor(name, help) {
+        super("counter", name, help);
+    }
+
+    inc(labels = {}, by = 1) {
+        this.entry(labels, () => ({ value: 0 })).value += by;
+    }
+
+    render() {
+        return [...this.series.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${value}`);
+    }
+}
+
+class Gauge extends Metric {
+    constructor(name, help) {
+        super("gauge", name, help);
+    }
+
+    set(labels, value) {
+        this.entry(labels, () => ({ value: 0 })).value = value;
+    }
+
+    inc(labels = {}, by = 1) {
+        this.entry(labels, () => ({ value: 0 })).value += by;
+    }
+
+    dec(labels = {}, by = 1) {
+        this.inc(labels, -by);
+    }
+
+    render() {
+        return [...this.series.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${value}`);
+    }
+}
+
+class Histogram extends Metric {
+    constructor(name, help, buckets = DEFAULT_BUCKETS) {
+        super("histogram", name, help);
+        this.buckets = buckets;
+    }
+
+    observe(labels, value) {
+        const entry = this.entry(labels, () => ({ counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 }));
+        const index = this.buckets.findIndex(bound => value <= bound);
+        if (index !== -1) entry.counts[index] += 1;
+        entry.sum += value;
+        entry.count += 1;
+    }
+
+    render() {
+        const lines = [];
+        for (const { labels, counts, sum, count } of this.series.values()) {
+            let cumulative = 0;
+            this.buckets.forEach((bound, i) => {
+                cumulative += counts[i];
+                lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+            });
+            lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: "+Inf" })} ${count}`);
+            lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+            lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+        }
+        return lines;
+    }
+}
+
+const register = (metric) => {
+    if (metrics.has(metric.name)) {
+        return metrics.get(metric.name);
+    }
+    metrics.set(metric.name, metric);
+    return metric;
+};
+
+export const counter = (name, help) => register(new Counter(name, help));
+export const gauge = (name, help) => register(new Gauge(name, help));
+export const histogram = (name, help, buckets) => register(new Histogram(name, help, buckets));
+
+export const registerCollector = (collect) => {
+    collectors.push(collect);
+};
+
+export const renderMetrics = async () => {
+    for (const collect of collectors) {
+        try {
+            await collect();
+        } catch (error) {
+            console.error("Metrics collector error:", error.message);
+        }
+    }
+
+    const lines = [];
+    for (const metric of metrics.values()) {
+        lines.push(...metric.header(), ...metric.render());
+    }
+    return `${lines.join("\n")}\n`;
+};
+
+// HTTP
+
+const httpDuration = histogram("http_request_duration_seconds", "HTTP request latency by route");
+const httpRequests = counter("http_requests_total", "HTTP requests by route and status code");
+const httpInFlight = gauge("http_requests_in_flight", "HTTP requests currently being served");
+
+// route templates keep label cardinality bounded (/api/posts/:postId, not every id)
+const routeLabel = (req) => {
+    if (req.route) {
+        return `${req.baseUrl}${req.route.path === "/" && req.baseUrl ? "" : req.route.path}`;
+    }
+    return "unmatched";
+};
+
+export const metricsMiddleware = (req, res, next) => {
+    const startedAt = process.hrtime.bigint();
+    httpInFlight.inc();
+
+    let recorded = false;
+    const record = () => {
+        if (recorded) return;
+        recorded = true;
+        httpInFlight.dec();
+
+        const labels = { method: req.method, route: routeLabel(req) };
+        httpDuration.observe(labels, Number(process.hrtime.bigint() - startedAt) / 1e9);
+        httpRequests.inc({ ...labels, status: res.statusCode });
+    };
+
+    res.on("finish", record);
+    res.on("close", record);
+    next();
+};
+
+// MongoDB
+
+const SLOW_QUERY_MS = Number(process.env.SLOW_QUERY_MS) || 100;
+const queryDuration = histogram("mongodb_query_duration_seconds", "Mongoose operation latency by model and operation");
+const slowQueries = counter("mongodb_slow_queries_total", `Mongoose operations slower than ${SLOW_QUERY_MS}ms`);
+
+const QUERY_OPS = [
+    "countDocuments", "estimatedDocumentCount", "distinct", "find", "findOne",
+    "findOneAndDelete", "findOneAndReplace", "findOneAndUpdate",
+    "deleteMany", "deleteOne", "replaceOne", "updateMany", "updateOne"
+];
+
+// the filter with values replaced by their type, so logs show the query's shape only
+export const queryShape = (value) => {
+    if (Array.isArray(value)) {
+        return value.length > 0 ? [queryShape(value[0])] : [];
+    }
+    if (value && typeof value === "object" && value.constructor === Object) {
+        return Object.fromEntries(Object.entries(value).map(([key, inner]) => [key, queryShape(inner)]));
+    }
+    if (value === null || value === undefined) return String(value);
+    return value._bsontype || value.constructor?.name || typeof value;
+};
+
+const recordQuery = (modelName, op, startedAt, shape) => {
+    if (!startedAt) return;
+    const ms = Number(process.hrtime.bigint() - startedAt) / 1e6;
+    queryDuration.observe({ model: modelName, op }, ms / 1000);
+
+    if (ms >= SLOW_QUERY_MS) {
+        slowQueries.inc({ model: modelName, op });
+        console.warn(`Slow query ${modelName}.${op} ${ms.toFixed(1)}ms`, JSON.stringify(shape()));
+    }
+};
+
+// Global plugins only apply to models compiled afterwards, so index.js imports this
+// module before anything that imports a model.
+export const queryTimingPlugin = (schema) => {
+    schema.pre(QUERY_OPS, function () {
+        this._metricsStartedAt = process.hrtime.bigint();
+    });
+    schema.post(QUERY_OPS, function () {
+        recordQuery(this.model.modelName, this.op, this._metricsStartedAt, () => queryShape(this.getFilter()));
+    });
+
+    schema.pre("aggregate", function () {
+        this._metricsStartedAt = process.hrtime.bigint();
+    });
+    schema.post("aggregate", function () {
+        recordQuery(this._model.modelName, "aggregate", this._metricsStartedAt, () => this.pipeline().map(stage => queryShape(stage)));
+    });
+
+    // model-level hooks share `this` between concurrent calls and skip failures, so these
+    // two are timed by wrapping the statics instead
+    for (const op of ["insertMany", "bulkWrite"]) {
+        schema.statics[op] = async function (items, ...rest) {
+            const startedAt = process.hrtime.bigint();
+            try {
+                return await mongoose.Model[op].call(this, items, ...rest);
+            } finally {
+                recordQuery(this.modelName, op, startedAt, () => ({ count: Array.isArray(items) ? items.length : 1 }));
+            }
+        };
+    }
+
+    schema.pre("save", function () {
+        this.$locals.metricsStartedAt = process.hrtime.bigint();
+    });
+    schema.post("save", function () {
+        recordQuery(this.constructor.modelName, "save", this.$locals.metricsStartedAt, () => ({}));
+    });
+};
+
+mongoose.plugin(queryTimingPlugin);
+
+// Socket.io
+
+export const socketEmits = counter("socketio_emits_total", "socket.io events emitted by the server");
+export const socketEventsReceived = counter("socketio_events_received_total", "socket.io events received from clients");
+
+// Event loop
+
+const LOOP_RESOLUTION_MS = 20;
+const loopDelay = monitorEventLoopDelay({ resolution: LOOP_RESOLUTION_MS });
+loopDelay.enable();
+const loopLag = gauge("nodejs_eventloop_lag_seconds", "Event loop delay since the previous scrape");
+
+// the histogram measures timer intervals, so the sampling resolution is subtracted
+const lagSeconds = (nanos) => Math.max(0, nanos / 1e6 - LOOP_RESOLUTION_MS) / 1000;
+
+registerCollector(() => {
+    loopLag.set({ quantile: "0.5" }, lagSeconds(loopDelay.percentile(50)));
+    loopLag.set({ quantile: "0.99" }, lagSeconds(loopDelay.percentile(99)));
+    loopLag.set({ quantile: "max" }, lagSeconds(loopDelay.max));
+    loopDelay.reset();
+});
+
+const memory = gauge("nodejs_memory_bytes", "Process memory usage");
+registerCollector(() => {
+    const usage = process.memoryUsage();
+    memory.set({ type: "rss" }, usage.rss);
+    memory.set({ type: "heap_used" }, usage.heapUsed);
+});
+
+// Requires METRICS_TOKEN (Authorization: Bearer <token>); without one the endpoint is off.
+export const metricsHandler = async (req, res) => {
+    try {
+        const token = process.env.METRICS_TOKEN;
+        if (!token) {
+            return res.status(404).json({ message: "Not Found" });
+        }
+        if (req.get("authorization") !== `Bearer ${token}`) {
+            return res.status(401).json({ message: "Unauthorized" });
+        }
+
+        res.set("Content-Type", "text/plain; version=0.0.4; charset=utf-8");
+        res.send(await renderMetrics());
+    } catch (error) {
+        console.error("Metrics Error:", error.message);
+        res.status(500).json({ message: "Internal Server Error" });
+    }
+};
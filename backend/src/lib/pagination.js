@@ -0,0 +1,72 @@
+import mongoose from "mongoose";
+
+export const parseLimit = (limit, defaultLimit = 10, maxLimit = 50) => {
+    const limitNum = parseInt(limit, 10);
+    if (!limitNum || limitNum < 1) {
+        return defaultLimit;
+    }
+    return Math.min(limitNum, maxLimit);
+};
+
+// Cursors are "<sort value>_<ObjectId>" so they stay readable in URLs and logs.
+// Dates are encoded as epoch millis.
+export const encodeCursor = (value, id) => {
+    if (value === undefined || value === null || !id) {
+        return null;
+    }
+    const encoded = value instanceof Date ? value.getTime() : value;
+    return `${encoded}_${id.toString()}`;
+};
+
+export const decodeCursor = (cursor, type = "date") => {
+    if (!cursor || typeof cursor !== "string") {
+        return null;
+    }
+
+    const separator = cursor.lastIndexOf("_");
+    const raw = cursor.slice(0, separator);
+    const id = cursor.slice(separator + 1);
+    const number = Number(raw);
+
+    if (separator < 1 || Number.isNaN(number) || !mongoose.Types.ObjectId.isValid(id)) {
+        return null;
+    }
+
+    return {
+        value: type === "date" ? new Date(number) : number,
+        id: new mongoose.Types.ObjectId(id),
+    };
+};
+
+// Keyset condition for a (field, _id) sort, descending by default.
+export const applyCursor = (query, field, cursor, direction = -1) => {
+    if (!cursor) {
+        return query;
+    }
+
+    const op = direction === -1 ? "$lt" : "$gt";
+    const keyset = {
+        $or: [
+            { [field]: { [op]: cursor.value } },
+            { [field]: cursor.value, _id: { [op]: cursor.id } },
+        ],
+    };
+
+    if (query.$or) {
+        return { $and: [query, keyset] };
+    }
+    return { ...query, ...keyset };
+};
+
+// Fetch limit + 1 rows, then call this to trim and build the next cursor.
+export const buildPage = (docs, limit, field) => {
+    const hasMore = docs.length > limit;
+    const items = hasMore ? docs.slice(0, limit) : docs;
+    const last = items[items.length - 1];
+
+    return {
+        items,
+        hasMore,
+        nextCursor: hasMore && last ? encodeCursor(last[field], last._id) : null,
+    };
+};
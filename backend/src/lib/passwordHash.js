@@ -0,0 +1,131 @@
+import os from "os";
+import { Worker } from "worker_threads";
+
+// bcrypt off the event loop. The native "bcrypt" package already runs on the libuv
+// thread pool and is used when installed; otherwise bcryptjs runs in worker threads.
+// Both go through the same bounded queue, with at most POOL_SIZE hashes running.
+const POOL_SIZE = Number(process.env.HASH_POOL_SIZE) || Math.max(1, Math.min(4, os.availableParallelism() - 1));
+const MAX_QUEUED = Number(process.env.HASH_MAX_QUEUED) || 200;
+
+let native = null;
+try {
+    native = (await import("bcrypt")).default;
+} catch {
+    native = null;
+}
+
+const workerUrl = new URL("./passwordHash.worker.js", import.meta.url);
+const idle = [];
+const queue = [];
+const inFlight = new Map();
+let workers = 0;
+let nativeBusy = 0;
+let nextId = 0;
+let completed = 0;
+let rejected = 0;
+
+const spawnWorker = () => {
+    const worker = new Worker(workerUrl);
+    workers += 1;
+    worker.unref();
+
+    worker.on("message", ({ id, result, error }) => {
+        const task = inFlight.get(id);
+        inFlight.delete(id);
+        completed += 1;
+        if (error) {
+            task.reject(new Error(error));
+        } else {
+            task.resolve(result);
+        }
+        dispatch(worker);
+    });
+
+    worker.on("error", (error) => {
+        console.error("Password hash worker error:", error.message);
+    });
+
+    worker.on("exit", () => {
+        workers -= 1;
+        const index = idle.indexOf(worker);
+        if (index !== -1) idle.splice(index, 1);
+        for (const [id, task] of inFlight) {
+            if (task.worker === worker) {
+                inFlight.delete(id);
+                task.reject(new Error("Password hash worker exited"));
+            }
+        }
+        if (queue.length > 0) {
+            dispatch(spawnWorker());
+        }
+    });
+
+    return worker;
+};
+
+const dispatch = (worker) => {
+    const task = queue.shift();
+    if (!task) {
+        idle.push(worker);
+        return;
+    }
+    const id = nextId++;
+    task.worker = worker;
+    inFlight.set(id, task);
+    worker.postMessage({ id, ...task.message });
+};
+
+const runNative = () => {
+    while (nativeBusy < POOL_SIZE && queue.length > 0) {
+        const { message, resolve, reject } = queue.shift();
+        nativeBusy += 1;
+        const work = message.op === "hash"
+            ? native.hash(message.value, message.rounds)
+            : native.compare(message.value, message.hashed);
+        work.then(resolve, reject).finally(() => {
+            nativeBusy -= 1;
+            completed += 1;
+            runNative();
+        });
+    }
+};
+
+const runInPool = (message) => new Promise((resolve, reject) => {
+    if (queue.length >= MAX_QUEUED) {
+        rejected += 1;
+        const error = new Error("Password hashing queue is full");
+        error.code = "HASH_POOL_FULL";
+        reject(error);
+        return;
+    }
+
+    queue.push({ message, resolve, reject });
+    if (native) {
+        runNative();
+    } else if (idle.length > 0) {
+        dispatch(idle.pop());
+    } else if (workers < POOL_SIZE) {
+        dispatch(spawnWorker());
+    }
+});
+
+export const hashPassword = (value, rounds = 10) => runInPool({ op: "hash", value, rounds });
+
+export const comparePassword = (value, hashed) => runInPool({ op: "compare", value, hashed });
+
+export const isHashPoolFull = (error) => error?.code === "HASH_POOL_FULL";
+
+// A full queue drains within a few hash times, so clients are told to retry shortly.
+export const sendHashPoolBusy = (res, body = { message: "Server busy, please try again" }) =>
+    res.status(503).set("Retry-After", "1").json(body);
+
+export const getHashPoolStats = () => ({
+    implementation: native ? "bcrypt" : "bcryptjs-worker",
+    size: POOL_SIZE,
+    workers,
+    busy: native ? nativeBusy : inFlight.size,
+    queued: queue.length,
+    maxQueued: MAX_QUEUED,
+    completed,
+    rejected
+});
@@ -0,0 +1,13 @@
+import { parentPort } from "worker_threads";
+import bcrypt from "bcryptjs";
+
+parentPort.on("message", ({ id, op, value, hashed, rounds }) => {
+    try {
+        const result = op === "hash"
+            ? bcrypt.hashSync(value, rounds)
+            : bcrypt.compareSync(value, hashed);
+        parentPort.postMessage({ id, result });
+    } catch (error) {
+        parentPort.postMessage({ id, error: error.message });
+    }
+});
@@ -0,0 +1,148 @@
+import { EventEmitter } from "events";
+
+export const PRESENCE_CHANNEL = "presence";
+
+// A presence store tracks which users have at least one open socket.
+//   add(userId, socketId) / remove(userId, socketId)
+//   isOnline(userId), list()
+// and emits "online" / "offline" with the userId when a user's first socket
+// connects or their last socket disconnects anywhere in the deployment.
+
+// single process: the store is the source of truth
+class MemoryPresence extends EventEmitter {
+    constructor() {
+        super();
+        this.sockets = new Map();
+    }
+
+    add(userId, socketId) {
+        let socketIds = this.sockets.get(userId);
+        if (!socketIds) {
+            socketIds = new Set();
+            this.sockets.set(userId, socketIds);
+        }
+        socketIds.add(socketId);
+        if (socketIds.size === 1) {
+            this.emit("online", userId);
+        }
+    }
+
+    remove(userId, socketId) {
+        const socketIds = this.sockets.get(userId);
+        if (!socketIds || !socketIds.delete(socketId)) return;
+        if (socketIds.size === 0) {
+            this.sockets.delete(userId);
+            this.emit("offline", userId);
+        }
+    }
+
+    isOnline(userId) {
+        return this.sockets.has(userId);
+    }
+
+    list() {
+        return [...this.sockets.keys()];
+    }
+}
+
+// cluster worker: socket counts are aggregated by the primary (PresenceRegistry),
+// each worker keeps a replica of the online set that the primary pushes to it
+class ClusterPresence extends EventEmitter {
+    constructor() {
+        super();
+        this.online = new Set();
+        process.on("message", message => this.onIpcMessage(message));
+        process.send({ channel: PRESENCE_CHANNEL, op: "sync" });
+    }
+
+    onIpcMessage(message) {
+        if (message?.channel !== PRESENCE_CHANNEL) return;
+
+        if (message.op === "snapshot") {
+            this.online = new Set(message.users);
+        } else if (message.op === "online" && !this.online.has(message.userId)) {
+            this.online.add(message.userId);
+            this.emit("online", message.userId);
+        } else if (message.op === "offline" && this.online.delete(message.userId)) {
+            this.emit("offline", message.userId);
+        }
+    }
+
+    add(userId) {
+        process.send({ channel: PRESENCE_CHANNEL, op: "add", userId });
+    }
+
+    remove(userId) {
+        process.send({ channel: PRESENCE_CHANNEL, op: "remove", userId });
+    }
+
+    isOnline(userId) {
+        return this.online.has(userId);
+    }
+
+    list() {
+        return [...this.online];
+    }
+}
+
+export const createPresenceStore = (driver) => {
+    if (driver === "memory") {
+        return new MemoryPresence();
+    }
+    if (driver === "cluster") {
+        if (!process.send) {
+            throw new Error("The cluster presence store can only be used inside a cluster worker");
+        }
+        return new ClusterPresence();
+    }
+    throw new Error(`Unknown PRESENCE_STORE "${driver}"`);
+};
+
+// primary side: per-user socket counts per worker
+export class PresenceRegistry {
+    constructor(broadcast) {
+        this.broadcast = broadcast;
+        this.counts = new Map();
+    }
+
+    handle(worker, message) {
+        if (message.op === "sync") {
+            worker.send({ channel: PRESENCE_CHANNEL, op: "snapshot", users: [...this.counts.keys()] });
+        } else if (message.op === "add") {
+            this.change(message.userId, worker.id, 1);
+        } else if (message.op === "remove") {
+            this.change(message.userId, worker.id, -1);
+        }
+    }
+
+    change(userId, workerId, delta) {
+        let perWorker = this.counts.get(userId);
+        if (!perWorker) {
+            if (delta < 0) return;
+            perWorker = new Map();
+            this.counts.set(userId, perWorker);
+            this.broadcast({ channel: PRESENCE_CHANNEL, op: "online", userId });
+        }
+
+        const count = (perWorker.get(workerId) || 0) + delta;
+        if (count > 0) {
+            perWorker.set(workerId, count);
+        } else {
+            perWorker.delete(workerId);
+        }
+
+        if (perWorker.size === 0) {
+            this.counts.delete(userId);
+            this.broadcast({ channel: PRESENCE_CHANNEL, op: "offline", userId });
+        }
+    }
+
+    removeWorker(workerId) {
+        for (const [userId, perWorker] of this.counts) {
+            if (perWorker.delete(workerId) && perWorker.size === 0) {
+                this.counts.delete(userId);
+                this.broadcast({ channel: PRESENCE_CHANNEL, op: "offline", userId });
+            }
+        }
+    }
+}
@@ -0,0 +1,133 @@
+import crypto from "crypto";
+import zlib from "zlib";
+import { promisify } from "util";
+import { LRUCache } from "./cache.js";
+import { clusterInvalidation } from "./invalidation.js";
+
+const gzip = promisify(zlib.gzip);
+const brotli = promisify(zlib.brotliCompress);
+
+// Bodies smaller than this are not worth a compression round.
+const MIN_COMPRESS_BYTES = 1024;
+
+const ENCODERS = {
+    br: (body, quality) => brotli(body, {
+        params: {
+            [zlib.constants.BROTLI_PARAM_QUALITY]: quality,
+            [zlib.constants.BROTLI_PARAM_SIZE_HINT]: body.length
+        }
+    }),
+    gzip: (body, level) => gzip(body, { level })
+};
+
+// Dynamic bodies are compressed once per response, so they use fast settings;
+// cached bodies are compressed once per cache entry and can afford better ones.
+const FAST = { br: 4, gzip: 6 };
+const THOROUGH = { br: 9, gzip: 9 };
+
+const etagFor = (body) => `"${crypto.createHash("sha1").update(body).digest("base64url")}"`;
+
+const pickEncoding = (req, length) => {
+    if (length < MIN_COMPRESS_BYTES) return null;
+    const encoding = req.acceptsEncodings("br", "gzip");
+    return ENCODERS[encoding] ? encoding : null;
+};
+
+// Writes a JSON buffer with an ETag, answers 304 when the client's copy is current
+// and compresses with the best encoding the client accepts.
+const sendJsonBody = async (req, res, send, body, { etag = etagFor(body), encoded, quality = FAST } = {}) => {
+    res.set("ETag", etag);
+    res.vary("Accept-Encoding");
+
+    if (res.statusCode >= 200 && res.statusCode < 300 && req.fresh) {
+        return res.status(304).end();
+    }
+
+    res.type("json");
+    const encoding = pickEncoding(req, body.length);
+    if (!encoding) {
+        return send(body);
+    }
+
+    try {
+        let compressed = encoded?.[encoding];
+        if (!compressed) {
+            compressed = await ENCODERS[encoding](body, quality[encoding]);
+            if (encoded) encoded[encoding] = compressed;
+        }
+        res.set("Content-Encoding", encoding);
+        return send(compressed);
+    } catch (error) {
+        console.error("Compression Error:", error.message);
+        return send(body);
+    }
+};
+
+// App-wide: every res.json gets an ETag (and a 304 when it matches) and, when large
+// enough, gzip/brotli compression.
+export const compressJson = (req, res, next) => {
+    const send = res.send.bind(res);
+
+    res.json = (payload) => {
+        const body = Buffer.from(JSON.stringify(payload) ?? "");
+        sendJsonBody(req, res, send, body);
+        return res;
+    };
+    next();
+};
+
+// Short-TTL server-side cache for GET routes. Entries are grouped in namespaces; a write
+// controller calls invalidateResponseCache(namespace), which bumps the namespace version
+// so older entries are never served again and age out of the LRU. The bump reaches every
+// cluster worker.
+const responseCache = new LRUCache({ max: 2000, ttl: 30 * 1000 });
+const versions = new Map();
+
+const versionOf = (namespace) => versions.get(namespace) || 0;
+
+export const invalidateResponseCache = clusterInvalidation("response", (...namespaces) => {
+    namespaces.forEach(namespace => versions.set(namespace, versionOf(namespace) + 1));
+});
+
+export const cacheResponse = (namespace, { ttl = 30 * 1000, perUser = false } = {}) => (req, res, next) => {
+    if (req.method !== "GET") {
+        return next();
+    }
+
+    const version = versionOf(namespace);
+    const userKey = perUser ? req.user?._id?.toString() || "anonymous" : "";
+    const key = `${namespace}:${version}:${userKey}:${req.originalUrl}`;
+
+    res.set("Cache-Control", "private, no-cache");
+
+    const entry = responseCache.get(key);
+    if (entry) {
+        res.set("X-Cache", "HIT");
+        sendJsonBody(req, res, res.send.bind(res), entry.body, { etag: entry.etag, encoded: entry.encoded, quality: THOROUGH });
+        return;
+    }
+
+    const json = res.json.bind(res);
+    res.json = (payload) => {
+        if (res.statusCode !== 200) {
+            return json(payload);
+        }
+
+        const body = Buffer.from(JSON.stringify(payload) ?? "");
+        const fresh = { body, etag: etagFor(body), encoded: {} };
+        // a write that landed while this request was running makes its result stale
+        if (versionOf(namespace) === version) {
+            responseCache.set(key, fresh, ttl);
+        }
+
+        res.set("X-Cache", "MISS");
+        sendJsonBody(req, res, res.send.bind(res), body, { etag: fresh.etag, encoded: fresh.encoded, quality: THOROUGH });
+        return res;
+    };
+    next();
+};
+
+export const getResponseCacheStats = () => ({
+    ...responseCache.stats(),
+    namespaces: Object.fromEntries(versions)
+});
@@ -1,5 +1,5 @@
-import bcrypt from "bcryptjs";
-import transporter from "./email.js";
+import { hashPassword, isHashPoolFull, sendHashPoolBusy } from "./passwordHash.js";
+import { queueEmail } from "./email.js";
 import UserOTPVerification from "../models/userOTPVerification.models.js";
 
 export const sendOTPVerificationEmail = async ({ _id, email }, res, pendingUser) => {
@@ -16,7 +16,7 @@ export const sendOTPVerificationEmail = async ({ _id, email }, res, pendingUser)
         };
 
         const saltRounds = 10;
-        const hashedOTP = await bcrypt.hash(otp, saltRounds);
+        const hashedOTP = await hashPassword(otp, saltRounds);
         await UserOTPVerification.deleteMany({ email: email });
 
         const newOTPVerification = new UserOTPVerification({
@@ -27,7 +27,7 @@ export const sendOTPVerificationEmail = async ({ _id, email }, res, pendingUser)
         });
 
         await newOTPVerification.save();
-        await transporter.sendMail(mailOptions);
+        queueEmail(mailOptions);
 
         res.status(200).json({
             status: "PENDING",
@@ -39,10 +39,13 @@ export const sendOTPVerificationEmail = async ({ _id, email }, res, pendingUser)
             },
         });
     } catch (error) {
+        if (isHashPoolFull(error)) {
+            return sendHashPoolBusy(res, { status: "FAILED", message: "Server busy, please try again" });
+        }
         console.error("OTP Email Error:", error);
         res.status(500).json({
             status: "FAILED",
-            message: error.message,
+            message: "Internal Server Error",
         });
     }
 };
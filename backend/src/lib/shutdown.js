@@ -0,0 +1,33 @@
+const hooks = [];
+
+export const registerShutdownHook = (name, hook) => {
+    hooks.push({ name, hook });
+};
+
+export const runShutdownHooks = async () => {
+    for (const { name, hook } of hooks) {
+        try {
+            await hook();
+        } catch (error) {
+            console.error(`Shutdown hook "${name}" failed:`, error);
+        }
+    }
+};
+
+export const installShutdownHandlers = (server, { timeout = 10000 } = {}) => {
+    let shuttingDown = false;
+
+    const shutdown = async (signal) => {
+        if (shuttingDown) return;
+        shuttingDown = true;
+        console.log(`${signal} received, shutting down`);
+
+        setTimeout(() => process.exit(1), timeout).unref();
+        server.close();
+        await runShutdownHooks();
+        process.exit(0);
+    };
+
+    process.on("SIGINT", () => shutdown("SIGINT"));
+    process.on("SIGTERM", () => shutdown("SIGTERM"));
+};
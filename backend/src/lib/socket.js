@@ -1,77 +1,233 @@
 import { Server } from 'socket.io';
 import http from 'http';
+import cluster from 'cluster';
 import express from 'express';
+import mongoose from 'mongoose';
+import User from '../models/user.models.js';
+import Conversation from '../models/conversation.model.js';
+import { LRUCache } from './cache.js';
+import { gauge, registerCollector, socketEmits, socketEventsReceived } from './metrics.js';
+import { createIPCAdapter } from './ipcAdapter.js';
+import { createPresenceStore } from './presence.js';
 
 const app = express();
 const server = http.createServer(app);
+
+// SOCKET_ADAPTER / PRESENCE_STORE pick the implementations; the defaults follow
+// whether this process is a cluster worker (see src/cluster.js)
+const adapterDriver = process.env.SOCKET_ADAPTER || (cluster.isWorker ? 'ipc' : 'memory');
+if (!['ipc', 'memory'].includes(adapterDriver)) {
+    throw new Error(`Unknown SOCKET_ADAPTER "${adapterDriver}"`);
+}
+
 const io = new Server(server, {
     cors: {
         origin: ['http://localhost:5173'],
     },
+    ...(adapterDriver === 'ipc' && { adapter: createIPCAdapter() }),
+    // cluster workers get connections round robin, so polling requests of one session
+    // could land on different workers
+    ...(cluster.isWorker && { transports: ['websocket'] }),
 });
 
-export function getReceiverSocketId(userId) {
-    return userSocketMap[userId];
+const presence = createPresenceStore(process.env.PRESENCE_STORE || (cluster.isWorker ? 'cluster' : 'memory'));
+
+const PRESENCE_FLUSH_MS = Number(process.env.PRESENCE_FLUSH_MS) || 1000;
+// sockets that want every presence change; scoped sockets join presenceRoom(userId) instead
+const PRESENCE_ALL_ROOM = 'presence:all';
+const partnerCache = new LRUCache({ max: 5000, ttl: 60 * 1000 });
+
+const connectedClients = gauge('socketio_connected_clients', 'socket.io clients connected to this process');
+registerCollector(() => connectedClients.set({}, io.engine.clientsCount));
+
+export function userRoom(userId) {
+    return `user:${userId}`;
+}
+
+export function departmentRoom(department) {
+    return `department:${department}`;
+}
+
+export function isUserOnline(userId) {
+    return presence.isOnline(userId);
+}
+
+function presenceRoom(userId) {
+    return `presence:${userId}`;
+}
+
+// partners of each given user, from the cache or one $in query for all the misses
+async function getConversationPartners(userIds) {
+    const result = new Map();
+    const missing = [];
+    userIds.forEach(userId => {
+        const cached = partnerCache.get(userId);
+        if (cached) {
+            result.set(userId, cached);
+        } else {
+            result.set(userId, new Set());
+            missing.push(userId);
+        }
+    });
+    if (missing.length === 0) return result;
+
+    const conversations = await Conversation.find({ participants: { $in: missing } }).select('participants').lean();
+    const wanted = new Set(missing);
+    conversations.forEach(conversation => {
+        const participants = conversation.participants.map(participant => participant.toString());
+        participants.forEach(userId => {
+            if (!wanted.has(userId)) return;
+            participants.forEach(partnerId => partnerId !== userId && result.get(userId).add(partnerId));
+        });
+    });
+    missing.forEach(userId => partnerCache.set(userId, result.get(userId)));
+    return result;
 }
 
-const userSocketMap = {};
+async function joinDepartmentRoom(socket, userId) {
+    if (!mongoose.Types.ObjectId.isValid(userId)) return;
+    try {
+        const user = await User.findById(userId).select('profile_data.department').lean();
+        const department = user?.profile_data?.department;
+        if (department) {
+            socket.join(departmentRoom(department));
+        }
+    } catch (error) {
+        console.error('Join department room error:', error.message);
+    }
+}
+
+// Presence changes are coalesced per window: a user who reconnects within the window
+// produces no event at all. Each worker only notifies its own clients.
+const pendingPresence = new Map();
+let presenceTimer = null;
+// this worker's sockets with presenceScope "conversations"
+let scopedSockets = 0;
+
+function queuePresenceChange(userId, state) {
+    if (pendingPresence.has(userId) && pendingPresence.get(userId) !== state) {
+        pendingPresence.delete(userId);
+    } else {
+        pendingPresence.set(userId, state);
+    }
+    if (!presenceTimer) {
+        presenceTimer = setTimeout(flushPresenceChanges, PRESENCE_FLUSH_MS);
+    }
+}
+
+async function flushPresenceChanges() {
+    presenceTimer = null;
+    const online = [];
+    const offline = [];
+    pendingPresence.forEach((state, userId) => (state === 'online' ? online : offline).push(userId));
+    pendingPresence.clear();
+
+    if (online.length) {
+        io.local.to(PRESENCE_ALL_ROOM).emit('userOnline', online);
+        socketEmits.inc({ event: 'userOnline' });
+    }
+    if (offline.length) {
+        io.local.to(PRESENCE_ALL_ROOM).emit('userOffline', offline);
+        socketEmits.inc({ event: 'userOffline' });
+    }
+
+    // only sockets that asked for conversation-scoped presence need the partner lookup
+    if (scopedSockets === 0) return;
+    const changed = [...online, ...offline].filter(userId => mongoose.Types.ObjectId.isValid(userId));
+    if (changed.length === 0) return;
+    try {
+        const partners = await getConversationPartners(changed);
+        for (const [event, userIds] of [['userOnline', online], ['userOffline', offline]]) {
+            for (const userId of userIds) {
+                const rooms = [...(partners.get(userId) || [])].map(presenceRoom);
+                if (rooms.length === 0) continue;
+                io.local.to(rooms).emit(event, [userId]);
+                socketEmits.inc({ event });
+            }
+        }
+    } catch (error) {
+        console.error('Presence fan-out error:', error.message);
+    }
+}
+
+presence.on('online', userId => queuePresenceChange(userId, 'online'));
+presence.on('offline', userId => queuePresenceChange(userId, 'offline'));
+
+// full list only for the socket that just connected; afterwards it gets deltas.
+// "none" is for sockets that never show presence, such as the app-wide notification socket.
+async function sendPresenceSnapshot(socket, userId, scope) {
+    if (scope === 'none') return;
+    if (scope !== 'conversations') {
+        socket.join(PRESENCE_ALL_ROOM);
+        socket.emit('getOnlineUsers', presence.list());
+        socketEmits.inc({ event: 'getOnlineUsers' });
+        return;
+    }
+
+    socket.join(presenceRoom(userId));
+    try {
+        const partners = mongoose.Types.ObjectId.isValid(userId)
+            ? (await getConversationPartners([userId])).get(userId)
+            : new Set();
+        socket.emit('getOnlineUsers', [...partners].filter(partnerId => presence.isOnline(partnerId)));
+        socketEmits.inc({ event: 'getOnlineUsers' });
+    } catch (error) {
+        console.error('Presence snapshot error:', error.message);
+    }
+}
 
 io.on('connection', (socket) => {
     const userId = socket.handshake.query.userId;
     
+    const presenceScope = socket.handshake.query.presenceScope;
+    const scoped = Boolean(userId) && presenceScope === 'conversations';
+    if (scoped) scopedSockets += 1;
+
     if (userId) {
-        if (!userSocketMap[userId]) {
-            userSocketMap[userId] = [];
-        }
-        userSocketMap[userId].push(socket.id);
-        
-        io.emit('getOnlineUsers', Object.keys(userSocketMap));
+        socket.join(userRoom(userId));
+        sendPresenceSnapshot(socket, userId, presenceScope);
+        presence.add(userId, socket.id);
+
+        joinDepartmentRoom(socket, userId);
     }
 
+    // clients pick event names, so only events with a handler get their own label
+    socket.onAny((event) => {
+        socketEventsReceived.inc({ event: socket.listeners(event).length > 0 ? event : 'other' });
+    });
+
     socket.on('notificationRead', (notificationId) => {
         if (userId) {
-            broadcastToUserDevices(userId, 'notificationReadUpdate', notificationId);
+            emitToUser(userId, 'notificationReadUpdate', notificationId);
         }
     });
 
     socket.on('allNotificationsRead', () => {
         if (userId) {
-            broadcastToUserDevices(userId, 'allNotificationsReadUpdate');
+            emitToUser(userId, 'allNotificationsReadUpdate');
         }
     });
 
     socket.on('disconnect', () => {
-        
+        if (scoped) scopedSockets -= 1;
         if (userId) {
-            if (userSocketMap[userId]) {
-                userSocketMap[userId] = userSocketMap[userId].filter(id => id !== socket.id);
-                
-                if (userSocketMap[userId].length === 0) {
-                    delete userSocketMap[userId];
-                }
-            }
-            
-            io.emit("getOnlineUsers", Object.keys(userSocketMap));
+            presence.remove(userId, socket.id);
         }
     });
 });
 
-function broadcastToUserDevices(userId, event, data) {
-    if (userSocketMap[userId] && userSocketMap[userId].length > 0) {
-        userSocketMap[userId].forEach(socketId => {
-            io.to(socketId).emit(event, data);
-        });
+export function emitToDepartment(department, event, data, exceptUserId) {
+    let target = io.to(departmentRoom(department));
+    if (exceptUserId) {
+        target = target.except(userRoom(exceptUserId));
     }
+    target.emit(event, data);
+    socketEmits.inc({ event });
 }
 
 export function emitToUser(userId, event, data) {
-    if (userSocketMap[userId] && userSocketMap[userId].length > 0) {
-        userSocketMap[userId].forEach(socketId => {
-            io.to(socketId).emit(event, data);
-        });
-        return true;
-    }
-    return false;
+    io.to(userRoom(userId)).emit(event, data);
+    socketEmits.inc({ event });
 }
 
 export {io, app, server};
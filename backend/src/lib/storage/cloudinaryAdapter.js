@@ -0,0 +1,58 @@
+import path from "path";
+import crypto from "crypto";
+import cloudinary from "../cloudinary.js";
+
+export const createCloudinaryAdapter = () => ({
+    name: "cloudinary",
+
+    upload(stream, { filename, folder, uniqueName = false }) {
+        const options = uniqueName
+            ? { resource_type: "auto", folder, unique_filename: true }
+            : {
+                resource_type: "auto",
+                folder,
+                // readable, but unique so two uploads of the same filename never share an asset
+                public_id: `${path.parse(filename).name}-${crypto.randomBytes(6).toString("hex")}`,
+                unique_filename: false
+            };
+
+        return new Promise((resolve, reject) => {
+            const uploadStream = cloudinary.uploader.upload_stream(
+                options,
+                (error, result) => {
+                    if (error) {
+                        reject(error);
+                    } else if (!result || !result.secure_url) {
+                        reject(new Error("Cloudinary upload failed"));
+                    } else {
+                        resolve({
+                            id: result.public_id,
+                            url: result.secure_url,
+                            bytes: result.bytes,
+                            format: result.format,
+                            resourceType: result.resource_type
+                        });
+                    }
+                }
+            );
+
+            stream.on("error", reject);
+            stream.pipe(uploadStream);
+        });
+    },
+
+    // derived on the fly by Cloudinary, so no extra upload work is needed
+    thumbnailUrl(id) {
+        return cloudinary.url(id, {
+            secure: true,
+            transformation: [{ width: 320, height: 320, crop: "limit" }, { quality: "auto" }]
+        });
+    },
+
+    // "auto" uploads are stored as image (pdf too) or raw, and destroy only looks in one
+    async remove(id, { resourceType = "image" } = {}) {
+        if (id) {
+            await cloudinary.uploader.destroy(id, { resource_type: resourceType });
+        }
+    }
+});
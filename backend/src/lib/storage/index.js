@@ -0,0 +1,52 @@
+import path from "path";
+import { createCloudinaryAdapter } from "./cloudinaryAdapter.js";
+import { createLocalAdapter } from "./localAdapter.js";
+
+// A storage adapter exposes:
+//   upload(readableStream, { filename, mimetype, folder, uniqueName }) -> { id, url, bytes, format, resourceType }
+//   thumbnailUrl(id)
+//   remove(id, { resourceType })
+let adapter = null;
+
+export const getStorageAdapter = () => {
+    if (adapter) {
+        return adapter;
+    }
+
+    const driver = process.env.STORAGE_DRIVER || "cloudinary";
+
+    if (driver === "local") {
+        adapter = createLocalAdapter({
+            directory: path.resolve(process.env.LOCAL_STORAGE_DIR || "uploads"),
+            baseUrl: process.env.PUBLIC_URL || `http://localhost:${process.env.PORT}`
+        });
+    } else if (driver === "cloudinary") {
+        adapter = createCloudinaryAdapter();
+    } else {
+        throw new Error(`Unknown STORAGE_DRIVER "${driver}"`);
+    }
+
+    return adapter;
+};
+
+// multer storage engine that pipes each incoming file straight into the adapter;
+// the adapter is resolved per file so it is picked after dotenv has loaded
+export const createMulterStorage = () => ({
+    _handleFile(req, file, cb) {
+        getStorageAdapter().upload(file.stream, { filename: file.originalname, mimetype: file.mimetype })
+            .then(result => cb(null, {
+                storageId: result.id,
+                url: result.url,
+                size: result.bytes,
+                format: result.format,
+                resourceType: result.resourceType
+            }))
+            .catch(cb);
+    },
+
+    _removeFile(req, file, cb) {
+        getStorageAdapter().remove(file.storageId, { resourceType: file.resourceType })
+            .then(() => cb(null))
+            .catch(cb);
+    }
+});
@@ -0,0 +1,51 @@
+import fs from "fs";
+import path from "path";
+import crypto from "crypto";
+import { pipeline } from "stream/promises";
+
+// Writes uploads to a local directory that index.js serves statically. Meant for
+// development, offline tests and upload benchmarks.
+export const createLocalAdapter = ({ directory, publicPath = "/uploads", baseUrl }) => {
+    fs.mkdirSync(directory, { recursive: true });
+
+    return {
+        name: "local",
+        directory,
+        publicPath,
+
+        async upload(stream, { filename }) {
+            const extension = path.extname(filename);
+            const id = `${Date.now()}-${crypto.randomBytes(6).toString("hex")}${extension}`;
+            const target = path.join(directory, id);
+
+            let bytes = 0;
+            stream.on("data", chunk => {
+                bytes += chunk.length;
+            });
+
+            try {
+                await pipeline(stream, fs.createWriteStream(target));
+            } catch (error) {
+                await fs.promises.rm(target, { force: true });
+                throw error;
+            }
+
+            return {
+                id,
+                url: `${baseUrl}${publicPath}/${id}`,
+                bytes,
+                format: extension.slice(1)
+            };
+        },
+
+        thumbnailUrl(id) {
+            return `${baseUrl}${publicPath}/${id}`;
+        },
+
+        async remove(id) {
+            if (id) {
+                await fs.promises.rm(path.join(directory, path.basename(id)), { force: true });
+            }
+        }
+    };
+};
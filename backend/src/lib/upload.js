@@ -0,0 +1,114 @@
+import os from "os";
+import multer from "multer";
+import { createMulterStorage } from "./storage/index.js";
+
+const MAX_UPLOAD_BYTES = parseInt(process.env.MAX_UPLOAD_BYTES, 10) || 25 * 1024 * 1024;
+const MAX_CONCURRENT_UPLOADS = parseInt(process.env.MAX_CONCURRENT_UPLOADS, 10) || 4;
+const MAX_QUEUED_UPLOADS = parseInt(process.env.MAX_QUEUED_UPLOADS, 10) || 50;
+const MAX_CHAT_IMAGE_BYTES = parseInt(process.env.MAX_CHAT_IMAGE_BYTES, 10) || 5 * 1024 * 1024;
+
+// Caps how many requests run the wrapped handlers at once; extra requests wait in a
+// bounded FIFO and are rejected with 503 once it is full.
+export const limitConcurrency = (max, { maxQueued = 100 } = {}) => {
+    let active = 0;
+    const waiting = [];
+
+    const release = () => {
+        active -= 1;
+        const next = waiting.shift();
+        if (next) {
+            active += 1;
+            next();
+        }
+    };
+
+    return (req, res, next) => {
+        const run = () => {
+            if (res.writableEnded || req.socket?.destroyed) {
+                return release();
+            }
+
+            let released = false;
+            const done = () => {
+                if (!released) {
+                    released = true;
+                    release();
+                }
+            };
+            res.on("finish", done);
+            res.on("close", done);
+            next();
+        };
+
+        if (active < max) {
+            active += 1;
+            return run();
+        }
+
+        if (waiting.length >= maxQueued) {
+            return res.status(503).json({ message: "Too many uploads in progress. Please try again shortly." });
+        }
+
+        waiting.push(run);
+    };
+};
+
+const sendMulterError = (res, error) => {
+    const status = error.code === "LIMIT_FILE_SIZE" ? 413 : 400;
+    return res.status(status).json({ message: error.message });
+};
+
+const uploadSlots = limitConcurrency(MAX_CONCURRENT_UPLOADS, { maxQueued: MAX_QUEUED_UPLOADS });
+
+export const streamSingleUpload = (fieldName) => {
+    const upload = multer({
+        storage: createMulterStorage(),
+        limits: { fileSize: MAX_UPLOAD_BYTES, files: 1 }
+    }).single(fieldName);
+
+    const handleUpload = (req, res, next) => {
+        upload(req, res, (error) => {
+            if (!error) {
+                return next();
+            }
+
+            if (error instanceof multer.MulterError) {
+                return sendMulterError(res, error);
+            }
+
+            console.error("Upload Error:", error.message);
+            res.status(500).json({ message: "File upload to storage failed." });
+        });
+    };
+
+    return [uploadSlots, handleUpload];
+};
+
+// Spools one image to the OS temp dir so a background job can upload it after the
+// request has been answered. Requests that are not multipart pass straight through.
+export const spoolSingleImage = (fieldName) => {
+    const upload = multer({
+        storage: multer.diskStorage({ destination: os.tmpdir() }),
+        limits: { fileSize: MAX_CHAT_IMAGE_BYTES, files: 1 },
+        fileFilter: (req, file, cb) => {
+            if (file.mimetype.startsWith("image/")) {
+                cb(null, true);
+            } else {
+                cb(new multer.MulterError("LIMIT_UNEXPECTED_FILE", file.fieldname));
+            }
+        }
+    }).single(fieldName);
+
+    return (req, res, next) => {
+        upload(req, res, (error) => {
+            if (!error) {
+                return next();
+            }
+            if (error instanceof multer.MulterError) {
+                return sendMulterError(res, error);
+            }
+            console.error("Image Upload Error:", error.message);
+            res.status(500).json({ message: "Failed to receive image." });
+        });
+    };
+};
@@ -1,5 +1,5 @@
 import jwt from 'jsonwebtoken';
-import User from '../models/user.models.js';
+import { getCachedUser } from '../lib/userCache.js';
 
 export const isAdmin = async (req, res, next) => {
   try {
@@ -12,7 +12,7 @@ export const isAdmin = async (req, res, next) => {
 
     const decoded = jwt.verify(token, process.env.JWT_SECRET);
     
-    const user = await User.findById(decoded.userID).select('-password');
+    const user = await getCachedUser(decoded.userID);
     
     if (!user) {
       return res.status(404).json({ error: 'User not found' });
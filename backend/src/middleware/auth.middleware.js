@@ -1,5 +1,5 @@
 import jwt from "jsonwebtoken";
-import User from "../models/user.models.js";
+import { getCachedUser } from "../lib/userCache.js";
 
 export const protectRoute = async (req, res, next) => {
   try {
@@ -15,7 +15,7 @@ export const protectRoute = async (req, res, next) => {
       return res.status(401).json({ message: "Unauthorized - Invalid Token" });
     }
 
-    const user = await User.findById(decoded.userID).select("-password");
+    const user = await getCachedUser(decoded.userID);
 
     if (!user) {
       return res.status(404).json({ message: "User not found" });
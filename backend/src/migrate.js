@@ -0,0 +1,134 @@
+import "dotenv/config";
+import mongoose from "mongoose";
+import { connectDB } from "./lib/db.js";
+import Course from "./models/course.model.js";
+import AcademicResource from "./models/academicResource.model.js";
+import ResourceRating from "./models/resourceRating.model.js";
+import Post from "./models/post.model.js";
+import PostLike from "./models/postLike.model.js";
+import User from "./models/user.models.js";
+import Notification from "./models/notification.model.js";
+
+// One-off backfills for data written before a maintained field existed. Run once per
+// deploy, before starting the server (npm run migrate); every step is safe to re-run.
+
+// uploadResource/deleteResource keep resourceCount current; only courses from before the
+// counter existed are filled in
+const backfillCourseResourceCounts = async () => {
+    await AcademicResource.aggregate([
+        { $group: { _id: "$course_code", resourceCount: { $sum: 1 } } },
+        { $project: { _id: 0, course_code: "$_id", resourceCount: 1 } },
+        {
+            $merge: {
+                into: Course.collection.name,
+                on: "course_code",
+                whenMatched: [{ $set: { resourceCount: { $ifNull: ["$resourceCount", "$$new.resourceCount"] } } }],
+                whenNotMatched: "discard"
+            }
+        }
+    ]);
+    await Course.updateMany({ resourceCount: { $exists: false } }, { $set: { resourceCount: 0 } });
+};
+
+// ratings used to be embedded in the resource; they now live in ResourceRating
+const migrateEmbeddedRatings = async () => {
+    const legacy = AcademicResource.find({ "ratings.0": { $exists: true } })
+        .select("ratings")
+        .lean()
+        .cursor();
+
+    for await (const resource of legacy) {
+        await ResourceRating.importEmbedded(resource);
+    }
+};
+
+// ratings adjust the totals by their delta; a crash between the rating and the delta write
+// leaves them off, so they are recomputed here
+const repairResourceRatingTotals = () => ResourceRating.syncResourceTotals();
+
+// likes used to be an array embedded in the post; they now live in PostLike. The legacy
+// counter could drift from the array, so it is recounted from the moved likes.
+const migrateEmbeddedLikes = async () => {
+    const legacy = Post.find({ "likes.0": { $exists: true } })
+        .select("likes")
+        .lean()
+        .cursor();
+
+    for await (const post of legacy) {
+        try {
+            await PostLike.insertMany(post.likes.map(userId => ({ postId: post._id, userId })), { ordered: false });
+        } catch (error) {
+            // already moved by an earlier, interrupted run
+            const duplicatesOnly = error.code === 11000 || error.writeErrors?.every(writeError => writeError.code === 11000);
+            if (!duplicatesOnly) throw error;
+        }
+        const likes = await PostLike.countDocuments({ postId: post._id });
+        // likes is no longer in the schema, so strict mode would drop the $unset
+        await Post.updateOne({ _id: post._id }, { $set: { number_of_likes: likes }, $unset: { likes: 1 } }, { strict: false });
+    }
+    await Post.updateMany({ likes: { $size: 0 } }, { $set: { number_of_likes: 0 }, $unset: { likes: 1 } }, { strict: false });
+};
+
+// a like and its counter update are two writes; a crash between them is repaired here
+const repairPostLikeCounts = async () => {
+    await PostLike.aggregate([
+        { $group: { _id: "$postId", number_of_likes: { $sum: 1 } } },
+        { $merge: { into: Post.collection.name, whenMatched: "merge", whenNotMatched: "discard" } }
+    ]);
+};
+
+// the notification controllers keep unread_notifications current; only users from before
+// the counter existed are filled in
+const backfillUnreadNotificationCounts = async () => {
+    await Notification.aggregate([
+        { $match: { isRead: false } },
+        { $group: { _id: "$recipient", unread_notifications: { $sum: 1 } } },
+        {
+            $merge: {
+                into: User.collection.name,
+                whenMatched: [{ $set: { unread_notifications: { $ifNull: ["$unread_notifications", "$$new.unread_notifications"] } } }],
+                whenNotMatched: "discard"
+            }
+        }
+    ]);
+    await User.updateMany({ unread_notifications: { $exists: false } }, { $set: { unread_notifications: 0 } });
+};
+
+// the read TTL index expires on readAt, which notifications read before it existed lack;
+// their last update is when they were marked read
+const backfillNotificationReadAt = async () => {
+    await Notification.updateMany(
+        { isRead: true, readAt: { $exists: false } },
+        [{ $set: { readAt: { $ifNull: ["$updatedAt", "$$NOW"] } } }]
+    );
+};
+
+const migrations = [
+    ["course resource counts", backfillCourseResourceCounts],
+    ["embedded resource ratings", migrateEmbeddedRatings],
+    ["resource rating totals", repairResourceRatingTotals],
+    ["embedded post likes", migrateEmbeddedLikes],
+    ["post like counts", repairPostLikeCounts],
+    ["unread notification counts", backfillUnreadNotificationCounts],
+    ["notification readAt", backfillNotificationReadAt],
+];
+
+await connectDB();
+if (mongoose.connection.readyState !== 1) {
+    process.exit(1);
+}
+
+let failed = false;
+for (const [name, migrate] of migrations) {
+    try {
+        console.log(`Migrating ${name}`);
+        await migrate();
+    } catch (error) {
+        console.error(`Migration "${name}" failed:`, error.message);
+        failed = true;
+        break;
+    }
+}
+
+await mongoose.disconnect();
+process.exit(failed ? 1 : 0);
@@ -58,7 +58,16 @@ const academicResource = new mongoose.Schema({
         type: String,
         required: true,
     },
+    role: {
+        type: String,
+        enum: ["student", "alumni", "admin"],
+    },
+    // legacy embedded ratings; new ratings live in the ResourceRating collection
     ratings: [rating],
+    ratingSum: {
+        type: Number,
+        default: 0,
+    },
     averageRating: {
         type: Number,
         default: 0,
@@ -75,28 +84,15 @@ const academicResource = new mongoose.Schema({
     },
 });
 
-academicResource.methods.calculateAverageRating = function() {
-    if (this.ratings.length === 0) {
-        this.averageRating = 0;
-        this.numberOfRatings = 0;
-    } else {
-        const totalRating = this.ratings.reduce((sum, rating) => sum + rating.rating, 0);
-        this.averageRating = totalRating / this.ratings.length;
-        this.numberOfRatings = this.ratings.length;
-    }
-
-    this.averageRating = Math.round(this.averageRating * 10) / 10;
-};
-
-
-academicResource.pre('save', function(next) {
-
-    if (this.isModified('ratings')) {
-        this.calculateAverageRating();
-    }
-    next();
-});
-
+academicResource.index({ uploaded_at: -1, _id: -1 });
+academicResource.index({ averageRating: -1, _id: -1 });
+academicResource.index({ downloads: -1, _id: -1 });
+academicResource.index({ course_code: 1, uploaded_at: -1, _id: -1 });
+academicResource.index({ course_code: 1, averageRating: -1, _id: -1 });
+academicResource.index({ course_code: 1, downloads: -1, _id: -1 });
+academicResource.index({ file_type: 1, uploaded_at: -1, _id: -1 });
+academicResource.index({ role: 1, uploaded_at: -1, _id: -1 });
+academicResource.index({ topic: "text", description: "text" });
 
 const AcademicResource = mongoose.model("AcademicResource", academicResource);
 export default AcademicResource;
@@ -0,0 +1,54 @@
+import mongoose from "mongoose";
+
+const conversation = new mongoose.Schema(
+    {
+        // "<smallerId>_<largerId>" so each pair of users maps to exactly one summary
+        pairKey: {
+            type: String,
+            required: true,
+            unique: true
+        },
+        participants: [{
+            type: mongoose.Schema.Types.ObjectId,
+            ref: "User",
+            required: true
+        }],
+        lastMessage: {
+            messageId: {
+                type: mongoose.Schema.Types.ObjectId,
+                ref: "Message"
+            },
+            senderID: {
+                type: mongoose.Schema.Types.ObjectId,
+                ref: "User"
+            },
+            text: {
+                type: String
+            },
+            hasImage: {
+                type: Boolean,
+                default: false
+            }
+        },
+        lastMessageAt: {
+            type: Date,
+            default: Date.now
+        },
+        unreadCounts: {
+            type: Map,
+            of: Number,
+            default: {}
+        }
+    },
+    { timestamps: true }
+);
+
+conversation.index({ participants: 1, lastMessageAt: -1, _id: -1 });
+
+conversation.statics.pairKeyFor = function (userA, userB) {
+    return [userA.toString(), userB.toString()].sort().join("_");
+};
+
+const Conversation = mongoose.model("Conversation", conversation);
+
+export default Conversation;
@@ -21,6 +21,10 @@ const course = new mongoose.Schema({
     credits: {
         type: Number,
         required: true,
+    },
+    resourceCount: {
+        type: Number,
+        default: 0,
     }
 }, { timestamps: false });
 
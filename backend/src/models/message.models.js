@@ -17,11 +17,21 @@ const message = new mongoose.Schema(
         },
         image: {
             type: String,
+        },
+        imageThumbnail: {
+            type: String,
+        },
+        // set while a chat image is still being uploaded by the background worker
+        imageStatus: {
+            type: String,
+            enum: ["pending", "ready", "failed"],
         }
     },
     { timestamps: true }
 );
 
+message.index({ senderID: 1, receiverID: 1, createdAt: -1, _id: -1 });
+
 const Message = mongoose.model("Message", message);
 
 export default Message;
\ No newline at end of file
@@ -34,11 +34,25 @@ const notification = new mongoose.Schema(
         isRead: {
             type: Boolean,
             default: false
+        },
+        readAt: {
+            type: Date
         }
     },
     { timestamps: true }
 );
 
+notification.index({ recipient: 1, referenceId: 1 });
+notification.index({ recipient: 1, isRead: 1, createdAt: -1, _id: -1 });
+
+// Read notifications are deleted NOTIFICATION_READ_TTL_DAYS after being read; unread
+// ones never have readAt and are kept.
+const READ_TTL_DAYS = Number(process.env.NOTIFICATION_READ_TTL_DAYS) || 30;
+notification.index(
+    { readAt: 1 },
+    { expireAfterSeconds: READ_TTL_DAYS * 24 * 60 * 60, partialFilterExpression: { isRead: true } }
+);
+
 const Notification = mongoose.model("Notification", notification);
 
 export default Notification;
\ No newline at end of file
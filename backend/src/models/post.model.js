@@ -31,12 +31,13 @@ const post = new mongoose.Schema({
         type: Number,
         default: 0,
     },
-    likes: [{
-        type: mongoose.Schema.Types.ObjectId,
-        ref: 'User'
-    }],
 
 }, { timestamps: { createdAt: "created_at", updatedAt: false } });
 
+post.index({ created_at: -1, _id: -1 });
+post.index({ department: 1, created_at: -1, _id: -1 });
+post.index({ category: 1, created_at: -1, _id: -1 });
+post.index({ department: 1, category: 1, created_at: -1, _id: -1 });
+
 const Post = mongoose.model("Post", post);
 export default Post;
\ No newline at end of file
@@ -0,0 +1,26 @@
+import mongoose from "mongoose";
+
+// One document per like, so liking a post no longer rewrites an ever-growing array on
+// the post; the post only keeps its number_of_likes counter.
+const postLike = new mongoose.Schema(
+    {
+        postId: {
+            type: mongoose.Schema.Types.ObjectId,
+            ref: "Post",
+            required: true
+        },
+        userId: {
+            type: mongoose.Schema.Types.ObjectId,
+            ref: "User",
+            required: true
+        }
+    },
+    { timestamps: { updatedAt: false } }
+);
+
+// one like per user and post; also answers the feed's "which of these did I like" lookup
+postLike.index({ postId: 1, userId: 1 }, { unique: true });
+
+const PostLike = mongoose.model("PostLike", postLike);
+
+export default PostLike;
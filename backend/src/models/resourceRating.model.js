@@ -0,0 +1,66 @@
+import mongoose from "mongoose";
+
+const resourceRating = new mongoose.Schema(
+    {
+        resourceId: {
+            type: mongoose.Schema.Types.ObjectId,
+            ref: "AcademicResource",
+            required: true
+        },
+        userId: {
+            type: mongoose.Schema.Types.ObjectId,
+            ref: "User",
+            required: true
+        },
+        rating: {
+            type: Number,
+            required: true,
+            min: 1,
+            max: 5
+        }
+    },
+    { timestamps: true }
+);
+
+resourceRating.index({ resourceId: 1, userId: 1 }, { unique: true });
+
+// Rewrites ratingSum, numberOfRatings and averageRating from this collection, for one
+// resource or all of them. Ratings apply deltas instead; this is the import and repair path.
+resourceRating.statics.syncResourceTotals = function (resourceId) {
+    const match = resourceId ? [{ $match: { resourceId: new mongoose.Types.ObjectId(resourceId) } }] : [];
+    return this.aggregate([
+        ...match,
+        { $group: { _id: "$resourceId", ratingSum: { $sum: "$rating" }, numberOfRatings: { $sum: 1 } } },
+        { $set: { averageRating: { $round: [{ $divide: ["$ratingSum", "$numberOfRatings"] }, 1] } } },
+        {
+            $merge: {
+                into: mongoose.model("AcademicResource").collection.name,
+                whenMatched: "merge",
+                whenNotMatched: "discard"
+            }
+        }
+    ]);
+};
+
+// Moves ratings still embedded in a resource document into this collection. Ratings that
+// already exist win, whether written since or imported by a concurrent run.
+resourceRating.statics.importEmbedded = async function (resource) {
+    try {
+        await this.bulkWrite(resource.ratings.map(({ userId, rating }) => ({
+            updateOne: {
+                filter: { resourceId: resource._id, userId },
+                update: { $setOnInsert: { rating } },
+                upsert: true
+            }
+        })), { ordered: false });
+    } catch (error) {
+        const duplicatesOnly = error.code === 11000 || error.writeErrors?.every(writeError => writeError.code === 11000);
+        if (!duplicatesOnly) throw error;
+    }
+    await this.syncResourceTotals(resource._id);
+    await mongoose.model("AcademicResource").updateOne({ _id: resource._id }, { $unset: { ratings: 1 } });
+};
+
+const ResourceRating = mongoose.model("ResourceRating", resourceRating);
+
+export default ResourceRating;
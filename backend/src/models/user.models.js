@@ -82,6 +82,12 @@ const user = new mongoose.Schema(
             type: String,
             required: false,
         },
+        // maintained by the notification controllers so the bell is a single _id read
+        unread_notifications: {
+            type: Number,
+            default: 0,
+            min: 0,
+        },
         profile_data: {
             type: profileData,
             default: function () {
@@ -92,6 +98,14 @@ const user = new mongoose.Schema(
     { timestamps: { createdAt: "created_at", updatedAt: false } }
 );
 
+user.index({ "profile_data.department": 1 });
+
+// Case-insensitive indexes for prefix search in the messaging directory. Queries must
+// use the same collation to be served by them.
+export const SEARCH_COLLATION = { locale: "en", strength: 2 };
+user.index({ email: 1 }, { name: "email_search", collation: SEARCH_COLLATION });
+user.index({ "profile_data.name": 1 }, { name: "name_search", collation: SEARCH_COLLATION });
+
 const User = mongoose.model("User", user);
 
 export default User;
@@ -1,16 +1,15 @@
 import express from "express";
-import { uploadResource, getResourcesByCourse, addOrUpdateRating, incrementDownloadCount, getAllResources } from "../controllers/academicResource.controller.js";
+import { uploadResource, getResourcesByCourse, addOrUpdateRating, incrementDownloadCount, getAllResources, searchResources } from "../controllers/academicResource.controller.js";
 import { protectRoute } from "../middleware/auth.middleware.js"
-import multer from "multer";
+import { streamSingleUpload } from "../lib/upload.js";
+import { cacheResponse } from "../lib/responseCache.js";
 
 const router = express.Router();
 
-const storage = multer.memoryStorage();
-const upload = multer({ storage: storage });
-
-router.post("/upload", protectRoute, upload.single('resourceFile'), uploadResource);
-router.get("/all", getAllResources);
-router.get("/:course_code", getResourcesByCourse);
+router.post("/upload", protectRoute, ...streamSingleUpload('resourceFile'), uploadResource);
+router.get("/all", cacheResponse("resources"), getAllResources);
+router.get("/search", cacheResponse("resources"), searchResources);
+router.get("/:course_code", cacheResponse("resources"), getResourcesByCourse);
 router.post("/:resourceId/rate", protectRoute, addOrUpdateRating);
 router.post("/:resourceId/download", protectRoute, incrementDownloadCount);
 
@@ -1,11 +1,12 @@
 import express from 'express';
-import { getAllUsers, deleteUser, deletePost, deleteResource } from '../controllers/admin.controller.js';
+import { getAllUsers, deleteUser, deletePost, deleteResource, getCacheStats } from '../controllers/admin.controller.js';
 import { isAdmin } from '../middleware/admin.middleware.js';
 
 const router = express.Router();
 
 
 router.get('/getUsers', isAdmin, getAllUsers);
+router.get('/cache-stats', isAdmin, getCacheStats);
 
 
 router.delete('/delete/users/:userId', isAdmin, deleteUser);
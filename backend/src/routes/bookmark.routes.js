@@ -1,5 +1,5 @@
 import express from "express";
-import { toggleBookmark, getBookmarkedResources } from "../controllers/bookmark.controller.js";
+import { toggleBookmark, getBookmarkedResources, getBookmarkedResourceIds } from "../controllers/bookmark.controller.js";
 import { protectRoute } from "../middleware/auth.middleware.js";
 
 const router = express.Router();
@@ -8,4 +8,6 @@ router.post("/:resourceId", protectRoute, toggleBookmark);
 
 router.get("/", protectRoute, getBookmarkedResources);
 
+router.get("/ids", protectRoute, getBookmarkedResourceIds);
+
 export default router;
\ No newline at end of file
@@ -2,10 +2,11 @@ import express from "express";
 
 import { createCourse, getAllCourses } from "../controllers/courses.controllers.js";
 import { protectRoute } from "../middleware/auth.middleware.js";
+import { cacheResponse } from "../lib/responseCache.js";
 
 const router = express.Router();
 
-router.get("/", protectRoute, getAllCourses);
+router.get("/", protectRoute, cacheResponse("courses", { ttl: 60 * 1000 }), getAllCourses);
 router.post("/create", protectRoute, createCourse);
 
 export default router;
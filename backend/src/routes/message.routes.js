@@ -1,8 +1,10 @@
 import express from "express";
 import { protectRoute } from "../middleware/auth.middleware.js";
-import { getUsersForSidebar, getMessages, sendMessage } from "../controllers/message.controllers.js";
+import { spoolSingleImage } from "../lib/upload.js";
+import { getUsersForSidebar, getMessages, sendMessage, getConversations } from "../controllers/message.controllers.js";
 const router = express.Router();
 router.get("/users", protectRoute, getUsersForSidebar);
+router.get("/conversations", protectRoute, getConversations);
 router.get("/:id", protectRoute, getMessages);
-router.post("/send/:id", protectRoute, sendMessage);
+router.post("/send/:id", protectRoute, spoolSingleImage("image"), sendMessage);
 export default router;
\ No newline at end of file
@@ -2,6 +2,7 @@ import express from "express";
 import { protectRoute } from "../middleware/auth.middleware.js";
 import { 
     getNotifications, 
+    getUnreadNotificationCount,
     markNotificationAsRead, 
     markAllNotificationsAsRead 
 } from "../controllers/notification.controllers.js";
@@ -10,6 +11,8 @@ const router = express.Router();
 
 router.get("/", protectRoute, getNotifications);
 
+router.get("/unread-count", protectRoute, getUnreadNotificationCount);
+
 router.patch("/:notificationId/read", protectRoute, markNotificationAsRead);
 
 router.patch("/read-all", protectRoute, markAllNotificationsAsRead);
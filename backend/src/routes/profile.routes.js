@@ -1,11 +1,12 @@
 import express from "express";
 import { uploadProfilePicture, removeProfilePicture, getProfilePicture } from "../controllers/profile.controllers.js";
 import { protectRoute } from "../middleware/auth.middleware.js";
+import { cacheResponse } from "../lib/responseCache.js";
 
 const router = express.Router();
 
 router.post("/profile-picture/:userId", protectRoute, uploadProfilePicture);
 router.delete("/profile-picture/:userId", protectRoute, removeProfilePicture);
-router.get("/profile-picture/:userId", getProfilePicture);
+router.get("/profile-picture/:userId", cacheResponse("profile-pictures", { ttl: 5 * 60 * 1000 }), getProfilePicture);
 
 export default router;
\ No newline at end of file
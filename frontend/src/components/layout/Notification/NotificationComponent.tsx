@@ -18,7 +18,7 @@ const NotificationComponent: React.FC = () => {
   const [anchorEl, setAnchorEl] = useState<HTMLButtonElement | null>(null);
   const [loading, setLoading] = useState<boolean>(false);
   const [markingId, setMarkingId] = useState<string | null>(null);
-  const { notifications, unreadCount, markAsRead, markAllAsRead, fetchNotifications } = useNotifications();
+  const { notifications, unreadCount, hasMore, markAsRead, markAllAsRead, fetchNotifications, loadMoreNotifications } = useNotifications();
   const navigate = useNavigate();
   const theme = useTheme();
   
@@ -243,6 +243,13 @@ const NotificationComponent: React.FC = () => {
                   </Typography>
                 </Box>
               ))}
+              {hasMore && (
+                <Box sx={{ p: 1, textAlign: 'center' }}>
+                  <Button size="small" onClick={() => loadMoreNotifications()} sx={{ textTransform: 'none' }}>
+                    Load older
+                  </Button>
+                </Box>
+              )}
             </Box>
           )}
         </Paper>
@@ -33,7 +33,6 @@ interface Post {
   department?: string;
   role?: string;
   number_of_likes?: number;
-  likes?: string[];
   created_at: string;
 }
 
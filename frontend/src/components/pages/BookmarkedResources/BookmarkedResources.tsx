@@ -64,23 +64,34 @@ const BookmarkedResources: React.FC = () => {
   const [currentUserRating, setCurrentUserRating] = useState<number | null>(null);
   const [ratingLoading, setRatingLoading] = useState(false);
 
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchBookmarkPage = async (cursor?: string) => {
+    const params = new URLSearchParams({ limit: '24' });
+    if (cursor) params.set('cursor', cursor);
+
+    const response = await fetch(`http://localhost:5001/api/bookmarks?${params}`, {
+      method: 'GET',
+      credentials: 'include',
+    });
+    
+    if (!response.ok) {
+      throw new Error('Failed to fetch bookmarked resources');
+    }
+    
+    const data = await response.json();
+    setNextCursor(data.nextCursor || null);
+    return (data.resources || []) as BookmarkedResource[];
+  };
+
   useEffect(() => {
     const fetchBookmarkedResources = async () => {
       setLoading(true);
       setError(null);
       
       try {
-        const response = await fetch('http://localhost:5001/api/bookmarks', {
-          method: 'GET',
-          credentials: 'include',
-        });
-        
-        if (!response.ok) {
-          throw new Error('Failed to fetch bookmarked resources');
-        }
-        
-        const data = await response.json();
-        setResources(data);
+        setResources(await fetchBookmarkPage());
       } catch (err) {
         console.error('Error fetching bookmarked resources:', err);
         setError(err instanceof Error ? err.message : 'An error occurred');
@@ -94,6 +105,19 @@ const BookmarkedResources: React.FC = () => {
     }
   }, [user]);
 
+  const loadMoreBookmarks = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const older = await fetchBookmarkPage(nextCursor);
+      setResources(prev => [...prev, ...older.filter(resource => !prev.some(p => p._id === resource._id))]);
+    } catch (err) {
+      console.error('Error fetching bookmarked resources:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const filteredResources = resources.filter(resource => 
     resource.topic.toLowerCase().includes(searchQuery.toLowerCase()) ||
     resource.course_code.toLowerCase().includes(searchQuery.toLowerCase()) ||
@@ -411,6 +435,13 @@ const BookmarkedResources: React.FC = () => {
                 </Grid>
               ))}
             </Grid>
+            {nextCursor && (
+              <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+                <Button variant="outlined" onClick={loadMoreBookmarks} disabled={loadingMore}>
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </Button>
+              </Box>
+            )}
           </>
         )}
       </Paper>
@@ -161,7 +161,7 @@ const Courses: React.FC = () => {
   useEffect(() => {
     const fetchBookmarkedResources = async () => {
       try {
-        const response = await fetch('http://localhost:5001/api/bookmarks', {
+        const response = await fetch('http://localhost:5001/api/bookmarks/ids', {
           method: 'GET',
           credentials: 'include',
         });
@@ -170,8 +170,7 @@ const Courses: React.FC = () => {
           throw new Error('Failed to fetch bookmarked resources');
         }
         
-        const data = await response.json();
-        const bookmarkIds = data.map((resource: AcademicResource) => resource._id);
+        const bookmarkIds: string[] = await response.json();
         setBookmarkedResources(bookmarkIds);
       } catch (err) {
         console.error('Error fetching bookmarked resources:', err);
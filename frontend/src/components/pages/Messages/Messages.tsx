@@ -12,8 +12,13 @@ import useMessages from './hooks/useMessages';
 const Messages: React.FC = () => {
   const {
     users, 
+    hasMoreUsers,
+    loadMoreUsers,
+    searchUsers,
     currentConversationUser, 
     currentMessages,
+    hasOlderMessages,
+    loadOlderMessages,
     selectedUserId,
     handleSelectUser,
     handleSendMessage,
@@ -49,6 +54,9 @@ const Messages: React.FC = () => {
         onSelectConversation={handleSelectUser}
         onlineUsers={onlineUsers} 
         currentUserId={currentUserId}
+        onSearch={searchUsers}
+        hasMore={hasMoreUsers}
+        onLoadMore={loadMoreUsers}
       />
       
       {/* Chat Area */}
@@ -61,7 +69,12 @@ const Messages: React.FC = () => {
           overflow: 'hidden'
         }}>
           <ConversationHeader conversation={currentConversationUser ?? null} /> 
-          <MessageList messages={currentMessages} currentUserId={currentUserId} />
+          <MessageList
+            messages={currentMessages}
+            currentUserId={currentUserId}
+            hasOlderMessages={hasOlderMessages}
+            onLoadOlder={loadOlderMessages}
+          />
           <MessageInput onSendMessage={handleSendMessage} />
         </Box>
       ) : (
@@ -9,6 +9,7 @@ import {
   Badge, 
   Divider,
   Box,
+  Button,
   TextField,
   InputAdornment,
   IconButton
@@ -33,17 +34,27 @@ const ConversationList: React.FC<ConversationListProps> = ({
   selectedConversationId, 
   onSelectConversation, 
   onlineUsers = [],
-  currentUserId
+  currentUserId,
+  onSearch,
+  hasMore = false,
+  onLoadMore
 }) => {
   const [searchTerm, setSearchTerm] = useState('');
   
+  // with onSearch the server filters the directory; otherwise filter locally
   const filteredUsers = conversations
     .filter(user => user._id !== currentUserId) 
     .filter(user => 
+      Boolean(onSearch) ||
       user.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
       user.email.toLowerCase().includes(searchTerm.toLowerCase())
     );
 
+  const handleSearchChange = (value: string) => {
+    setSearchTerm(value);
+    onSearch?.(value);
+  };
+
   return (
     <Box 
       sx={{ 
@@ -81,7 +92,7 @@ const ConversationList: React.FC<ConversationListProps> = ({
           variant="outlined"
           size="small"
           value={searchTerm}
-          onChange={(e) => setSearchTerm(e.target.value)}
+          onChange={(e) => handleSearchChange(e.target.value)}
           InputProps={{
             startAdornment: (
               <InputAdornment position="start">
@@ -134,6 +145,11 @@ const ConversationList: React.FC<ConversationListProps> = ({
             );
           })}
         </List>
+        {hasMore && onLoadMore && (
+          <Box sx={{ display: 'flex', justifyContent: 'center', p: 1 }}>
+            <Button size="small" onClick={onLoadMore}>Load more</Button>
+          </Box>
+        )}
       </Box>
     </Box>
   );
@@ -1,23 +1,33 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import {
   Box,
+  Chip,
   TextField,
   InputAdornment,
   IconButton
 } from '@mui/material';
 import SendIcon from '@mui/icons-material/Send';
+import ImageIcon from '@mui/icons-material/Image';
 
 interface MessageInputProps {
-  onSendMessage: (message: string) => void;
+  onSendMessage: (message: string, image?: File) => void;
 }
 
 const MessageInput: React.FC<MessageInputProps> = ({ onSendMessage }) => {
   const [messageText, setMessageText] = useState('');
+  const [image, setImage] = useState<File | null>(null);
+  const fileInputRef = useRef<HTMLInputElement>(null);
 
   const handleSendMessage = () => {
-    if (messageText.trim() === '') return;
-    onSendMessage(messageText);
+    if (messageText.trim() === '' && !image) return;
+    onSendMessage(messageText, image ?? undefined);
     setMessageText('');
+    setImage(null);
+  };
+
+  const handleImageChange = (e: React.ChangeEvent<HTMLInputElement>) => {
+    setImage(e.target.files?.[0] ?? null);
+    e.target.value = '';
   };
 
   const handleKeyPress = (e: React.KeyboardEvent) => {
@@ -36,6 +46,21 @@ const MessageInput: React.FC<MessageInputProps> = ({ onSendMessage }) => {
       flexShrink: 0,
       zIndex: 2
     }}>
+      {image && (
+        <Chip
+          label={image.name}
+          size="small"
+          onDelete={() => setImage(null)}
+          sx={{ mb: 1 }}
+        />
+      )}
+      <input
+        ref={fileInputRef}
+        type="file"
+        accept="image/*"
+        hidden
+        onChange={handleImageChange}
+      />
       <TextField
         fullWidth
         placeholder="Type a message..."
@@ -48,10 +73,13 @@ const MessageInput: React.FC<MessageInputProps> = ({ onSendMessage }) => {
         InputProps={{
           endAdornment: (
             <InputAdornment position="end">
+              <IconButton onClick={() => fileInputRef.current?.click()}>
+                <ImageIcon />
+              </IconButton>
               <IconButton 
                 color="primary" 
                 onClick={handleSendMessage}
-                disabled={messageText.trim() === ''}
+                disabled={messageText.trim() === '' && !image}
               >
                 <SendIcon />
               </IconButton>
@@ -3,23 +3,27 @@ import {
   Box,
   Paper,
   Typography,
-  Divider
+  Divider,
+  Button
 } from '@mui/material';
 import { Message } from '../types';
 
 interface MessageListProps {
   messages: Message[];
   currentUserId: string; 
+  hasOlderMessages?: boolean;
+  onLoadOlder?: () => void;
 }
 
-const MessageList: React.FC<MessageListProps> = ({ messages, currentUserId }) => {
+const MessageList: React.FC<MessageListProps> = ({ messages, currentUserId, hasOlderMessages = false, onLoadOlder }) => {
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const lastMessageId = messages.length > 0 ? messages[messages.length - 1]._id : null;
   
   useEffect(() => {
     if (messagesEndRef.current) {
       messagesEndRef.current.scrollIntoView({ behavior: 'smooth' });
     }
-  }, [messages]);
+  }, [lastMessageId]);
 
   const groupMessagesByDate = () => {
     const groups: { [key: string]: Message[] } = {};
@@ -67,6 +71,11 @@ const MessageList: React.FC<MessageListProps> = ({ messages, currentUserId }) =>
         borderTop: 0
       }}
     >
+      {hasOlderMessages && onLoadOlder && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mb: 2 }}>
+          <Button size="small" onClick={onLoadOlder}>Load earlier messages</Button>
+        </Box>
+      )}
       {Object.entries(messageGroups).map(([date, dateMessages]) => (
         <Box key={date} sx={{ mb: 3 }}>
           <Box 
@@ -132,12 +141,22 @@ const MessageList: React.FC<MessageListProps> = ({ messages, currentUserId }) =>
                   {message.image && (
                     <Box sx={{ mb: message.text ? 1 : 0 }}>
                       <img 
-                        src={message.image} 
+                        src={message.imageThumbnail || message.image} 
                         alt="Sent image" 
                         style={{ maxWidth: '100%', height: 'auto', borderRadius: '4px' }} 
                       />
                     </Box>
                   )}
+                  {!message.image && message.imageStatus === 'pending' && (
+                    <Typography variant="caption" component="div" sx={{ mb: message.text ? 1 : 0, fontStyle: 'italic' }}>
+                      Uploading image...
+                    </Typography>
+                  )}
+                  {!message.image && message.imageStatus === 'failed' && (
+                    <Typography variant="caption" component="div" sx={{ mb: message.text ? 1 : 0, fontStyle: 'italic' }}>
+                      Image failed to upload
+                    </Typography>
+                  )}
                   {/* Display text if present */}
                   {message.text && (
                     <Typography variant="body1" component="div">{message.text}</Typography>
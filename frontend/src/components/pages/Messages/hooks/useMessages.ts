@@ -6,48 +6,52 @@ import { useAuth } from '../../../../context/AuthContext';
 const API_URL = 'http://localhost:5001/api/message';
 const SOCKET_URL = 'http://localhost:5001';
 
-interface BackendUser {
-  _id: string;
-  email: string;
-  role: 'student' | 'alumni' | 'admin';
-  profile_data?: { 
-    name?: string;
-    firstName?: string;
-    avatar?: string;
-  };
-  alternate_email?: string;
-  major?: string;
+interface UsersPage {
+  users: User[];
+  nextCursor: string | null;
+  hasMore: boolean;
 }
 
 export const useMessages = () => {
   const { user: currentUser, loading: authLoading } = useAuth(); 
   const [users, setUsers] = useState<User[]>([]);
   const [messages, setMessages] = useState<Record<string, Message[]>>({});
+  const [userSearch, setUserSearch] = useState('');
+  const [usersCursor, setUsersCursor] = useState<string | null>(null);
+  const [olderCursors, setOlderCursors] = useState<Record<string, string | null>>({});
   const [selectedUserId, setSelectedUserId] = useState<string | null>(null);
   const [loadingUsers, setLoadingUsers] = useState(false);
   const [loadingMessages, setLoadingMessages] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const socketRef = useRef<Socket | null>(null);
+  const messagesRef = useRef(messages);
+  messagesRef.current = messages;
+  // a messageUpdated can arrive before the message itself (the sender is still waiting for
+  // the POST response); it is held here and applied once the message shows up
+  const earlyUpdatesRef = useRef<Map<string, Message>>(new Map());
   const [onlineUsers, setOnlineUsers] = useState<string[]>([]);
 
-  const fetchUsers = useCallback(async () => {
+  const fetchUsers = useCallback(async (search = '', cursor?: string) => {
     if (!currentUser) return;
     setLoadingUsers(true);
     setError(null);
     try {
-      const response = await fetch(`${API_URL}/users`, {
+      const params = new URLSearchParams({ limit: '20' });
+      if (search) params.set('search', search);
+      if (cursor) params.set('cursor', cursor);
+      const response = await fetch(`${API_URL}/users?${params.toString()}`, {
         credentials: 'include', 
       });
       if (!response.ok) {
         throw new Error('Failed to fetch users');
       }
-      const data = await response.json();
-      setUsers(data.map((backendUser: BackendUser) => ({
-        _id: backendUser._id, 
-        email: backendUser.email,
-        name: backendUser.profile_data?.name || backendUser.profile_data?.firstName || backendUser.email,
-        avatar: backendUser.profile_data?.avatar || undefined, 
-      })));
+      const data: UsersPage = await response.json();
+      setUsers(prev => {
+        if (!cursor) return data.users;
+        const seen = new Set(prev.map(u => u._id));
+        return [...prev, ...data.users.filter(u => !seen.has(u._id))];
+      });
+      setUsersCursor(data.nextCursor);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An unknown error occurred');
       console.error("Error fetching users:", err);
@@ -56,7 +60,17 @@ export const useMessages = () => {
     }
   }, [currentUser]);
 
-  const fetchMessages = useCallback(async (userId: string) => {
+  const handleSearchUsers = useCallback((search: string) => {
+    setUserSearch(search);
+  }, []);
+
+  const loadMoreUsers = useCallback(() => {
+    if (usersCursor) {
+      fetchUsers(userSearch, usersCursor);
+    }
+  }, [fetchUsers, userSearch, usersCursor]);
+
+  const fetchMessages = useCallback(async (userId: string, before?: string) => {
     if (!currentUser || !currentUser.id) {
       console.error("Cannot fetch messages: user not authenticated.");
       setError("Authentication required to fetch messages."); 
@@ -65,14 +79,19 @@ export const useMessages = () => {
     setLoadingMessages(true);
     setError(null);
     try {
-      const response = await fetch(`${API_URL}/${userId}`, {
+      const query = before ? `?before=${encodeURIComponent(before)}` : '';
+      const response = await fetch(`${API_URL}/${userId}${query}`, {
         credentials: 'include',
       });
       if (!response.ok) {
         throw new Error('Failed to fetch messages');
       }
-      const data: Message[] = await response.json();
-      setMessages(prev => ({ ...prev, [userId]: data }));
+      const data: { messages: Message[]; nextCursor: string | null } = await response.json();
+      setMessages(prev => ({
+        ...prev,
+        [userId]: before ? [...data.messages, ...(prev[userId] || [])] : data.messages,
+      }));
+      setOlderCursors(prev => ({ ...prev, [userId]: data.nextCursor }));
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An unknown error occurred');
       console.error(`Error fetching messages for user ${userId}:`, err);
@@ -81,15 +100,32 @@ export const useMessages = () => {
     }
   }, [currentUser]);
 
+  const loadOlderMessages = useCallback(() => {
+    const cursor = selectedUserId ? olderCursors[selectedUserId] : null;
+    if (selectedUserId && cursor) {
+      fetchMessages(selectedUserId, cursor);
+    }
+  }, [selectedUserId, olderCursors, fetchMessages]);
+
+  const withEarlyUpdate = useCallback((message: Message) => {
+    const update = earlyUpdatesRef.current.get(message._id);
+    if (!update) return message;
+    earlyUpdatesRef.current.delete(message._id);
+    return update;
+  }, []);
+
   useEffect(() => {
     if (currentUser && !socketRef.current) {
       const socket = io(SOCKET_URL, {
         query: { userId: currentUser.id },
+        // cluster workers only accept websockets (no sticky sessions for polling)
+        transports: ['websocket'],
       });
       socketRef.current = socket;
 
 
-      socket.on('newMessage', (newMessage: Message) => {
+      socket.on('newMessage', (received: Message) => {
+        const newMessage = withEarlyUpdate(received);
         const conversationPartnerId = newMessage.senderID === currentUser.id ? newMessage.receiverID : newMessage.senderID;
         setMessages(prev => ({
           ...prev,
@@ -101,10 +137,33 @@ export const useMessages = () => {
         }
       });
 
+      socket.on('messageUpdated', (updatedMessage: Message) => {
+        const conversationPartnerId = updatedMessage.senderID === currentUser.id ? updatedMessage.receiverID : updatedMessage.senderID;
+        const known = (messagesRef.current[conversationPartnerId] || []).some(msg => msg._id === updatedMessage._id);
+        if (!known) {
+          earlyUpdatesRef.current.set(updatedMessage._id, updatedMessage);
+        }
+        setMessages(prev => ({
+          ...prev,
+          [conversationPartnerId]: (prev[conversationPartnerId] || []).map(msg =>
+            msg._id === updatedMessage._id ? updatedMessage : msg
+          ),
+        }));
+      });
+
+      // full list once on connect, then batched deltas
       socket.on('getOnlineUsers', (users: string[]) => {
         setOnlineUsers(users);
       });
 
+      socket.on('userOnline', (userIds: string[]) => {
+        setOnlineUsers(prev => Array.from(new Set([...prev, ...userIds])));
+      });
+
+      socket.on('userOffline', (userIds: string[]) => {
+        setOnlineUsers(prev => prev.filter(id => !userIds.includes(id)));
+      });
+
       socket.on('disconnect', () => {
       });
 
@@ -113,13 +172,13 @@ export const useMessages = () => {
         socketRef.current = null;
       };
     }
-  }, [currentUser, selectedUserId]); 
+  }, [currentUser, selectedUserId, withEarlyUpdate]); 
 
   useEffect(() => {
-    if (!authLoading && currentUser) {
-      fetchUsers();
-    }
-  }, [authLoading, currentUser, fetchUsers]);
+    if (authLoading || !currentUser) return;
+    const timer = setTimeout(() => fetchUsers(userSearch.trim()), userSearch ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [authLoading, currentUser, fetchUsers, userSearch]);
 
   const handleSelectUser = useCallback((userId: string) => {
     setSelectedUserId(userId);
@@ -128,7 +187,7 @@ export const useMessages = () => {
     }
   }, [messages, fetchMessages]);
 
-  const handleSendMessage = useCallback(async (text: string, image?: string) => {
+  const handleSendMessage = useCallback(async (text: string, image?: File) => {
     if (!selectedUserId || !currentUser) return;
 
     const optimisticMessage: Message = {
@@ -136,7 +195,7 @@ export const useMessages = () => {
       senderID: currentUser.id, 
       receiverID: selectedUserId, 
       text: text,
-      image: image, 
+      imageStatus: image ? 'pending' : undefined,
       createdAt: new Date().toISOString(),
     };
     setMessages(prev => ({
@@ -145,20 +204,31 @@ export const useMessages = () => {
     }));
 
     try {
-      const response = await fetch(`${API_URL}/send/${selectedUserId}`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ text, image }), 
-        credentials: 'include',
-      });
+      let requestInit: RequestInit;
+      if (image) {
+        // images go up as multipart; the server answers before the image upload finishes
+        const formData = new FormData();
+        formData.append('text', text);
+        formData.append('image', image);
+        requestInit = { method: 'POST', body: formData, credentials: 'include' };
+      } else {
+        requestInit = {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify({ text }), 
+          credentials: 'include',
+        };
+      }
+
+      const response = await fetch(`${API_URL}/send/${selectedUserId}`, requestInit);
 
       if (!response.ok) {
         throw new Error('Failed to send message');
       }
 
-      const actualMessage: Message = await response.json();
+      const actualMessage = withEarlyUpdate(await response.json());
 
       setMessages(prev => ({
         ...prev,
@@ -176,7 +246,7 @@ export const useMessages = () => {
         [selectedUserId]: (prev[selectedUserId] || []).filter(msg => msg._id !== optimisticMessage._id),
       }));
     }
-  }, [selectedUserId, currentUser]);
+  }, [selectedUserId, currentUser, withEarlyUpdate]);
 
   const currentConversationUser = selectedUserId
     ? users.find(u => u._id === selectedUserId)
@@ -187,8 +257,13 @@ export const useMessages = () => {
 
   return {
     users, 
+    hasMoreUsers: Boolean(usersCursor),
+    loadMoreUsers,
+    searchUsers: handleSearchUsers,
     currentConversationUser,
     currentMessages,
+    hasOlderMessages: Boolean(selectedUserId && olderCursors[selectedUserId]),
+    loadOlderMessages,
     selectedUserId,
     handleSelectUser,
     handleSendMessage,
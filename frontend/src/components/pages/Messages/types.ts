@@ -20,11 +20,13 @@ export interface Message {
   receiverID: string;
   text?: string; 
   image?: string; 
+  imageThumbnail?: string;
+  imageStatus?: 'pending' | 'ready' | 'failed';
   createdAt: string; 
 }
 
 export interface MessageInputProps {
-  onSendMessage: (text: string, image?: string) => void; 
+  onSendMessage: (text: string, image?: File) => void; 
 }
 
 export interface ConversationListProps {
@@ -33,11 +35,16 @@ export interface ConversationListProps {
   onSelectConversation: (userId: string) => void; 
   onlineUsers?: string[]; 
   currentUserId: string; 
+  onSearch?: (search: string) => void;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export interface MessageListProps {
   messages: Message[];
   currentUserId: string; 
+  hasOlderMessages?: boolean;
+  onLoadOlder?: () => void;
 }
 
 export interface ConversationHeaderProps {
@@ -43,7 +43,6 @@ interface Post {
     number_of_likes: number;
     created_at: string;
     isLikedByCurrentUser?: boolean;
-    likes?: string[];
 }
 
 const postCategories = ['Job Post', 'Internship Post', 'Community Post'];
@@ -69,6 +68,7 @@ const Posts = () => {
     const [paginationMode, setPaginationMode] = useState<'scroll' | 'pagination'>('scroll');
 
     const observer = useRef<IntersectionObserver | null>(null);
+    const nextCursorRef = useRef<string | null>(null);
     const scrollContainerRef = useRef<HTMLDivElement>(null);
 
     const lastPostElementRef = useCallback((node: HTMLLIElement | null) => {
@@ -104,7 +104,7 @@ const Posts = () => {
         };
     }, []);
 
-    const fetchPosts = useCallback(async (page: number, department: string, category: string = 'All', loadMore = false) => {
+    const fetchPosts = useCallback(async (page: number, department: string, category: string = 'All', loadMore = false, cursor: string | null = null) => {
         if (!loadMore) {
             setLoading(true);
         } else {
@@ -113,7 +113,8 @@ const Posts = () => {
         setError(null);
         try {
             const categoryParam = category !== 'All' ? `&category=${category}` : '';
-            const url = `/api/posts?page=${page}&limit=10&department=${department}${categoryParam}`;
+            const pageParam = cursor ? `cursor=${encodeURIComponent(cursor)}` : `page=${page}`;
+            const url = `/api/posts?${pageParam}&limit=10&department=${department}${categoryParam}`;
             const response = await fetch(url, {
                 method: 'GET',
                 credentials: 'include'
@@ -158,11 +159,17 @@ const Posts = () => {
                     setLikedPosts(newlyFetchedLikedIds);
                 }
 
-                setCurrentPage(data.currentPage);
-                setTotalPages(data.totalPages);
-                const newHasMore = data.currentPage < data.totalPages;
-                setHasMore(newHasMore);
-                setTotalPages(data.totalPages);
+                nextCursorRef.current = data.nextCursor ?? null;
+
+                if (cursor) {
+                    setHasMore(Boolean(data.hasMore));
+                } else {
+                    setCurrentPage(data.currentPage);
+                    setTotalPages(data.totalPages);
+                    const newHasMore = data.currentPage < data.totalPages;
+                    setHasMore(newHasMore);
+                    setTotalPages(data.totalPages);
+                }
             } else {
                 throw new Error('Failed to load posts. Unexpected data format.');
             }
@@ -187,7 +194,7 @@ const Posts = () => {
 
     useEffect(() => {
         if (paginationMode === 'scroll' && currentPage > 1 && hasMore) {
-            fetchPosts(currentPage, selectedDepartment, selectedCategoryFilter, true);
+            fetchPosts(currentPage, selectedDepartment, selectedCategoryFilter, true, nextCursorRef.current);
         }
     }, [currentPage, selectedDepartment, selectedCategoryFilter, fetchPosts, hasMore, paginationMode]);
 
@@ -24,7 +24,9 @@ interface Notification {
 interface NotificationContextType {
   notifications: Notification[];
   unreadCount: number;
+  hasMore: boolean;
   fetchNotifications: () => Promise<void>;
+  loadMoreNotifications: () => Promise<void>;
   markAsRead: (notificationId: string) => Promise<void>;
   markAllAsRead: () => Promise<void>;
 }
@@ -32,7 +34,9 @@ interface NotificationContextType {
 const NotificationContext = createContext<NotificationContextType>({
   notifications: [],
   unreadCount: 0,
+  hasMore: false,
   fetchNotifications: async () => {},
+  loadMoreNotifications: async () => {},
   markAsRead: async () => {},
   markAllAsRead: async () => {}
 });
@@ -46,6 +50,7 @@ interface NotificationProviderProps {
 export const NotificationProvider: React.FC<NotificationProviderProps> = ({ children }) => {
   const [notifications, setNotifications] = useState<Notification[]>([]);
   const [unreadCount, setUnreadCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [socket, setSocket] = useState<Socket | null>(null);
   const { user, isAuthenticated } = useAuth();
 
@@ -53,8 +58,10 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
     if (isAuthenticated && user) {
       
       const newSocket = io('http://localhost:5001', {
-        query: { userId: user.id },
-        transports: ['websocket', 'polling']
+        // this socket only carries notifications; presence is the Messages page's socket
+        query: { userId: user.id, presenceScope: 'none' },
+        // cluster workers only accept websockets (no sticky sessions for polling)
+        transports: ['websocket']
       });
       
       newSocket.on('connect', () => {
@@ -74,28 +81,67 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
     }
   }, [isAuthenticated, user]);
 
+  const fetchNotificationPage = useCallback(async (cursor?: string) => {
+    const params = new URLSearchParams({ limit: '20' });
+    if (cursor) params.set('cursor', cursor);
+
+    const response = await fetch(`http://localhost:5001/api/notifications?${params}`, {
+      method: 'GET',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      credentials: 'include'
+    });
+
+    const data = await response.json();
+    
+    if (!response.ok) {
+      throw new Error(data.message || 'Failed to fetch notifications');
+    }
+
+    setNextCursor(data.nextCursor || null);
+    setUnreadCount(data.unreadCount || 0);
+    return (data.notifications || []) as Notification[];
+  }, []);
+
   const fetchNotifications = useCallback(async () => {
     if (!user) return;
 
     try {
-      const response = await fetch('http://localhost:5001/api/notifications', {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
+      setNotifications(await fetchNotificationPage());
+    } catch (error) {
+      console.error('Error fetching notifications:', error);
+    }
+  }, [user, fetchNotificationPage]);
+
+  const loadMoreNotifications = useCallback(async () => {
+    if (!user || !nextCursor) return;
+
+    try {
+      const older = await fetchNotificationPage(nextCursor);
+      setNotifications(prev => [...prev, ...older.filter(n => !prev.some(p => p._id === n._id))]);
+    } catch (error) {
+      console.error('Error fetching notifications:', error);
+    }
+  }, [user, nextCursor, fetchNotificationPage]);
+
+  // the badge only needs the counter; the list is loaded when the menu opens
+  const fetchUnreadCount = useCallback(async () => {
+    if (!user) return;
+
+    try {
+      const response = await fetch('http://localhost:5001/api/notifications/unread-count', {
         credentials: 'include'
       });
-
       const data = await response.json();
-      
+
       if (!response.ok) {
-        throw new Error(data.message || 'Failed to fetch notifications');
+        throw new Error(data.message || 'Failed to fetch unread count');
       }
 
-      setNotifications(data.notifications || []);
       setUnreadCount(data.unreadCount || 0);
     } catch (error) {
-      console.error('Error fetching notifications:', error);
+      console.error('Error fetching unread count:', error);
     }
   }, [user]);
 
@@ -152,12 +198,13 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
 
   useEffect(() => {
     if (isAuthenticated) {
-      fetchNotifications();
+      fetchUnreadCount();
     } else {
       setNotifications([]);
       setUnreadCount(0);
+      setNextCursor(null);
     }
-  }, [isAuthenticated, fetchNotifications]);
+  }, [isAuthenticated, fetchUnreadCount]);
 
   const markAsRead = async (notificationId: string) => {
     if (!user) return;
@@ -245,7 +292,9 @@ export const NotificationProvider: React.FC<NotificationProviderProps> = ({ chil
       value={{
         notifications,
         unreadCount,
+        hasMore: nextCursor !== null,
         fetchNotifications,
+        loadMoreNotifications,
         markAsRead,
         markAllAsRead
       }}
@@ -0,0 +1,271 @@
+import json
+import os
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from pathlib import Path
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from perf import LONG_TASK_OBSERVER, PerfRecorder, baseline_from, compare, summarize, write_html
+from ui import UI
+
+FRONTEND_URL = os.environ.get("FRONTEND_URL", "http://localhost:5173")
+API_URL = os.environ.get("API_URL", "http://localhost:5001")
+PASSWORD = os.environ.get("TEST_PASSWORD", "123456Q@")
+HEADLESS = os.environ.get("HEADLESS", "1") != "0"
+
+PERF_STEPS = pytest.StashKey[list]()
+PERF_REPORT = pytest.StashKey[dict]()
+
+# one account per role the suite logs in as
+ACCOUNTS = {
+  "student": "maazbarki+10@gmail.com",
+  "uploader": "maazbarki+7@gmail.com",
+  "admin": "admin@gmail.com",
+  "profile": "faraz@gmail.com",
+}
+
+
+class AuthSessions:
+  """Logs in through the API once per role and caches the jwt cookie and the
+  userInfo the frontend keeps in localStorage."""
+
+  def __init__(self):
+    self.sessions = {}
+
+  def get(self, role):
+    if role not in self.sessions:
+      self.sessions[role] = self.login(ACCOUNTS[role])
+    return self.sessions[role]
+
+  def login(self, email, password=PASSWORD):
+    request = urllib.request.Request(
+      f"{API_URL}/api/auth/login",
+      data=json.dumps({"email": email, "password": password}).encode(),
+      headers={"Content-Type": "application/json"},
+      method="POST",
+    )
+    try:
+      with urllib.request.urlopen(request, timeout=15) as response:
+        data = json.loads(response.read())
+        set_cookies = response.headers.get_all("Set-Cookie") or []
+    except (urllib.error.URLError, OSError) as error:
+      pytest.fail(f"API login as {email} failed: {error}")
+
+    jwt = None
+    for header in set_cookies:
+      cookie = SimpleCookie(header)
+      if "jwt" in cookie:
+        jwt = cookie["jwt"]
+    if jwt is None:
+      pytest.fail(f"API login as {email} did not set the jwt cookie")
+
+    return {
+      "cookie": {
+        "name": "jwt",
+        "value": jwt.value,
+        "path": "/",
+        "httpOnly": True,
+        "secure": bool(jwt["secure"]),
+        "sameSite": "Strict",
+      },
+      "user_info": {
+        "id": data["_id"],
+        "email": data["email"],
+        "role": data["role"],
+        "profile_data": data.get("profile_data"),
+      },
+    }
+
+
+class DriverPool:
+  """Headless Chrome instances reused across tests. Each xdist worker is its own
+  process and gets its own pool, so a browser is never shared between workers."""
+
+  def __init__(self):
+    self.idle = []
+    self.all = []
+
+  def create(self):
+    options = webdriver.ChromeOptions()
+    if HEADLESS:
+      options.add_argument("--headless=new")
+    options.add_argument("--window-size=1550,830")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    # DevTools Network events for the perf fixture
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(options=options)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": LONG_TASK_OBSERVER})
+    self.all.append(driver)
+    return driver
+
+  def acquire(self):
+    return self.idle.pop() if self.idle else self.create()
+
+  def release(self, driver):
+    try:
+      reset(driver)
+    except WebDriverException:
+      # a browser that cannot be reset is not handed to the next test
+      self.discard(driver)
+      return
+    self.idle.append(driver)
+
+  def discard(self, driver):
+    self.all.remove(driver)
+    try:
+      driver.quit()
+    except WebDriverException:
+      pass
+
+  def close(self):
+    for driver in list(self.all):
+      self.discard(driver)
+    self.idle = []
+
+
+def reset(driver):
+  """Clears everything a test can leave behind in a pooled browser."""
+  if driver.current_url.startswith(FRONTEND_URL):
+    driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+  driver.delete_all_cookies()
+  driver.get("about:blank")
+  driver.get_log("performance")
+
+
+def login_as(driver, session, path="/dashboard"):
+  """Signs a browser in with an API session instead of the login form: the jwt
+  cookie and localStorage.userInfo are exactly what a form login leaves behind."""
+  # cookies and storage can only be set on a page of the frontend's origin
+  driver.get(f"{FRONTEND_URL}/login")
+  driver.add_cookie(session["cookie"])
+  driver.execute_script(
+    "window.localStorage.setItem('userInfo', arguments[0]);",
+    json.dumps(session["user_info"]),
+  )
+  driver.get(f"{FRONTEND_URL}{path}")
+
+
+@pytest.fixture(scope="session")
+def auth_sessions():
+  return AuthSessions()
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+  pool = DriverPool()
+  yield pool
+  pool.close()
+
+
+@pytest.fixture
+def driver(driver_pool):
+  driver = driver_pool.acquire()
+  yield driver
+  driver_pool.release(driver)
+
+
+@pytest.fixture
+def ui(driver):
+  return UI(driver, FRONTEND_URL)
+
+
+@pytest.fixture
+def login(driver, auth_sessions):
+  """login(role, path="/dashboard") signs the test's browser in as role and opens path."""
+  def login(role, path="/dashboard"):
+    login_as(driver, auth_sessions.get(role), path)
+  return login
+
+
+@pytest.fixture
+def perf(driver, request):
+  """perf.measure(flow) times a step of the test for the performance report."""
+  recorder = PerfRecorder(driver, request.node.nodeid)
+  yield recorder
+  request.config.stash[PERF_STEPS].extend(recorder.steps)
+
+
+def pytest_addoption(parser):
+  group = parser.getgroup("perf", "UI performance report")
+  group.addoption("--perf-report", default="perf-report", help="directory for report.json and report.html")
+  group.addoption(
+    "--perf-baseline",
+    default=str(Path(__file__).with_name("perf-baseline.json")),
+    help="baseline the run is compared against",
+  )
+  group.addoption("--perf-update-baseline", action="store_true", help="store this run's numbers as the new baseline")
+
+
+def pytest_configure(config):
+  config.stash[PERF_STEPS] = []
+
+
+# xdist: every worker hands its measurements to the controller, which writes one report
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+  steps = getattr(node, "workeroutput", {}).get("perf_steps")
+  if steps:
+    node.config.stash[PERF_STEPS].extend(json.loads(steps))
+
+
+def pytest_sessionfinish(session):
+  config = session.config
+  steps = config.stash[PERF_STEPS]
+  if hasattr(config, "workerinput"):
+    config.workeroutput["perf_steps"] = json.dumps(steps)
+    return
+  if not steps:
+    return
+
+  baseline_path = Path(config.getoption("--perf-baseline"))
+  baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+  summary = summarize(steps)
+  report = {
+    "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    "baseline": str(baseline_path) if baseline else None,
+    "summary": summary,
+    "comparison": compare(summary, baseline),
+    "steps": steps,
+  }
+
+  report_dir = Path(config.rootpath, config.getoption("--perf-report"))
+  report_dir.mkdir(parents=True, exist_ok=True)
+  (report_dir / "report.json").write_text(json.dumps(report, indent=2))
+  write_html(report_dir / "report.html", report)
+  report["dir"] = str(report_dir)
+
+  if config.getoption("--perf-update-baseline"):
+    baseline_path.write_text(json.dumps(baseline_from(summary, baseline), indent=2) + "\n")
+  elif any(result["status"] == "regressed" for result in report["comparison"]) and session.exitstatus == 0:
+    session.exitstatus = pytest.ExitCode.TESTS_FAILED
+  config.stash[PERF_REPORT] = report
+
+
+def pytest_terminal_summary(terminalreporter, config):
+  report = config.stash.get(PERF_REPORT, None)
+  if report is None:
+    return
+  terminalreporter.section("UI performance")
+  for flow, values in report["summary"].items():
+    terminalreporter.write_line(
+      f"{flow}: tti {values['tti_ms']} ms, api p95 {values['api_p95_ms']} ms, "
+      f"long tasks {values['long_task_ms']} ms ({values['runs']} runs)"
+    )
+  for result in report["comparison"]:
+    if result["status"] == "regressed":
+      terminalreporter.write_line(
+        f"REGRESSED {result['flow']} {result['metric']}: {result['current']} (baseline {result['baseline']})",
+        red=True,
+      )
+  if config.getoption("--perf-update-baseline"):
+    terminalreporter.write_line(f"baseline updated: {config.getoption('--perf-baseline')}")
+  elif not report["baseline"]:
+    terminalreporter.write_line("no baseline yet, run with --perf-update-baseline to store one")
+  terminalreporter.write_line(f"report: {report['dir']}")
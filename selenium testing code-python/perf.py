@@ -0,0 +1,269 @@
+import html
+import json
+import statistics
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Registered on every new document (see DriverPool.create): long tasks are only
+# reported to observers, so they are buffered on the page until a step collects them.
+LONG_TASK_OBSERVER = """
+window.__longTasks = [];
+performance.setResourceTimingBufferSize(1000);
+new PerformanceObserver((list) => {
+  for (const entry of list.getEntries()) {
+    window.__longTasks.push({ start: performance.timeOrigin + entry.startTime, duration: entry.duration });
+  }
+}).observe({ type: "longtask", buffered: true });
+"""
+
+COLLECT_PAGE_TIMINGS = """
+const since = arguments[0];
+const origin = performance.timeOrigin;
+const nav = performance.getEntriesByType("navigation")[0];
+return {
+  timeOrigin: origin,
+  navigation: nav && origin >= since ? {
+    ttfb: nav.responseStart,
+    domContentLoaded: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+    transferSize: nav.transferSize
+  } : null,
+  resources: performance.getEntriesByType("resource")
+    .filter(entry => origin + entry.startTime >= since)
+    .map(entry => ({
+      name: entry.name,
+      type: entry.initiatorType,
+      start: origin + entry.startTime,
+      duration: entry.duration,
+      ttfb: entry.responseStart > 0 ? entry.responseStart - entry.startTime : null,
+      transferSize: entry.transferSize
+    })),
+  longTasks: (window.__longTasks || []).filter(task => task.start >= since)
+};
+"""
+
+# a step is done once no API request has been in flight and no long task has run for this long
+QUIET_MS = 500
+STEP_TIMEOUT_S = 20
+
+# metrics compared against the baseline, with the default regression thresholds:
+# a metric regresses when it is both `tolerance` slower (relative) and `min_delta`
+# slower (absolute) than its baseline, so noise on small numbers is not reported
+METRICS = {
+  "tti_ms": {"tolerance": 0.25, "min_delta": 150},
+  "api_p95_ms": {"tolerance": 0.30, "min_delta": 75},
+  "long_task_ms": {"tolerance": 0.50, "min_delta": 100},
+}
+
+
+def percentile(values, p):
+  if not values:
+    return 0
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class NetworkLog:
+  """API requests reconstructed from the Chrome DevTools performance log."""
+
+  def __init__(self, driver):
+    self.driver = driver
+    self.requests = {}
+    self.last_event = time.monotonic()
+
+  def drain(self):
+    return self.driver.get_log("performance")
+
+  def read(self):
+    for entry in self.drain():
+      message = json.loads(entry["message"])["message"]
+      self.handle(message["method"], message.get("params", {}))
+
+  def handle(self, method, params):
+    request_id = params.get("requestId")
+    if method == "Network.requestWillBeSent":
+      url = params["request"]["url"]
+      if "/api/" not in urlparse(url).path:
+        return
+      self.requests[request_id] = {
+        "method": params["request"]["method"],
+        "path": urlparse(url).path,
+        "start": params["wallTime"] * 1000,
+        "sent": params["timestamp"],
+        "status": None,
+        "ms": None,
+      }
+    elif request_id in self.requests:
+      request = self.requests[request_id]
+      if method == "Network.responseReceived":
+        request["status"] = params["response"]["status"]
+        request["cached"] = params["response"].get("fromDiskCache", False)
+      elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+        request["ms"] = (params["timestamp"] - request["sent"]) * 1000
+        request["failed"] = method == "Network.loadingFailed"
+      else:
+        return
+    else:
+      return
+    self.last_event = time.monotonic()
+
+  def in_flight(self):
+    return any(request["ms"] is None for request in self.requests.values())
+
+  def finished(self):
+    return [
+      {key: request[key] for key in ("method", "path", "status", "start", "ms")}
+      for request in self.requests.values()
+      if request["ms"] is not None
+    ]
+
+
+class PerfRecorder:
+  """Measures named steps of a test. Each step records API latencies, resource and
+  navigation timing, long tasks and a time to interactive: from the start of the step
+  to the end of its last API response or long task, once the page has been quiet for
+  QUIET_MS."""
+
+  def __init__(self, driver, test_id):
+    self.driver = driver
+    self.test_id = test_id
+    self.steps = []
+
+  def now_ms(self):
+    return time.time() * 1000
+
+  @contextmanager
+  def measure(self, flow):
+    network = NetworkLog(self.driver)
+    network.drain()
+    started = self.now_ms()
+    yield
+    self.steps.append(self.collect(flow, network, started))
+
+  def collect(self, flow, network, started):
+    deadline = time.monotonic() + STEP_TIMEOUT_S
+    page = self.page_timings(started)
+    while time.monotonic() < deadline:
+      network.read()
+      page = self.page_timings(started)
+      last_task_end = max((task["start"] + task["duration"] for task in page["longTasks"]), default=0)
+      quiet_since_ms = min(
+        (time.monotonic() - network.last_event) * 1000,
+        self.now_ms() - last_task_end,
+      )
+      if not network.in_flight() and quiet_since_ms >= QUIET_MS:
+        break
+      time.sleep(0.1)
+    timed_out = time.monotonic() >= deadline
+
+    requests = network.finished()
+    ready_at = max(
+      [started]
+      + [request["start"] + request["ms"] for request in requests]
+      + [task["start"] + task["duration"] for task in page["longTasks"]]
+    )
+    api_ms = [request["ms"] for request in requests]
+    long_tasks = [task["duration"] for task in page["longTasks"]]
+
+    return {
+      "flow": flow,
+      "test": self.test_id,
+      "timed_out": timed_out,
+      "tti_ms": round(ready_at - started, 1),
+      "api_p95_ms": round(percentile(api_ms, 95), 1),
+      "long_task_ms": round(sum(long_tasks), 1),
+      "long_task_count": len(long_tasks),
+      "navigation": page["navigation"],
+      "api": [
+        {**request, "start": round(request["start"] - started, 1), "ms": round(request["ms"], 1)}
+        for request in requests
+      ],
+      "resources": {
+        "count": len(page["resources"]),
+        "transfer_bytes": sum(resource["transferSize"] or 0 for resource in page["resources"]),
+        "slowest": sorted(
+          ({"name": resource["name"], "type": resource["type"], "ms": round(resource["duration"], 1)}
+           for resource in page["resources"]),
+          key=lambda resource: -resource["ms"],
+        )[:5],
+      },
+    }
+
+  def page_timings(self, started):
+    timings = self.driver.execute_script(COLLECT_PAGE_TIMINGS, started)
+    return timings or {"navigation": None, "resources": [], "longTasks": []}
+
+
+def summarize(steps):
+  """Median of every compared metric per flow (a flow may be measured several times)."""
+  flows = {}
+  for step in steps:
+    flows.setdefault(step["flow"], []).append(step)
+  return {
+    flow: {
+      "runs": len(runs),
+      **{metric: round(statistics.median(run[metric] for run in runs), 1) for metric in METRICS},
+    }
+    for flow, runs in sorted(flows.items())
+  }
+
+
+def compare(summary, baseline):
+  """Checks every flow metric against the baseline. Per-metric thresholds in the
+  baseline file ({"thresholds": {"tti_ms": {"tolerance": .., "min_delta": ..}}})
+  override the defaults."""
+  thresholds = {metric: {**METRICS[metric], **baseline.get("thresholds", {}).get(metric, {})} for metric in METRICS}
+  results = []
+  for flow, current in summary.items():
+    expected = baseline.get("flows", {}).get(flow)
+    for metric in METRICS:
+      result = {"flow": flow, "metric": metric, "current": current[metric], "baseline": None, "status": "new"}
+      if expected and metric in expected:
+        limit = thresholds[metric]
+        result["baseline"] = expected[metric]
+        delta = current[metric] - expected[metric]
+        slower = delta > limit["min_delta"] and delta > expected[metric] * limit["tolerance"]
+        result["status"] = "regressed" if slower else "ok"
+      results.append(result)
+  return results
+
+
+def baseline_from(summary, previous=None):
+  baseline = {"flows": {flow: {metric: values[metric] for metric in METRICS} for flow, values in summary.items()}}
+  if previous and "thresholds" in previous:
+    baseline["thresholds"] = previous["thresholds"]
+  return baseline
+
+
+def write_html(path, report):
+  rows = "".join(
+    f"<tr class='{result['status']}'><td>{html.escape(result['flow'])}</td><td>{result['metric']}</td>"
+    f"<td>{result['current']}</td><td>{'' if result['baseline'] is None else result['baseline']}</td>"
+    f"<td>{result['status']}</td></tr>"
+    for result in report["comparison"]
+  )
+  steps = "".join(
+    f"<h3>{html.escape(step['flow'])} <small>{html.escape(step['test'])}</small></h3>"
+    f"<p>time to interactive {step['tti_ms']} ms, {step['long_task_count']} long tasks ({step['long_task_ms']} ms), "
+    f"{step['resources']['count']} resources ({step['resources']['transfer_bytes']} bytes)"
+    f"{' - timed out waiting for the page to settle' if step['timed_out'] else ''}</p>"
+    "<table><tr><th>request</th><th>status</th><th>start (ms)</th><th>latency (ms)</th></tr>"
+    + "".join(
+      f"<tr><td>{request['method']} {html.escape(request['path'])}</td><td>{request['status']}</td>"
+      f"<td>{request['start']}</td><td>{request['ms']}</td></tr>"
+      for request in step["api"]
+    )
+    + "</table>"
+    for step in report["steps"]
+  )
+  with open(path, "w", encoding="utf-8") as file:
+    file.write(
+      "<!doctype html><html><head><meta charset='utf-8'><title>UI performance report</title><style>"
+      "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:1em}"
+      "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}"
+      "tr.regressed{background:#fdd}tr.new{background:#eef}</style></head><body>"
+      f"<h1>UI performance report</h1><p>{html.escape(report['generated_at'])}</p>"
+      "<h2>Against baseline</h2><table><tr><th>flow</th><th>metric</th><th>current</th>"
+      f"<th>baseline</th><th>status</th></tr>{rows}</table><h2>Steps</h2>{steps}</body></html>"
+    )
@@ -1,86 +1,41 @@
-import unittest
 import pytest
-import time
-import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
-class TestAdminFunctionality(unittest.TestCase):
-  def setUp(self):
-    self.driver = webdriver.Chrome()
-    self.vars = {}
-  
-  def tearDown(self):
-    self.driver.quit()
-  
+from conftest import ACCOUNTS
+
+DELETABLE_ROWS = (By.XPATH, "//*[@role='tabpanel' and not(@hidden)]//tbody/tr[.//*[@data-testid='DeleteIcon']]")
+CONFIRM_DELETE = (By.CSS_SELECTOR, ".MuiDialog-root .MuiButton-textError")
+
+
+# deletes posts and resources other tests create and read, so it runs on the same xdist
+# worker as them
+@pytest.mark.xdist_group("resources")
+class TestAdminFunctionality:
+  @pytest.fixture(autouse=True)
+  def setup(self, driver, ui, login):
+    self.driver = driver
+    self.ui = ui
+    login("admin", "/dashboard")
+
+  def delete_row(self, keep=()):
+    rows = self.ui.find_all(DELETABLE_ROWS)
+    # never delete the accounts the suite logs in with
+    row = next(row for row in rows if not any(text in row.text for text in keep))
+    row.find_element(By.XPATH, ".//*[@data-testid='DeleteIcon']/ancestor::button[1]").click()
+    self.ui.click(CONFIRM_DELETE)
+    self.ui.gone(CONFIRM_DELETE)
+    self.ui.wait.until(lambda driver: len(driver.find_elements(*DELETABLE_ROWS)) < len(rows))
+
   def test_admin_functionality(self):
-    self.driver.get("http://localhost:5173/login")
-    self.driver.set_window_size(1550, 830)
-    self.driver.find_element(By.ID, ":r0:").click()
-    self.driver.find_element(By.ID, ":r0:").send_keys("admin@gmail.com")
-    
-    element = self.driver.find_element(By.CSS_SELECTOR, ".MuiButtonBase-root")
-    actions = ActionChains(self.driver)
-    actions.move_to_element(element).perform()
-    self.driver.find_element(By.ID, ":r1:").send_keys("123456Q@")
-    
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiButtonBase-root").click()
-    
-    time.sleep(2)
-    
-    element = self.driver.find_element(By.CSS_SELECTOR, ".MuiListItem-root:nth-child(6) .MuiTypography-root")
-    actions = ActionChains(self.driver)
-    actions.move_to_element(element).perform()
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiListItem-root:nth-child(6) .MuiTypography-root").click()
+    self.ui.nav("/admin")
 
-    time.sleep(2)
-    
-    element = self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(3) .MuiSvgIcon-root")
-    actions = ActionChains(self.driver)
-    actions.move_to_element(element).perform()
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(3) path").click()
-    
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiButton-textError").click()
-    
-    self.driver.find_element(By.ID, "admin-tab-1").click()
+    self.delete_row(keep=ACCOUNTS.values())
 
-    time.sleep(2)
-    
-    element = self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(1) .MuiSvgIcon-root")
-    actions = ActionChains(self.driver)
-    actions.move_to_element(element).perform()
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(1) .MuiSvgIcon-root").click()
-    
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiButton-textError").click()
-    
-    self.driver.find_element(By.ID, "admin-tab-2").click()
+    self.ui.click((By.ID, "admin-tab-1"))
+    self.delete_row()
 
-    time.sleep(2)
-    
-    element = self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(1) .MuiButtonBase-root")
-    actions = ActionChains(self.driver)
-    actions.move_to_element(element).perform()
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiTableRow-root:nth-child(1) .MuiButtonBase-root").click()
-    
-    self.driver.find_element(By.CSS_SELECTOR, ".MuiButton-textError").click()
-    
-    
-    try:
-        logout_button = self.driver.find_element(By.NAME, "logout")
-        logout_button.click()
-    except:
-        try:
-            logout_icon = self.driver.find_element(By.CSS_SELECTOR, ".MuiSvgIcon-fontSizeSmall")
-            logout_icon.click()
-        except:
-            pass
-    
-    self.assertTrue("http://localhost:5173" in self.driver.current_url or "login" in self.driver.current_url)
+    self.ui.click((By.ID, "admin-tab-2"))
+    self.delete_row()
 
-if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    self.ui.logout()
+    assert "/login" in self.driver.current_url
@@ -0,0 +1,83 @@
+import os
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
+
+WAIT_TIMEOUT = float(os.environ.get("SELENIUM_WAIT_TIMEOUT", "10"))
+
+
+def icon_button(test_id):
+  """XPath of the button around an MUI icon (MUI icons carry data-testid="<Name>Icon")."""
+  return (By.XPATH, f"//*[@data-testid='{test_id}']/ancestor::button[1]")
+
+
+def button(text):
+  return (By.XPATH, f"//button[normalize-space()='{text}']")
+
+
+class UI:
+  """Explicit waits for the app's pages. Every lookup waits for the element's state
+  instead of sleeping for a fixed time."""
+
+  def __init__(self, driver, base_url, timeout=WAIT_TIMEOUT):
+    self.driver = driver
+    self.base_url = base_url
+    self.wait = WebDriverWait(driver, timeout)
+
+  def find(self, locator):
+    return self.wait.until(expected_conditions.visibility_of_element_located(locator))
+
+  def find_all(self, locator):
+    return self.wait.until(expected_conditions.visibility_of_all_elements_located(locator))
+
+  def present(self, locator):
+    return self.wait.until(expected_conditions.presence_of_element_located(locator))
+
+  def click(self, locator):
+    element = self.wait.until(expected_conditions.element_to_be_clickable(locator))
+    element.click()
+    return element
+
+  def type(self, locator_or_element, text, clear=False):
+    element = locator_or_element
+    if isinstance(locator_or_element, tuple):
+      element = self.find(locator_or_element)
+    if clear:
+      # element.clear() bypasses React's onChange, so the controlled value would come back
+      element.send_keys(Keys.CONTROL, "a")
+      element.send_keys(Keys.DELETE)
+    element.send_keys(text)
+    return element
+
+  def field(self, label):
+    """The input of an MUI TextField, found through its label. MUI's generated ids
+    (":r0:", ":rk:", ...) depend on render order, so tests never use them directly."""
+    # the label's own text node, so a required field's asterisk span does not matter
+    label_element = self.find((By.XPATH, f"//label[normalize-space(text()[1])='{label}']"))
+    return self.find((By.ID, label_element.get_attribute("for")))
+
+  def gone(self, locator):
+    return self.wait.until(expected_conditions.invisibility_of_element_located(locator))
+
+  def text_present(self, text, locator=(By.TAG_NAME, "body")):
+    return self.wait.until(expected_conditions.text_to_be_present_in_element(locator, text))
+
+  def url_contains(self, fragment):
+    return self.wait.until(expected_conditions.url_contains(fragment))
+
+  def alert_text(self):
+    alert = self.wait.until(expected_conditions.alert_is_present())
+    text = alert.text
+    alert.accept()
+    return text
+
+  def nav(self, path):
+    """Opens a page through its sidebar entry."""
+    self.click((By.CSS_SELECTOR, f"a[href='{path}'] .MuiListItemButton-root"))
+    self.url_contains(path)
+
+  def logout(self):
+    self.click(icon_button("LogoutIcon"))
+    self.url_contains("/login")